@@ -0,0 +1,61 @@
+"""Malowanie miesiąca w kalendarzu ToDoCalendar (paint_month) przy rosnącej liczbie zadań.
+
+Liczniki dni są utrzymywane w tabeli task_counts, więc koszt zmiany strony
+kalendarza powinien zależeć tylko od liczby dni w miesiącu.
+
+Uruchomienie (z katalogu projekt):
+    python benchmarks/bench_calendar_density.py [liczba_zadań ...]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from task_store import TaskStore  # noqa: E402
+from todocalendar import ToDoCalendar  # noqa: E402
+
+DAYS = 10 * 365
+FIRST_DAY = date(2020, 1, 1)
+
+
+def fill(store, count):
+    rows = ((FIRST_DAY + timedelta(days=i % DAYS)).isoformat() for i in range(count))
+    with store.connection:
+        store.connection.executemany(
+            "INSERT INTO tasks (date, title, completed) VALUES (?, 'zadanie', ?)",
+            ((day, i % 3 == 0) for i, day in enumerate(rows)),
+        )
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [1000, 100000, 1000000]
+    app = QApplication([])  # noqa: F841
+    os.chdir(tempfile.mkdtemp())
+    for count in counts:
+        for name in os.listdir("."):
+            os.remove(name)
+        store = TaskStore(legacy_json=None)
+        start = time.perf_counter()
+        fill(store, count)
+        fill_time = time.perf_counter() - start
+        store.close()
+
+        tab = ToDoCalendar()
+        pages = [(2020 + month // 12, month % 12 + 1) for month in range(120)]
+        start = time.perf_counter()
+        for year, month in pages:
+            tab.paint_month(year, month)
+        per_month = (time.perf_counter() - start) / len(pages)
+        tab.shutdown()
+        print(f"{count:>8} zadań: paint_month {per_month * 1000:.3f} ms "
+              f"(wstawienie z licznikami: {fill_time:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+"""Dwukierunkowa synchronizacja z Google Calendar (CalendarPuller) na lokalnym
+zamienniku Events API (fake_calendar) z dużą liczbą wydarzeń.
+
+Kroki: pełna synchronizacja (wydarzenia spoza aplikacji mają zostać pominięte,
+a zadanie z dawnego tasks.json połączone ze swoim wydarzeniem), przyrostowa po kilku zmianach zdalnych (ma
+pobrać i zmienić tylko zmienione rekordy), konflikt zdalnej edycji z niewysłanym
+lokalnym usunięciem, wygasły syncToken (410) i ponowna pełna synchronizacja.
+Na końcu zadania w bazie muszą odpowiadać wydarzeniom na serwerze.
+
+Uruchomienie (z katalogu projekt):
+    python benchmarks/bench_calendar_pull.py [liczba_wydarzeń]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from calendar_sync import CalendarPuller  # noqa: E402
+from fake_calendar import FakeCalendarService  # noqa: E402
+from google_calendar_adapter import GoogleCalendarAdapter  # noqa: E402
+from task_store import TaskStore, event_date  # noqa: E402
+
+
+def pull(label, puller, service, pending=()):
+    listed = service.listed
+    start = time.perf_counter()
+    touched = puller.pull(pending)
+    elapsed = time.perf_counter() - start
+    print(f"{label:>34}: {elapsed:7.3f} s, pobrane wydarzenia {service.listed - listed:6}, "
+          f"zmienione zadania {touched:6}")
+    return touched
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 50000
+    # Zmiany zdalne rozłożone na całą listę; odstęp >= 8, żeby nie trafiały w seed2, seed3 i seed7
+    step = count // 10
+    assert step >= 8, "potrzeba co najmniej 80 wydarzeń"
+    service = FakeCalendarService(latency=0.0)
+    service.seed_events(count)
+    foreign = [service.remote_insert(f"obce {i}", "2025-03-03", app_event=False)["id"] for i in range(3)]
+    adapter = GoogleCalendarAdapter(service=service)
+    path = os.path.join(tempfile.mkdtemp(), "tasks.db")
+    store = TaskStore(path, legacy_json=None)
+    legacy = service.stored_events["seed3"]
+    with store.connection:
+        store.connection.execute("INSERT INTO tasks (date, title) VALUES (?, ?)",
+                                 (event_date(legacy), legacy["summary"]))
+    changes = []
+    puller = CalendarPuller(adapter, lambda: TaskStore(path, legacy_json=None), changes.append)
+
+    assert pull("pełna synchronizacja", puller, service) == count - 1
+    linked = store.tasks_for_date(event_date(legacy))
+    assert [task.event_id for task in linked if task.title == legacy["summary"]] == ["seed3"], \
+        "zadanie z tasks.json zdublowane zamiast połączone"
+    assert store.connection.execute(
+        f"SELECT COUNT(*) FROM tasks WHERE event_id IN ({','.join('?' * len(foreign))})", foreign
+    ).fetchone()[0] == 0, "pobrano wydarzenia spoza aplikacji"
+    assert pull("bez zmian", puller, service) == 0
+
+    # Zadania dodane lokalnie i wysłane - wracają z serwera, ale niczego nie zmieniają
+    local = [store.add("2025-05-05", f"lokalne {i}") for i in range(5)]
+    adapter.execute_batch([{"id": task.event_id, "kind": "insert", "event_id": task.event_id,
+                            "summary": task.title, "date": task.date} for task in local])
+    assert pull("echo własnych zmian", puller, service) == 0
+
+    for i in range(10):
+        service.remote_update(f"seed{i * step}", summary=f"zmienione {i}")
+    for i in range(5):
+        service.remote_insert(f"nowe {i}", "2025-06-01")
+        service.remote_delete(f"seed{i * step + 1}")
+    service.remote_update("seed7", date="2025-07-07")
+    assert pull("przyrostowa po 21 zmianach", puller, service) == 21
+
+    # Konflikt: zadanie usunięte lokalnie (usunięcie czeka w kolejce), a na serwerze edytowane
+    conflicted = local[0]
+    store.delete(conflicted.id)
+    service.remote_update(conflicted.event_id, summary="edycja zdalna")
+    assert pull("konflikt: lokalne usunięcie wygrywa", puller, service, {conflicted.event_id}) == 0
+    adapter.execute_batch([{"id": "d", "kind": "delete", "event_id": conflicted.event_id}])
+    assert pull("po wysłaniu usunięcia", puller, service) == 0
+
+    service.expire_sync_tokens()
+    service.remote_delete("seed2")
+    pull("wygasły token (410) - pełna", puller, service)
+
+    expected = {(event["id"], event_date(event), event["summary"])
+                for event in service.stored_events.values() if event["id"] not in foreign}
+    actual = {(task.event_id, task.date, task.title) for task in store.tasks_between("0000-01-01", "9999-12-31")}
+    assert actual == expected, "baza zadań nie odpowiada kalendarzowi"
+    print(f"zgodność z serwerem: {len(actual)} zadań, powiadomień o zmianach: {len(changes)}")
+    puller.close()
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
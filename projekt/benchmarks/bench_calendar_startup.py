@@ -0,0 +1,68 @@
+"""Koszt utworzenia zakładki ToDoCalendar z adapterem Google Calendar i bez niego.
+
+Każdy wariant działa w osobnym procesie (liczy się też import bibliotek Google):
+  eager   - dawna ścieżka: import googleapiclient + build("calendar", "v3") przed zakładką
+  lazy    - obecna zakładka: adapter łączy się w tle, konstruktor nie dotyka API
+Czas odświeżania tokenu i autoryzacji w przeglądarce (sieć) nie jest wliczony.
+
+Uruchomienie (z katalogu projekt):
+    python benchmarks/bench_calendar_startup.py [powtórzenia]
+"""
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+PROJECT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+VARIANTS = {
+    "eager": "dawniej: build() w konstruktorze",
+    "lazy": "obecnie: połączenie w tle",
+}
+
+
+def run_variant(variant):
+    os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+    sys.path.insert(0, PROJECT)
+    from PySide6.QtWidgets import QApplication
+    app = QApplication([])  # noqa: F841
+    start = time.perf_counter()
+    if variant == "eager":
+        import httplib2
+        from googleapiclient.discovery import build
+        from google_calendar_adapter import GoogleCalendarAdapter
+        service = build("calendar", "v3", http=httplib2.Http(), static_discovery=True)
+    from todocalendar import ToDoCalendar
+    if variant == "lazy":
+        tab = ToDoCalendar()
+    else:
+        # Gotowa usługa zamiast łączenia w tle - mierzymy sam koszt budowy
+        import todocalendar
+        todocalendar.GoogleCalendarAdapter = lambda: GoogleCalendarAdapter(service=service)
+        tab = ToDoCalendar()
+    elapsed = time.perf_counter() - start
+    tab.shutdown()
+    print(elapsed)
+
+
+def main():
+    repeats = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    workdir = tempfile.mkdtemp()
+    shutil.copy(os.path.join(PROJECT, "styles.qss"), workdir)
+    script = os.path.abspath(__file__)
+    for variant, label in VARIANTS.items():
+        times = []
+        for _ in range(repeats):
+            result = subprocess.run([sys.executable, script, "--variant", variant], cwd=workdir,
+                                    capture_output=True, text=True, check=True)
+            times.append(float(result.stdout.strip().splitlines()[-1]))
+        print(f"{variant:>6} ({label}): mediana {statistics.median(times) * 1000:.1f} ms")
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2 and sys.argv[1] == "--variant":
+        run_variant(sys.argv[2])
+    else:
+        main()
@@ -0,0 +1,74 @@
+"""Dodawanie zadań z synchronizacją Google Calendar: wywołanie synchroniczne
+(dawne add_event: insert().execute() w wątku UI) vs kolejka CalendarOutbox + CalendarSyncWorker.
+
+Usługa jest lokalnym zamiennikiem (fake_calendar) z opóźnieniem sieci.
+Kolejka najpierw działa offline, potem sieć wraca z losowymi błędami 503;
+na końcu każde zadanie musi być w kalendarzu dokładnie raz.
+
+Uruchomienie (z katalogu projekt):
+    python benchmarks/bench_calendar_sync.py [liczba_zadań]
+"""
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from calendar_sync import CalendarOutbox, CalendarSyncWorker, new_event_id  # noqa: E402
+from fake_calendar import FakeCalendarService  # noqa: E402
+from google_calendar_adapter import CALENDAR_ID, GoogleCalendarAdapter  # noqa: E402
+
+LATENCY = 0.1
+
+
+def legacy(count):
+    service = FakeCalendarService(latency=LATENCY)
+    start = time.perf_counter()
+    for i in range(count):
+        body = GoogleCalendarAdapter.event_body(f"zadanie {i}", "2025-01-01")
+        service.events().insert(calendarId=CALENDAR_ID, body=body).execute()
+    return (time.perf_counter() - start) / count
+
+
+def outbox(count):
+    service = FakeCalendarService(latency=LATENCY, offline=True, failure_rate=0.2)
+    adapter = GoogleCalendarAdapter(service=service)
+    path = os.path.join(tempfile.mkdtemp(), "tasks.db")
+    worker = CalendarSyncWorker(CalendarOutbox(path), adapter, retry_delay=0.05, max_retry_delay=0.2)
+    worker.start()
+    worst = 0.0
+    for i in range(count):
+        t = time.perf_counter()
+        worker.enqueue("insert", event_id=new_event_id(), summary=f"zadanie {i}", date="2025-01-01")
+        worst = max(worst, time.perf_counter() - t)
+
+    # Kolejka przetrwała "restart" aplikacji w trybie offline
+    assert len(CalendarOutbox(path)) == count
+
+    service.offline = False
+    start = time.perf_counter()
+    assert worker.wait_idle(timeout=60), "kolejka nie została opróżniona"
+    drained = time.perf_counter() - start
+    worker.stop()
+    summaries = sorted(event["summary"] for event in service.stored_events.values())
+    assert summaries == sorted(f"zadanie {i}" for i in range(count)), "brakujące lub zdublowane wydarzenia"
+    return worst, drained, service
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 500
+    sys.stdout = open(os.devnull, "w")  # wątek synchronizacji wypisuje komunikaty
+    try:
+        per_task = legacy(min(count, 20))
+        worst, drained, service = outbox(count)
+    finally:
+        sys.stdout = sys.__stdout__
+    print(f"insert (synchronicznie): {per_task * 1000:.1f} ms blokady UI na zadanie")
+    print(f"kolejka: najdłuższe dodanie {worst * 1000:.3f} ms, "
+          f"{count} zadań wysłanych w {drained:.2f} s "
+          f"({service.batches} paczek, {service.requests} żądań z ponowieniami)")
+
+
+if __name__ == "__main__":
+    main()
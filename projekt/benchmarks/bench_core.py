@@ -0,0 +1,163 @@
+"""Rdzeń aplikacji bez Qt: notatki, zadania i sesje skupienia bez ekranu.
+
+Dla każdego rozmiaru (domyślnie 10 tys., 100 tys. i 1 mln notatek i zadań)
+mierzy na warstwie, którą opakowują widżety:
+  - notatki (note_model + note_store, kodowanie SimpleObfuscator jak w aplikacji):
+    zapis, wczytanie, sortowanie każdą strategią, wyszukanie po identyfikatorze
+    z otwarciem treści, usunięcie 1% notatek (zapis migawki bez nich),
+  - zadania (task_store): wczytanie bazy z widokiem dnia i miesiąca, dodanie,
+    zapytania o zakres dat, usunięcie 1% zadań jedną transakcją,
+  - maszynę stanów sesji (focus_session) z wstrzykniętym zegarem.
+Kończy się kodem 1, gdy którykolwiek z modułów rdzenia załaduje PySide6
+albo wynik operacji się nie zgadza - skrypt ma działać w CI bez ekranu.
+
+Uruchomienie (z katalogu projekt):
+    python benchmarks/bench_core.py [liczba ...]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from focus_session import FocusSession  # noqa: E402
+from note_model import (  # noqa: E402
+    Note, ObfuscatedNoteCodec, SimpleObfuscator, SortByCategory, SortByDate, SortByTitle, SortedNoteIndex
+)
+from note_store import NoteJournal  # noqa: E402
+from task_store import TaskStore  # noqa: E402
+
+KEY = 123
+CATEGORIES = ["Nauka", "Praca", "Kodowanie", "Zadania"]
+WORDS = "python notatka zadanie kolokwium projekt algorytm wykład baza sieć egzamin".split()
+TODAY = date(2025, 6, 1)
+DAYS = 3 * 365
+
+
+def timed(action):
+    start = time.perf_counter()
+    result = action()
+    return result, time.perf_counter() - start
+
+
+def make_notes(count, seed=0):
+    rnd = random.Random(seed)
+    return [
+        Note(f"{rnd.choice(WORDS)} {i}", " ".join(rnd.choices(WORDS, k=12)), rnd.choice(CATEGORIES),
+             f"2025-{rnd.randint(1, 12):02}-{rnd.randint(1, 28):02} {rnd.randint(0, 23):02}:00:00")
+        for i in range(count)
+    ]
+
+
+def bench_notes(directory, count):
+    journal = NoteJournal(os.path.join(directory, f"notes{count}.json"))
+    codec = ObfuscatedNoteCodec(SimpleObfuscator(KEY))
+    notes = make_notes(count)
+    results = {}
+
+    _, results["zapis"] = timed(lambda: journal.write_snapshot(codec.encode_notes(notes)))
+    loaded, results["wczytanie"] = timed(lambda: codec.notes_from_records(journal.load()))
+    assert [note.id for note in loaded] == [note.id for note in notes]
+
+    def sort_all():
+        return [SortedNoteIndex(strategy, loaded) for strategy in (SortByDate(), SortByTitle(), SortByCategory())]
+    indexes, results["sortowanie (3 strategie)"] = timed(sort_all)
+    by_date = indexes[0]
+    assert all(by_date[i].timestamp >= by_date[i + 1].timestamp for i in range(0, len(by_date) - 1, 997))
+
+    sample = random.Random(1).sample(range(count), min(count, 10000))
+
+    def lookup():
+        by_id = {note.id: note for note in loaded}
+        return [by_id[notes[i].id].content for i in sample]
+    contents, results["wyszukanie + treść (10 tys.)"] = timed(lookup)
+    assert contents == [notes[i].content for i in sample]
+
+    removed = {notes[i].id for i in sample[:max(1, count // 100)]}
+
+    def delete():
+        remaining = [note for note in loaded if note.id not in removed]
+        journal.write_snapshot(codec.encode_notes(remaining))
+        return remaining
+    remaining, results["usunięcie 1%"] = timed(delete)
+    assert len(codec.notes_from_records(journal.load())) == len(remaining) == count - len(removed)
+    return results
+
+
+def bench_tasks(directory, count):
+    path = os.path.join(directory, f"tasks{count}.db")
+    store = TaskStore(path, legacy_json=None)
+    first = TODAY - timedelta(days=DAYS // 2)
+    days = [(first + timedelta(days=i)).isoformat() for i in range(DAYS)]
+    with store.connection:
+        store.connection.executemany(
+            "INSERT INTO tasks (date, title, completed, event_id) VALUES (?, ?, ?, ?)",
+            ((days[i % DAYS], f"zadanie {i}", int(days[i % DAYS] < TODAY.isoformat() and i % 50), f"e{i}")
+             for i in range(count))
+        )
+    store.close()
+    today = TODAY.isoformat()
+    results = {}
+
+    def load():
+        opened = TaskStore(path, legacy_json=None)
+        opened.tasks_for_date(today)
+        opened.month_counts(TODAY.year, TODAY.month)
+        return opened
+    store, results["wczytanie (dzień + miesiąc)"] = timed(load)
+
+    _, results["dodanie 1000 zadań"] = timed(lambda: [store.add(today, f"nowe {i}") for i in range(1000)])
+
+    week = (TODAY - timedelta(days=TODAY.weekday())).isoformat(), (TODAY + timedelta(days=6)).isoformat()
+    (week_count, overdue), results["zapytania (tydzień, zaległe)"] = timed(
+        lambda: (store.count_between(*week), store.overdue(today)))
+    assert week_count >= 1000 and all(not task.completed and task.date < today for task in overdue)
+
+    ids = [row[0] for row in store.connection.execute("SELECT id FROM tasks WHERE id % 100 = 0")]
+    deleted, results["usunięcie 1%"] = timed(lambda: store.delete_many(ids))
+    assert len(deleted) == len(ids)
+    store.close()
+    return results
+
+
+def bench_session(transitions=100000):
+    """Przejścia sesji z zegarem przesuwanym ręcznie - bez czekania i bez Qt"""
+    now = [0.0]
+    session = FocusSession(clock=lambda: now[0], wall_clock=lambda: now[0])
+    completed = 0
+    start = time.perf_counter()
+    for _ in range(transitions // 4):
+        session.start(60)
+        now[0] += 20
+        session.pause()
+        now[0] += 100  # pauza nie wlicza się do sesji
+        session.pause()
+        now[0] += 40
+        completed += session.finish()
+    elapsed = time.perf_counter() - start
+    assert completed == transitions // 4 and session.seconds() == 60
+    return elapsed / transitions
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+    directory = tempfile.mkdtemp()
+    for count in counts:
+        for name, bench in (("notatki", bench_notes), ("zadania", bench_tasks)):
+            results = bench(directory, count)
+            print(f"{count:>8} {name}: " + ", ".join(f"{label} {seconds * 1000:.1f} ms"
+                                                   for label, seconds in results.items()))
+    print(f"sesja skupienia: {bench_session() * 1e6:.2f} µs na przejście stanu")
+
+    qt_modules = sorted(name for name in sys.modules if name.split(".")[0] in ("PySide6", "shiboken6"))
+    if qt_modules:
+        print("BŁĄD: rdzeń załadował Qt:", ", ".join(qt_modules))
+        sys.exit(1)
+    print("rdzeń działa bez Qt")
+
+
+if __name__ == "__main__":
+    main()
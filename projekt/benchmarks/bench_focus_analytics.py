@@ -0,0 +1,115 @@
+"""Statystyki sesji (focus_analytics.FocusAnalytics) przy latach historii.
+
+Generuje dziennik sesji (focus_sessions.log) o zadanej liczbie wpisów
+rozłożonych na kilka lat i mierzy: pierwsze wczytanie (parsowanie całego
+dziennika + przeliczenie wektorowe), wczytanie z kopią kolumn (.npz),
+samo przeliczenie agregatów, dodanie jednej sesji (przyrostowo) oraz
+zapytania dla wykresów. Wyniki przyrostowe są porównywane z pełnym
+przeliczeniem i z prostą pętlą w Pythonie na małej próbce.
+
+Uruchomienie (z katalogu projekt):
+    python benchmarks/bench_focus_analytics.py [liczba_sesji ...]
+"""
+import json
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import numpy as np  # noqa: E402
+
+from focus_analytics import DAY, FocusAnalytics  # noqa: E402
+from focus_log import DEFAULT_ACTIVITIES, FocusLog  # noqa: E402
+from persistence import write_behind  # noqa: E402
+
+YEARS = 5
+FIRST_START = 1577836800.0  # 2020-01-01 UTC
+
+
+def write_log(path, count, seed=0):
+    generator = random.Random(seed)
+    span = YEARS * 365 * DAY
+    starts = sorted(FIRST_START + generator.random() * span for _ in range(count))
+    with open(path, "w") as file:
+        for start in starts:
+            duration = 60 * generator.choice((5, 10, 15, 25, 30, 50))
+            file.write(json.dumps({"start": start, "end": start + duration,
+                                   "activity": generator.choice(DEFAULT_ACTIVITIES),
+                                   "duration": duration, "points": 10}) + "\n")
+
+
+def naive(records, utc_offset):
+    """Te same agregaty liczone pętlą - do sprawdzenia wyników"""
+    daily, heatmap, activities = {}, np.zeros((7, 24), np.int64), {}
+    for record in records:
+        local = record["start"] + utc_offset
+        day = int(local // DAY)
+        daily[day] = daily.get(day, 0) + record["duration"]
+        heatmap[(day + 3) % 7, int(local % DAY // 3600)] += record["duration"]
+        activities[record["activity"]] = activities.get(record["activity"], 0) + record["duration"]
+    longest = current = 0
+    previous = None
+    for day in sorted(daily):
+        current = current + 1 if previous == day - 1 else 1
+        longest = max(longest, current)
+        previous = day
+    return daily, heatmap, activities, longest
+
+
+def timed(action):
+    start = time.perf_counter()
+    result = action()
+    return result, time.perf_counter() - start
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [10000, 100000, 1000000]
+    directory = tempfile.mkdtemp()
+    for count in counts:
+        path = os.path.join(directory, f"sessions{count}.log")
+        write_log(path, count)
+        log = FocusLog(path, legacy_dir=None)
+
+        analytics, first_load = timed(lambda: FocusAnalytics(log, utc_offset=0))
+        write_behind.flush()
+        cached, cached_load = timed(lambda: FocusAnalytics(log, utc_offset=0))
+        _, recompute = timed(cached.recompute)
+        assert cached.sessions == count and np.array_equal(cached.daily, analytics.daily)
+
+        # Sesje z dzisiaj i jutra dopisane po wczytaniu - przyrostowo i przez pełne przeliczenie
+        now = time.time()
+        new_records = [log.record_session(now + i * 600, now + i * 600 + 1500, "Coding", 1500) for i in range(3)]
+        new_records.append(log.record_session(now + DAY, now + DAY + 600, "Drawing", 600))
+        start = time.perf_counter()
+        for record in new_records:
+            cached.add_session(record)
+        incremental = (time.perf_counter() - start) / len(new_records)
+        full = FocusAnalytics(log, utc_offset=0)
+        assert np.array_equal(cached.daily, full.daily) and np.array_equal(cached.heatmap, full.heatmap)
+        assert cached.longest_streak == full.longest_streak
+        assert cached.activity_minutes() == full.activity_minutes()
+
+        _, queries = timed(lambda: (cached.daily_minutes(30), cached.weekly_minutes(12),
+                                    cached.heatmap_minutes(), cached.streaks(), cached.activity_minutes()))
+        print(f"{count:>8} sesji: pierwsze wczytanie {first_load:.3f} s, z kopią .npz {cached_load * 1000:.1f} ms, "
+              f"przeliczenie {recompute * 1000:.1f} ms, nowa sesja {incremental * 1000:.3f} ms, "
+              f"zapytania wykresów {queries * 1000:.2f} ms")
+
+    # Poprawność względem pętli w Pythonie na małej historii
+    path = os.path.join(directory, "check.log")
+    write_log(path, 3000, seed=1)
+    log = FocusLog(path, legacy_dir=None)
+    analytics = FocusAnalytics(log, cache_path=path + ".check.npz", utc_offset=3600)
+    daily, heatmap, activities, longest = naive(log.records(), 3600)
+    assert {analytics.first_day + i: int(v) for i, v in enumerate(analytics.daily) if v} == daily
+    assert np.array_equal(analytics.heatmap, heatmap)
+    assert analytics.activity_minutes() == {activity: seconds / 60 for activity, seconds in activities.items()}
+    assert analytics.longest_streak == longest
+    print("wyniki zgodne z obliczeniem pętlą w Pythonie")
+
+
+if __name__ == "__main__":
+    main()
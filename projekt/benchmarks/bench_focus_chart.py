@@ -0,0 +1,116 @@
+"""Wykres kołowy Focus Timera: import modułu i aktualizacja po ukończonej sesji.
+
+1. Czas importu focus_timer w świeżym procesie i czy matplotlib jest
+   wtedy ładowany (powinien dopiero po pierwszym narysowaniu zakładki).
+2. Aktualizacja wykresu: dawne figure.clear() + ax.pie() + blokujące
+   canvas.draw() wobec przesunięcia istniejących wycinków i draw_idle()
+   (liczone razem z obsługą zdarzeń, w której odbywa się rysowanie)
+   oraz aktualizacja bez zmian w danych (pomijana).
+Geometria przesuniętych wycinków jest porównywana z wykresem narysowanym od nowa.
+
+Uruchomienie (z katalogu projekt):
+    python benchmarks/bench_focus_chart.py [liczba_aktualizacji]
+"""
+import os
+import subprocess
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+PROJECT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..")
+sys.path.insert(0, PROJECT)
+
+IMPORT_PROBE = """
+import sys, time
+{setup}
+start = time.perf_counter()
+import {module}
+print(time.perf_counter() - start, "matplotlib" in sys.modules)
+"""
+
+
+def import_time(module, setup="", runs=5):
+    best, loaded = None, None
+    for _ in range(runs):
+        output = subprocess.run([sys.executable, "-c", IMPORT_PROBE.format(module=module, setup=setup)], cwd=PROJECT,
+                                capture_output=True, text=True, check=True).stdout.split()
+        elapsed, loaded = float(output[0]), output[1] == "True"
+        best = elapsed if best is None else min(best, elapsed)
+    return best, loaded
+
+
+def main():
+    updates = int(sys.argv[1]) if len(sys.argv) > 1 else 100
+    focus_time, loaded = import_time("focus_timer")
+    # Backend wybiera wiązania Qt już załadowane w procesie (jak w aplikacji - PySide6)
+    matplotlib_time, _ = import_time("matplotlib.backends.backend_qt5agg", setup="import PySide6.QtWidgets")
+    print(f"import focus_timer: {focus_time * 1000:.1f} ms, matplotlib załadowany: {loaded} "
+          f"(sam backend matplotlib: {matplotlib_time * 1000:.1f} ms)")
+
+    from PySide6.QtWidgets import QApplication
+    from focus_timer import FocusTimer
+
+    app = QApplication([])
+    styles = os.path.join(PROJECT, "styles.qss")
+    os.chdir(tempfile.mkdtemp())
+    with open(styles) as source, open("styles.qss", "w") as target:
+        target.write(source.read())
+    timer = FocusTimer()
+    timer.resize(600, 900)
+    start = time.perf_counter()
+    timer.show()
+    # Wykres powstaje w osobnym kroku pętli zdarzeń, po pierwszym narysowaniu zakładki
+    while timer.canvas is None:
+        app.processEvents()
+    app.processEvents()
+    print(f"pierwsze pokazanie zakładki (import matplotlib + wykres): {(time.perf_counter() - start) * 1000:.1f} ms")
+    minutes = timer.stats.activity_minutes
+
+    def full_redraw():
+        timer.figure.clear()
+        ax = timer.figure.add_subplot(111)
+        ax.pie(list(minutes.values()), labels=list(minutes.keys()), autopct='%1.1f%%', startangle=140)
+        timer.canvas.draw()
+
+    start = time.perf_counter()
+    for i in range(updates):
+        minutes["Coding"] += 1
+        full_redraw()
+    old = (time.perf_counter() - start) / updates
+    # Wykres narysowany od nowa nie jest już tym z timer.pie_*
+    timer.chart_data = None
+    timer.update_pie_chart()
+    app.processEvents()
+
+    start = time.perf_counter()
+    for i in range(updates):
+        minutes["Reading"] += 1
+        timer.update_pie_chart()
+        app.processEvents()
+    new = (time.perf_counter() - start) / updates
+
+    start = time.perf_counter()
+    for i in range(updates):
+        timer.update_pie_chart()
+        app.processEvents()
+    unchanged = (time.perf_counter() - start) / updates
+
+    moved = [(wedge.theta1, wedge.theta2) for wedge in timer.pie_wedges]
+    texts = [(text.get_position(), text.get_text()) for text in timer.pie_labels + timer.pie_autotexts]
+    timer.chart_data = None
+    timer.pie_wedges = []
+    timer.update_pie_chart()
+    expected = [(wedge.theta1, wedge.theta2) for wedge in timer.pie_wedges]
+    expected_texts = [(text.get_position(), text.get_text()) for text in timer.pie_labels + timer.pie_autotexts]
+    assert all(abs(a - b) < 1e-9 for pair, other in zip(moved, expected) for a, b in zip(pair, other))
+    assert all(abs(a - b) < 1e-9 and t == u for (p, t), (q, u) in zip(texts, expected_texts)
+               for a, b in zip(p, q))
+
+    print(f"aktualizacja: od nowa {old * 1000:.2f} ms, w miejscu + draw_idle {new * 1000:.2f} ms, "
+          f"bez zmian {unchanged * 1000:.3f} ms")
+    timer.close()
+
+
+if __name__ == "__main__":
+    main()
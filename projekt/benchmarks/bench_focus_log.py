@@ -0,0 +1,88 @@
+"""Dziennik sesji Focus Timera (focus_log.FocusLog) przy rosnącej liczbie sesji.
+
+Mierzy koszt ukończenia sesji (jedno dopisanie do dziennika) wobec dawnych
+trzech pełnych zapisów points.json/stats.json/activities.json oraz czas
+odtworzenia agregatów z dziennika jednym przebiegiem przy starcie.
+Sprawdza też migrację dawnych plików (activities.json płaski i zagnieżdżony).
+
+Uruchomienie (z katalogu projekt):
+    python benchmarks/bench_focus_log.py [liczba_sesji ...]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from focus_log import DEFAULT_ACTIVITIES, FocusLog  # noqa: E402
+from persistence import atomic_write_json  # noqa: E402
+
+
+def check_migration(directory):
+    for activities in ({"Reading": 2, "Coding": 1}, {"activities": {"Reading": 2, "Coding": 1}}):
+        for name, data in (("points.json", {"points": 130}), ("stats.json", {"total_time": 930}),
+                           ("activities.json", activities)):
+            with open(os.path.join(directory, name), "w") as file:
+                json.dump(data, file)
+        path = os.path.join(directory, "focus_sessions.log")
+        if os.path.exists(path):
+            os.remove(path)
+        stats = FocusLog(path, legacy_dir=directory).stats
+        assert (stats.points, stats.total_time) == (130, 930)
+        assert stats.activity_minutes["Reading"] == 2 and stats.activity_minutes["Coding"] == 1
+        # Drugie otwarcie nie migruje ponownie
+        assert FocusLog(path, legacy_dir=directory).stats.points == 130
+    print("migracja dawnych plików: OK (płaski i zagnieżdżony activities.json)")
+
+
+def legacy_completion(directory, points, total_time, activities):
+    # Dawne zachowanie: trzy niezależne odczyty-modyfikacje-zapisy
+    atomic_write_json(os.path.join(directory, "points.json"), {"points": points})
+    atomic_write_json(os.path.join(directory, "stats.json"), {"total_time": total_time})
+    atomic_write_json(os.path.join(directory, "activities.json"), activities)
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [1000, 100000, 1000000]
+    directory = tempfile.mkdtemp()
+    check_migration(directory)
+    for count in counts:
+        path = os.path.join(directory, f"sessions{count}.log")
+        log = FocusLog(path, legacy_dir=None)
+        start = time.perf_counter()
+        with open(path, "a") as file:
+            for i in range(count):
+                duration = 60 * (1 + i % 30)
+                file.write(json.dumps({"start": i * 3600.0, "end": i * 3600.0 + duration,
+                                       "activity": DEFAULT_ACTIVITIES[i % 4], "duration": duration,
+                                       "points": 10}) + "\n")
+        fill_time = time.perf_counter() - start
+
+        repeat = 200
+        start = time.perf_counter()
+        for i in range(repeat):
+            log.record_session(0.0, 60.0, "Coding", 60)
+        append_time = (time.perf_counter() - start) / repeat
+
+        stats = log.stats
+        start = time.perf_counter()
+        for i in range(repeat):
+            legacy_completion(directory, stats.points, stats.total_time, dict(stats.activity_minutes))
+        legacy_time = (time.perf_counter() - start) / repeat
+
+        start = time.perf_counter()
+        rebuilt = FocusLog(path, legacy_dir=None).stats
+        rebuild_time = time.perf_counter() - start
+        assert rebuilt.sessions == count + repeat
+        assert rebuilt.points == 10 * (count + repeat)
+
+        print(f"{count:>8} sesji: ukończenie {append_time * 1000:.3f} ms "
+              f"(dawniej 3 pliki: {legacy_time * 1000:.3f} ms), "
+              f"odtworzenie agregatów {rebuild_time:.3f} s "
+              f"(dziennik {os.path.getsize(path) / 1e6:.1f} MB, zapis {fill_time:.2f} s)")
+
+
+if __name__ == "__main__":
+    main()
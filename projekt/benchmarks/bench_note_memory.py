@@ -0,0 +1,56 @@
+"""Pamięć zajmowana przez notatki: dawna klasa z __dict__ i datą jako napisem
+vs Note (__slots__, internowane kategorie, data jako liczba sekund).
+
+Uruchomienie (z katalogu projekt):
+    python benchmarks/bench_note_memory.py [liczba_notatek]
+"""
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from note_model import Note, new_note_id  # noqa: E402
+
+CATEGORIES = ["Nauka", "Praca", "Kodowanie", "Zadania"]
+
+
+class LegacyNote:
+    def __init__(self, title, content, category, date, note_id):
+        self.id = note_id
+        self.title = title
+        self.content = content
+        self.category = category
+        self.date = date
+
+
+def records(count):
+    # Każde pole to osobny obiekt napisu, tak jak po json.load
+    for i in range(count):
+        yield (f"notatka {i}", f"treść notatki numer {i}", "".join(CATEGORIES[i % 4]),
+               f"2025-{i % 12 + 1:02}-{i % 28 + 1:02} {i % 24:02}:{i % 60:02}:{i % 60:02}", new_note_id())
+
+
+def measure(label, cls, count):
+    gc.collect()
+    tracemalloc.start()
+    notes = [cls(title, content, category, date, note_id)
+             for title, content, category, date, note_id in records(count)]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:34} {current / count:7.1f} B/notatkę | razem {current / 2**20:8.1f} MB")
+    return notes
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1_000_000
+    print(f"{count} notatek")
+    notes = measure("przed: __dict__, data jako napis", LegacyNote, count)
+    del notes
+    notes = measure("po: __slots__, intern, sekundy", Note, count)
+    del notes
+
+
+if __name__ == "__main__":
+    main()
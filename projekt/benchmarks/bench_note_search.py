@@ -0,0 +1,65 @@
+"""Indeks wyszukiwania notatek: czas budowy, zapisu i wczytania zapisanego
+indeksu oraz opóźnienie zapytań w trakcie pisania.
+
+Uruchomienie (z katalogu projekt):
+    python benchmarks/bench_note_search.py [liczba_notatek]
+"""
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from note_search import NoteSearchIndex  # noqa: E402
+from notes import Note, SimpleObfuscator  # noqa: E402
+
+WORDS = ["algorytm", "baza", "całka", "drzewo", "egzamin", "funkcja", "graf", "heurystyka",
+         "indeks", "kolokwium", "lista", "macierz", "notatka", "obiekt", "projekt", "rekurencja",
+         "sortowanie", "termin", "wzorzec", "zadanie", "źródło", "żądanie"]
+
+
+def make_notes(count):
+    rnd = random.Random(3)
+    notes = []
+    for i in range(count):
+        words = [f"{rnd.choice(WORDS)}{rnd.randint(0, 500)}" for _ in range(rnd.randint(10, 60))]
+        notes.append(Note(f"{rnd.choice(WORDS)} {i}", " ".join(words),
+                          rnd.choice(["Nauka", "Praca", "Kodowanie", "Zadania"]),
+                          f"2025-{rnd.randint(1, 12):02}-{rnd.randint(1, 28):02} 12:00:00"))
+    return notes
+
+
+def timed(label, func):
+    start = time.perf_counter()
+    result = func()
+    print(f"{label:40} {(time.perf_counter() - start) * 1000:9.2f} ms")
+    return result
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    notes = make_notes(count)
+    obfuscator = SimpleObfuscator(123)
+    with tempfile.TemporaryDirectory() as workdir:
+        path = os.path.join(workdir, "notes.json.idx")
+        index = NoteSearchIndex(path, obfuscator.obfuscate_many, obfuscator.deobfuscate_many)
+        timed(f"budowa od zera ({count} notatek)", lambda: index.build(notes))
+        timed("zapis indeksu", index.save)
+        print(f"{'rozmiar pliku':40} {os.path.getsize(path) / 2**20:9.2f} MB")
+
+        reloaded = NoteSearchIndex(path, obfuscator.obfuscate_many, obfuscator.deobfuscate_many)
+        timed("start z zapisanym indeksem", lambda: reloaded.build(notes))
+        timed("dodanie notatki", lambda: reloaded.add(Note("nowa graf", "macierz123 wzorzec", "Nauka",
+                                                             "2025-06-01 10:00:00")))
+
+        for query, kwargs in [("g", {}), ("gra", {}), ("graf1", {}), ("graf12 macierz3", {}),
+                              ("algorytm42", {"category": "Praca"}),
+                              ("", {"date_from": "2025-03-01", "date_to": "2025-03-07"})]:
+            found = timed(f"zapytanie {query!r} {kwargs}", lambda: reloaded.search(query, **kwargs))
+            print(f"{'':40} -> {len(found)} wyników")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,88 @@
+"""Czas odświeżenia listy notatek: dawna przebudowa QListWidget vs model
+NotesListModel w QListView nad SortedNoteIndex (budowa indeksu strategii,
+ponowne odświeżenie, wstawienie pojedynczej notatki, zmiana strategii).
+
+Uruchomienie (z katalogu projekt):
+    python benchmarks/bench_notes_list.py [--legacy-max N]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PySide6.QtWidgets import QApplication, QListWidget, QListWidgetItem  # noqa: E402
+
+from notes import Note, NoteFactory, Notes  # noqa: E402
+
+
+def make_notes(count):
+    rnd = random.Random(7)
+    categories = ["Nauka", "Praca", "Kodowanie", "Zadania"]
+    return [
+        Note(f"notatka {i}", "treść", rnd.choice(categories),
+             f"2025-{rnd.randint(1, 12):02}-{rnd.randint(1, 28):02} {rnd.randint(0, 23):02}:00:00")
+        for i in range(count)
+    ]
+
+
+def timed(func):
+    start = time.perf_counter()
+    func()
+    QApplication.processEvents()
+    return (time.perf_counter() - start) * 1000
+
+
+def legacy_refresh(widget, notes, sort_strategy):
+    widget.clear()
+    for note in sort_strategy.sort(notes):
+        widget.addItem(QListWidgetItem(f"{note.title} ({note.category}) - {note.date}"))
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--legacy-max", type=int, default=100_000,
+                        help="największy rozmiar, dla którego mierzymy QListWidget")
+    args = parser.parse_args()
+
+    app = QApplication.instance() or QApplication([])
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        notes_widget = Notes()
+        notes_widget.show()
+        QApplication.processEvents()
+        notes_widget.loader.wait()
+        QApplication.processEvents()
+        legacy_widget = QListWidget()
+        legacy_widget.show()
+
+        for count in (10_000, 100_000, 1_000_000):
+            notes = make_notes(count)
+            notes_widget.set_notes(notes)
+            notes_widget.change_sort_strategy("Sort by Date")
+            first_ms = timed(notes_widget.refresh_notes_list)
+            cached_ms = timed(notes_widget.refresh_notes_list)
+            note = NoteFactory.create_note("Nauka", "nowa", "treść")
+            notes_widget.notes.append(note)
+            insert_ms = timed(lambda: notes_widget.on_note_added(note))
+            notes_widget.change_sort_strategy("Sort by Title")
+            switch_ms = timed(notes_widget.apply_sort)
+            notes_widget.change_sort_strategy("Sort by Date")
+            switch_back_ms = timed(notes_widget.apply_sort)
+            line = (f"{count:>9} notatek | model: pierwsze {first_ms:8.1f} ms, ponowne {cached_ms:6.1f} ms, "
+                    f"wstawienie {insert_ms:6.1f} ms, zmiana strategii {switch_ms:8.1f} ms / "
+                    f"powrót {switch_back_ms:6.1f} ms")
+            if count <= args.legacy_max:
+                legacy_ms = timed(lambda: legacy_refresh(legacy_widget, notes, notes_widget.sort_strategy))
+                line += f" | QListWidget: {legacy_ms:9.1f} ms"
+                legacy_widget.clear()
+            print(line)
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
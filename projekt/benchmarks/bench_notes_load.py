@@ -0,0 +1,93 @@
+"""Czas startu i pamięć przy ładowaniu zakodowanego pliku notatek:
+pełne odkodowanie wszystkich pól vs nagłówki + leniwe treści (LazyNote).
+
+Uruchomienie (z katalogu projekt):
+    python benchmarks/bench_notes_load.py [liczba_notatek]
+"""
+import gc
+import os
+import random
+import sys
+import tempfile
+import time
+import tracemalloc
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from note_store import NoteJournal  # noqa: E402
+from notes import NoteCodec, Notes, ObfuscatedNotesDecorator, SimpleObfuscator  # noqa: E402
+
+KEY = 123
+
+
+def write_dataset(path, count, obfuscator):
+    rnd = random.Random(1)
+    words = ["notatka", "kolokwium", "algorytm", "projekt", "wzorzec", "zadanie", "termin"]
+    notes = []
+    for i in range(count):
+        notes.append({
+            "title": f"{rnd.choice(words)} {i}",
+            "content": " ".join(rnd.choice(words) for _ in range(rnd.randint(10, 60))),
+            "category": rnd.choice(["Nauka", "Praca", "Kodowanie", "Zadania"]),
+            "date": f"2025-{rnd.randint(1, 12):02}-{rnd.randint(1, 28):02} 12:00:00",
+        })
+    encoded = [{key: obfuscator.obfuscate(value) for key, value in note.items()} for note in notes]
+    NoteJournal(path).write_snapshot(encoded)
+
+
+def measure(label, build):
+    # Czas mierzony bez tracemalloc (śledzenie alokacji wielokrotnie spowalnia kod)
+    gc.collect()
+    start = time.perf_counter()
+    notes = build()
+    elapsed = time.perf_counter() - start
+    del notes
+    gc.collect()
+    tracemalloc.start()
+    notes = build()
+    current, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"{label:28} {elapsed * 1000:9.1f} ms | zajęte {current / 2**20:7.1f} MB | szczyt {peak / 2**20:7.1f} MB")
+    return notes
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100_000
+    app = QApplication.instance() or QApplication([])
+    obfuscator = SimpleObfuscator(KEY)
+    with tempfile.TemporaryDirectory() as workdir:
+        os.chdir(workdir)
+        write_dataset("notes.json", count, obfuscator)
+        decorator = ObfuscatedNotesDecorator(Notes(), obfuscator)
+        journal = decorator.widget.journal
+        print(f"{count} notatek, plik {os.path.getsize('notes.json') / 2**20:.1f} MB")
+
+        def eager():
+            records = journal.load()
+            plain = decorator.widget.codec.deobfuscate_records(records)
+            return NoteCodec().notes_from_records(plain)
+
+        def lazy():
+            return decorator.widget.codec.notes_from_records(journal.load())
+
+        eager_notes = measure("pełne odkodowanie", eager)
+        del eager_notes
+        lazy_notes = measure("nagłówki + leniwe treści", lazy)
+
+        start = time.perf_counter()
+        for note in lazy_notes[:1000]:
+            note.content
+        first = time.perf_counter() - start
+        start = time.perf_counter()
+        for note in lazy_notes[:1000]:
+            note.content
+        cached = time.perf_counter() - start
+        print(f"otwarcie 1000 notatek: pierwsze {first * 1000:.1f} ms, z cache {cached * 1000:.1f} ms")
+    app.quit()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""Mikrobenchmark SimpleObfuscator: przepustowość (MB/s) starej pętli chr/ord
+i nowego kodeka tablicowego/wsadowego.
+
+Uruchomienie (z katalogu projekt):
+    python benchmarks/bench_obfuscator.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from notes import SimpleObfuscator  # noqa: E402
+
+KEY = 123
+
+
+def legacy_xor(text, key=KEY):
+    return ''.join(chr(ord(c) ^ key) for c in text)
+
+
+def make_texts(count, length, alphabet):
+    rnd = random.Random(42)
+    return [''.join(rnd.choice(alphabet) for _ in range(length)) for _ in range(count)]
+
+
+def throughput(func, texts, repeat=3):
+    size_mb = sum(len(t.encode("utf-8")) for t in texts) / (1024 * 1024)
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(texts)
+        best = min(best, time.perf_counter() - start)
+    return size_mb / best
+
+
+def main():
+    obfuscator = SimpleObfuscator(KEY)
+    datasets = {
+        "ascii, 20k x 200 zn.": make_texts(20000, 200, "abcdefghijklmnopqrstuvwxyz ABC0123456789.,"),
+        "polskie, 20k x 200 zn.": make_texts(20000, 200, "aąbcćdeęfghijklłmnńoóprsśtuwyzźż "),
+        "ascii, 2 x 4 MB": make_texts(2, 4 * 1024 * 1024, "abcdefghijklmnopqrstuvwxyz \n"),
+    }
+    for name, texts in datasets.items():
+        expected = [legacy_xor(t) for t in texts]
+        assert [obfuscator.obfuscate(t) for t in texts] == expected
+        assert obfuscator.obfuscate_many(texts) == expected
+
+        legacy = throughput(lambda ts: [legacy_xor(t) for t in ts], texts)
+        single = throughput(lambda ts: [obfuscator.obfuscate(t) for t in ts], texts)
+        batch = throughput(obfuscator.obfuscate_many, texts)
+        print(f"{name:26} legacy {legacy:8.1f} MB/s | obfuscate {single:8.1f} MB/s | "
+              f"obfuscate_many {batch:8.1f} MB/s")
+
+
+if __name__ == "__main__":
+    main()
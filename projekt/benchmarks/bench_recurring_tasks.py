@@ -0,0 +1,90 @@
+"""Zadania cykliczne w TaskStore: reguły rozwijane leniwie tylko dla oglądanego przedziału.
+
+Porównuje wyświetlenie dnia (tasks_for_date) i miesiąca (month_counts) przy
+rosnącej liczbie reguł dziennych trwających od lat z wariantem, w którym
+każde wystąpienie jest osobnym wierszem tabeli tasks. Liczba wygenerowanych
+wystąpień na jedno wyświetlenie powinna zależeć od reguł obejmujących
+przedział, a nie od ich wieku.
+
+Uruchomienie (z katalogu projekt):
+    python benchmarks/bench_recurring_tasks.py [liczba_reguł ...]
+"""
+import os
+import sys
+import tempfile
+import time
+from datetime import date, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+import recurrence  # noqa: E402
+import task_store  # noqa: E402
+from task_store import DONE, SKIPPED, TaskStore  # noqa: E402
+
+FIRST_DAY = date(2020, 1, 1)
+SHOWN_DAY = "2025-06-15"
+YEARS = 5
+
+
+class CountingOccurrences:
+    """Podmienia task_store.occurrences, żeby policzyć wygenerowane daty"""
+    def __init__(self):
+        self.generated = 0
+
+    def __call__(self, rule, start, end):
+        for day in recurrence.occurrences(rule, start, end):
+            self.generated += 1
+            yield day
+
+
+def timed(action, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        action()
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def main():
+    counts = [int(arg) for arg in sys.argv[1:]] or [10, 100, 1000]
+    counter = CountingOccurrences()
+    task_store.occurrences = counter
+    directory = tempfile.mkdtemp()
+    for count in counts:
+        lazy = TaskStore(os.path.join(directory, f"lazy{count}.db"), legacy_json=None)
+        rules = [lazy.add_recurring(FIRST_DAY.isoformat(), f"reguła {i}", "daily", 1 + i % 3)
+                 for i in range(count)]
+        # Rzadkie wpisy stanu: co dziesiąta reguła ma kilka wykonanych i pominiętych dni
+        for rule in rules[::10]:
+            lazy.set_occurrence_states([(rule.id, "2025-06-1" + str(d)) for d in range(0, 9, 2)], DONE)
+            lazy.set_occurrence_states([(rule.id, "2025-06-2" + str(d)) for d in range(1, 9, 2)], SKIPPED)
+
+        materialized = TaskStore(os.path.join(directory, f"rows{count}.db"), legacy_json=None)
+        days = [(FIRST_DAY + timedelta(days=i)).isoformat() for i in range(YEARS * 366)]
+        start = time.perf_counter()
+        with materialized.connection:
+            materialized.connection.executemany(
+                "INSERT INTO tasks (date, title) VALUES (?, ?)",
+                ((day, f"reguła {i}") for i in range(count) for day in days[::1 + i % 3]),
+            )
+        fill_time = time.perf_counter() - start
+        rows = materialized.connection.execute("SELECT COUNT(*) FROM tasks").fetchone()[0]
+
+        counter.generated = 0
+        day_lazy = timed(lambda: lazy.tasks_for_date(SHOWN_DAY), 20)
+        per_day = counter.generated / 20
+        counter.generated = 0
+        month_lazy = timed(lambda: lazy.month_counts(2025, 6), 5)
+        per_month = counter.generated / 5
+        day_rows = timed(lambda: materialized.tasks_for_date(SHOWN_DAY), 20)
+        month_rows = timed(lambda: materialized.month_counts(2025, 6), 5)
+
+        print(f"{count:>6} reguł: dzień {day_lazy:8.3f} ms ({per_day:.0f} wystąpień), "
+              f"miesiąc {month_lazy:8.3f} ms ({per_month:.0f} wystąpień); "
+              f"jako wiersze ({rows} wierszy, zapis {fill_time:.2f} s): "
+              f"dzień {day_rows:8.3f} ms, miesiąc {month_rows:8.3f} ms")
+        lazy.close()
+        materialized.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,224 @@
+"""Benchmark regresji na danych z generate_dataset.py, z zapisanym punktem odniesienia.
+
+Generuje dane w wybranej skali, a potem w kilku przebiegach (każdy na świeżej
+kopii danych) mierzy:
+  - startup: czas do pierwszego narysowania MainApp (osobny proces, jak bench_startup),
+  - load_notes_async (start zakładki notatek: wczytywanie w tle do on_notes_loaded)
+    i load_notes_async_max_stall (najdłuższa przerwa pętli zdarzeń w tym czasie),
+  - load_notes, save_notes (razem z zapisem w tle), refresh_notes_list
+    (nowa strategia sortowania i wyszukiwanie) w zakładce notatek z dekoratorem,
+  - display_tasks_for_date (najbardziej zajęty dzień) i delete_task
+    (usunięcie wykonanych zadań tego dnia) w ToDoCalendar.
+Mediany porównuje z benchmarks/baselines.json i kończy się kodem 1, gdy
+któraś operacja jest wolniejsza o więcej niż --threshold (i o więcej niż
+MIN_REGRESSION_MS - szum przy bardzo krótkich pomiarach). --update zapisuje
+bieżące wyniki jako nowy punkt odniesienia dla danej skali. Punkt odniesienia
+jest zależny od maszyny - po zmianie maszyny CI trzeba go odświeżyć.
+
+Usługa Google Calendar to lokalny zamiennik (fake_calendar).
+
+Uruchomienie (z katalogu projekt):
+    python benchmarks/bench_regression.py [--scale small|medium|large] [--runs N]
+                                          [--threshold 0.3] [--update]
+"""
+import argparse
+import json
+import os
+import shutil
+import statistics
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PySide6.QtCore import QEventLoop, QTimer  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+import todocalendar  # noqa: E402
+from bench_startup import run as first_paint  # noqa: E402
+from fake_calendar import FakeCalendarService  # noqa: E402
+from generate_dataset import NOTES_KEY, generate  # noqa: E402
+from google_calendar_adapter import GoogleCalendarAdapter  # noqa: E402
+from note_model import SortByTitle  # noqa: E402
+from notes import Notes, ObfuscatedNotesDecorator, SimpleObfuscator  # noqa: E402
+from persistence import write_behind  # noqa: E402
+
+PROJECT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+BASELINES = os.path.join(PROJECT, "benchmarks", "baselines.json")
+SCALES = {
+    "small": {"notes": 10000, "tasks": 20000, "sessions": 5000},
+    "medium": {"notes": 100000, "tasks": 200000, "sessions": 50000},
+    "large": {"notes": 1000000, "tasks": 1000000, "sessions": 500000},
+}
+MIN_REGRESSION_MS = 5.0
+
+
+def timed(action):
+    start = time.perf_counter()
+    action()
+    return time.perf_counter() - start
+
+
+def load_in_background(widget):
+    """Czeka na koniec wczytywania w tle; zwraca najdłuższą przerwę między tyknięciami timera 1 ms.
+
+    Przerwa timera to czas, przez który wątek UI był zajęty (np. dopisywaniem porcji notatek).
+    """
+    loop = QEventLoop()
+    last_tick = [time.perf_counter()]
+    longest = [0.0]
+
+    def tick():
+        now = time.perf_counter()
+        longest[0] = max(longest[0], now - last_tick[0])
+        last_tick[0] = now
+        if widget.loader is not None and not widget.loading:
+            loop.quit()
+    timer = QTimer()
+    timer.timeout.connect(tick)
+    timer.start(1)
+    loop.exec()
+    timer.stop()
+    return longest[0]
+
+
+def measure_notes(app):
+    start = time.perf_counter()
+    decorator = ObfuscatedNotesDecorator(Notes(), SimpleObfuscator(NOTES_KEY))
+    widget = decorator.widget
+    # Najpierw start zakładki jak w aplikacji (wczytywanie w tle), potem pomiary wprost
+    stall = load_in_background(widget)
+    results = {"load_notes_async": time.perf_counter() - start, "load_notes_async_max_stall": stall}
+    # Po wczytaniu indeks wyszukiwania powstaje w tle (z pliku .idx) i jest podmieniany w pętli zdarzeń
+    if widget.index_builder is not None:
+        widget.index_builder.wait()
+    app.processEvents()
+    results["load_notes"] = timed(decorator.load_notes)
+
+    def save():
+        decorator.save_notes()
+        widget.journal.wait()
+    results["save_notes"] = timed(save)
+
+    def refresh_sorted():
+        widget.sort_strategy = SortByTitle()
+        widget.sorted_indexes = {}
+        widget.refresh_notes_list()
+    results["refresh_notes_list"] = timed(refresh_sorted)
+    assert widget.search_index.is_built
+    widget.search_input.blockSignals(True)
+    widget.search_input.setText("projekt egz")
+    widget.search_input.blockSignals(False)
+    results["refresh_notes_list_search"] = timed(widget.refresh_notes_list)
+    widget.shutdown()
+    widget.deleteLater()
+    return results
+
+
+def measure_tasks(app):
+    service = FakeCalendarService(latency=0)
+    todocalendar.GoogleCalendarAdapter = lambda: GoogleCalendarAdapter(service=service)
+    tab = todocalendar.ToDoCalendar()
+    busiest, = tab.task_store.connection.execute(
+        "SELECT date FROM tasks GROUP BY date ORDER BY COUNT(*) DESC, date LIMIT 1").fetchone()
+    repeat = 20
+    results = {"display_tasks_for_date": timed(lambda: [tab.display_tasks_for_date(busiest)
+                                                       for _ in range(repeat)]) / repeat}
+    tab.current_date = busiest
+    for task in tab.task_store.tasks_for_date(busiest):
+        tab.set_task_completed(task, True)
+    results["delete_task"] = timed(tab.delete_task)
+    assert not any(task.completed for task in tab.task_store.tasks_for_date(busiest))
+    # Zmiany z pierwszej synchronizacji, już w kolejce zdarzeń, muszą trafić do otwartej bazy
+    tab.remote_changes.disconnect()
+    app.processEvents()
+    tab.shutdown()
+    tab.deleteLater()
+    return results
+
+
+def run_once(app, dataset):
+    directory = tempfile.mkdtemp()
+    workdir = os.path.join(directory, "data")
+    shutil.copytree(dataset, workdir)
+    results = {"startup": first_paint(False, workdir)[0]}
+    previous = os.getcwd()
+    os.chdir(workdir)
+    try:
+        results.update(measure_notes(app))
+        results.update(measure_tasks(app))
+        write_behind.flush()
+    finally:
+        os.chdir(previous)
+        shutil.rmtree(directory, ignore_errors=True)
+    return results
+
+
+def load_baselines():
+    try:
+        with open(BASELINES, "r") as file:
+            return json.load(file)
+    except FileNotFoundError:
+        return {}
+
+
+def compare(results, baseline, threshold):
+    """Wypisuje tabelę i zwraca nazwy operacji, które zwolniły ponad próg"""
+    regressions = []
+    for name, seconds in results.items():
+        reference = baseline.get(name)
+        if reference is None:
+            print(f"{name:>26}: {seconds * 1000:9.1f} ms (brak punktu odniesienia)")
+            continue
+        change = seconds / reference - 1 if reference else 0.0
+        regressed = change > threshold and (seconds - reference) * 1000 > MIN_REGRESSION_MS
+        print(f"{name:>26}: {seconds * 1000:9.1f} ms, odniesienie {reference * 1000:9.1f} ms, "
+              f"zmiana {change:+7.1%} {'REGRESJA' if regressed else 'OK'}")
+        if regressed:
+            regressions.append(name)
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark regresji z punktem odniesienia")
+    parser.add_argument("--scale", choices=SCALES, default="small")
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--threshold", type=float, default=0.3, help="dopuszczalne spowolnienie (0.3 = 30%%)")
+    parser.add_argument("--update", action="store_true", help="zapisz wyniki jako punkt odniesienia")
+    args = parser.parse_args()
+    app = QApplication.instance() or QApplication([])
+
+    dataset = os.path.join(tempfile.mkdtemp(), "dataset")
+    sizes = generate(dataset, seed=0, **SCALES[args.scale])
+    shutil.copy(os.path.join(PROJECT, "styles.qss"), dataset)
+    print(f"skala {args.scale}: " + ", ".join(f"{name} {count}" for name, count in sizes.items()))
+
+    runs = [run_once(app, dataset) for _ in range(args.runs)]
+    results = {name: statistics.median(run[name] for run in runs) for name in runs[0]}
+    shutil.rmtree(os.path.dirname(dataset), ignore_errors=True)
+
+    baselines = load_baselines()
+    if args.update:
+        baselines[args.scale] = {"dataset": sizes, "runs": args.runs,
+                                 "results": {name: round(seconds, 6) for name, seconds in results.items()}}
+        with open(BASELINES, "w") as file:
+            json.dump(baselines, file, indent=2, sort_keys=True)
+            file.write("\n")
+        compare(results, {}, args.threshold)
+        print(f"zapisano punkt odniesienia dla skali {args.scale}")
+        return
+    if args.scale not in baselines:
+        compare(results, {}, args.threshold)
+        print(f"brak punktu odniesienia dla skali {args.scale} - uruchom z --update")
+        return
+    regressions = compare(results, baselines[args.scale]["results"], args.threshold)
+    if regressions:
+        print("BŁĄD: regresja w", ", ".join(regressions))
+        sys.exit(1)
+    print(f"bez regresji (próg {args.threshold:.0%})")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Czas do pierwszego narysowania okna MainApp (time-to-first-paint).
+
+Każdy pomiar to świeży proces (zimne importy) uruchamiany w katalogu
+tymczasowym z kopią danych aplikacji (bez credentials.json/token.json,
+więc bez połączeń z Google). Porównuje domyślny start (budowana tylko
+widoczna zakładka) ze zbudowaniem wszystkich zakładek przed pokazaniem okna.
+
+Uruchomienie (z katalogu projekt):
+    python benchmarks/bench_startup.py [liczba_uruchomień]
+"""
+import os
+import shutil
+import statistics
+import subprocess
+import sys
+import tempfile
+
+PROJECT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+DATA_FILES = ["styles.qss", "notes.json", "tasks.json", "points.json", "stats.json", "activities.json"]
+
+CHILD = """
+import time
+start = time.perf_counter()
+import os, sys
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, {project!r})
+from PySide6.QtCore import QEvent, QObject
+from PySide6.QtWidgets import QApplication
+import main
+
+class FirstPaint(QObject):
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Type.Paint:
+            print("first_paint", time.perf_counter() - start, flush=True)
+            print("modules", len(sys.modules), "matplotlib" in sys.modules, flush=True)
+            window.close()
+            app.quit()
+        return False
+
+app = QApplication([])
+window = main.MainApp()
+if {eager!r}:
+    for index in range(window.tab_widget.count()):
+        window.build_tab(index)
+paint_filter = FirstPaint()
+window.installEventFilter(paint_filter)
+window.show()
+app.exec()
+"""
+
+
+def run(eager, directory):
+    output = subprocess.run([sys.executable, "-c", CHILD.format(project=PROJECT, eager=eager)],
+                            cwd=directory, capture_output=True, text=True, check=True).stdout
+    values = dict(line.split(" ", 1) for line in output.splitlines() if " " in line)
+    modules, matplotlib_loaded = values["modules"].split()
+    return float(values["first_paint"]), int(modules), matplotlib_loaded == "True"
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    directory = tempfile.mkdtemp()
+    for name in DATA_FILES:
+        if os.path.exists(os.path.join(PROJECT, name)):
+            shutil.copy(os.path.join(PROJECT, name), directory)
+    for label, eager in (("tylko widoczna zakładka", False), ("wszystkie zakładki od razu", True)):
+        results = [run(eager, directory) for _ in range(runs)]
+        times = [first_paint for first_paint, _, _ in results]
+        _, modules, matplotlib_loaded = results[-1]
+        print(f"{label:>28}: pierwsze rysowanie mediana {statistics.median(times) * 1000:7.1f} ms "
+              f"(min {min(times) * 1000:.1f}), modułów {modules}, matplotlib: {matplotlib_loaded}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""Usuwanie wykonanych zadań w ToDoCalendar: dawna pętla (list.remove + zapis
+całego tasks.json po każdym zadaniu) vs delete_tasks (jedna transakcja,
+razem z operacjami dla Google Calendar).
+
+Usługa Google Calendar to lokalny zamiennik (fake_calendar).
+
+Uruchomienie (z katalogu projekt):
+    python benchmarks/bench_task_delete.py [liczba_zadań]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+import todocalendar  # noqa: E402
+from fake_calendar import FakeCalendarService  # noqa: E402
+from google_calendar_adapter import GoogleCalendarAdapter  # noqa: E402
+
+DATE = "2025-03-14"
+
+
+def legacy_delete(count, path):
+    tasks_by_date = {"14-03-2025": [f"zadanie {i}" for i in range(count)]}
+    start = time.perf_counter()
+    for title in list(tasks_by_date["14-03-2025"]):
+        tasks_by_date["14-03-2025"].remove(title)
+        with open(path, "w") as file:
+            json.dump(tasks_by_date, file, indent=4)
+    return time.perf_counter() - start, count
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    app = QApplication([])  # noqa: F841
+    os.chdir(tempfile.mkdtemp())
+    legacy_time, legacy_writes = legacy_delete(count, "legacy_tasks.json")
+
+    service = FakeCalendarService(latency=0.01)
+    todocalendar.GoogleCalendarAdapter = lambda: GoogleCalendarAdapter(service=service)
+    tab = todocalendar.ToDoCalendar()
+    tab.current_date = DATE
+    for i in range(count):
+        task = tab.task_store.add(DATE, f"zadanie {i}", enqueue=True)
+        tab.task_store.set_completed(task.id, True)
+    tab.calendar_sync.notify()
+    tab.display_tasks_for_date(DATE)
+    assert tab.calendar_sync.wait_idle(timeout=60)
+
+    commits = []
+    tab.task_store.connection.set_trace_callback(
+        lambda statement: commits.append(statement) if statement == "COMMIT" else None)
+    batches_before = service.batches
+
+    start = time.perf_counter()
+    tab.delete_task()
+    elapsed = time.perf_counter() - start
+    assert tab.calendar_sync.wait_idle(timeout=60)
+    assert not service.stored_events and tab.task_model.rowCount() == 0
+    tab.shutdown()
+
+    print(f"{count} wykonanych zadań")
+    print(f"  dawniej: {legacy_time * 1000:.1f} ms, {legacy_writes} zapisów tasks.json")
+    print(f"  teraz:   {elapsed * 1000:.1f} ms, {len(commits)} transakcja SQLite (zadania i kolejka), "
+          f"{service.batches - batches_before} żądań batch do API "
+          f"(limit {tab.calendar_sync.batch_size} operacji na żądanie)")
+
+
+if __name__ == "__main__":
+    main()
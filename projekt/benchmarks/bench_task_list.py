@@ -0,0 +1,91 @@
+"""Przełączanie dni w ToDoCalendar: dawna lista z widżetem na każde zadanie
+(QWidget + QHBoxLayout + QCheckBox + QLineEdit, setItemWidget) vs TasksListModel
+z TaskItemDelegate.
+
+Mierzy czas wyświetlenia dnia z wieloma zadaniami (z odmalowaniem okna)
+i liczbę widżetów, które przy tym powstają.
+
+Uruchomienie (z katalogu projekt):
+    python benchmarks/bench_task_list.py [zadań_na_dzień]
+"""
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PySide6.QtWidgets import (  # noqa: E402
+    QApplication, QCheckBox, QHBoxLayout, QLineEdit, QListWidget, QListWidgetItem, QWidget
+)
+
+import todocalendar  # noqa: E402
+from fake_calendar import FakeCalendarService  # noqa: E402
+from google_calendar_adapter import GoogleCalendarAdapter  # noqa: E402
+
+DAYS = ["2025-03-14", "2025-03-15"]
+
+
+def legacy_show(task_list, tasks):
+    task_list.clear()
+    for task in tasks:
+        task_widget = QWidget()
+        task_layout = QHBoxLayout(task_widget)
+        task_layout.setContentsMargins(0, 0, 0, 0)
+        checkbox = QCheckBox()
+        checkbox.setChecked(task.completed)
+        task_layout.addWidget(checkbox)
+        task_label = QLineEdit(task.title)
+        task_label.setReadOnly(True)
+        task_layout.addWidget(task_label)
+        item = QListWidgetItem(task_list)
+        item.setSizeHint(task_widget.sizeHint())
+        task_list.setItemWidget(item, task_widget)
+
+
+def measure(app, show, view, store, switches=6):
+    view.show()
+    start = time.perf_counter()
+    for i in range(switches):
+        show(store.tasks_for_date(DAYS[i % 2]))
+        view.repaint()
+        app.processEvents()
+    elapsed = (time.perf_counter() - start) / switches
+    return elapsed, len(QApplication.allWidgets())
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 1000
+    app = QApplication([])
+    os.chdir(tempfile.mkdtemp())
+    todocalendar.GoogleCalendarAdapter = lambda: GoogleCalendarAdapter(service=FakeCalendarService())
+    tab = todocalendar.ToDoCalendar()
+    store = tab.task_store
+    for day in DAYS:
+        for i in range(count):
+            task = store.add(day, f"zadanie {i} z dnia {day}")
+            if i % 3 == 0:
+                store.set_completed(task.id, True)
+    tab.resize(800, 600)
+
+    baseline = len(QApplication.allWidgets())
+    model_time, model_widgets = measure(app, tab.task_model.set_tasks, tab, store)
+    model_widgets -= baseline
+    tab.close()
+
+    baseline = len(QApplication.allWidgets())
+    legacy_list = QListWidget()
+    legacy_list.resize(500, 600)
+    legacy_time, legacy_widgets = measure(app, lambda tasks: legacy_show(legacy_list, tasks), legacy_list, store)
+    legacy_widgets -= baseline
+    print(f"{count} zadań na dzień")
+    print(f"  widżet na zadanie: {legacy_time * 1000:8.1f} ms na zmianę dnia, "
+          f"{legacy_widgets} nowych widżetów po 6 zmianach dnia")
+    print(f"  model + delegat:   {model_time * 1000:8.1f} ms na zmianę dnia, "
+          f"{model_widgets} nowych widżetów po 6 zmianach dnia")
+    tab.shutdown()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,94 @@
+"""Zadania: dawny tasks.json ({"dd-MM-yyyy": [tytuły]}) vs TaskStore (SQLite).
+
+Mierzy dodanie jednego zadania (dawniej przepisanie całego pliku z indent=4,
+teraz jeden wiersz) oraz zapytania o zakres dat: liczba zadań w tygodniu
+i lista zaległych (dawniej przegląd i parsowanie wszystkich kluczy).
+W bazie większość zadań z przeszłości jest oznaczona jako wykonane (tak jak
+w realnym użyciu); dawny format nie zna stanu wykonania, więc jego koszt
+przeglądu jest taki sam niezależnie od tego.
+
+Uruchomienie (z katalogu projekt):
+    python benchmarks/bench_task_store.py [liczba_zadań]
+"""
+import json
+import os
+import sys
+import tempfile
+import time
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from task_store import TaskStore  # noqa: E402
+
+DAYS = 3 * 365
+TODAY = date(2025, 6, 1)
+
+
+def timed(action, repeat=1):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        result = action()
+    return (time.perf_counter() - start) / repeat, result
+
+
+def legacy_dataset(count):
+    tasks_by_date = {}
+    first = TODAY - timedelta(days=DAYS // 2)
+    for i in range(count):
+        day = first + timedelta(days=i % DAYS)
+        tasks_by_date.setdefault(day.strftime("%d-%m-%Y"), []).append(f"zadanie {i}")
+    return tasks_by_date
+
+
+def legacy_week_count(tasks_by_date, start, end):
+    return sum(len(titles) for key, titles in tasks_by_date.items()
+               if start <= datetime.strptime(key, "%d-%m-%Y").date() <= end)
+
+
+def legacy_overdue(tasks_by_date, today):
+    # Dawny format nie zna stanu wykonania - każde zadanie z przeszłości jest "zaległe"
+    return [title for key, titles in tasks_by_date.items()
+            if datetime.strptime(key, "%d-%m-%Y").date() < today for title in titles]
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 100000
+    directory = tempfile.mkdtemp()
+    json_path = os.path.join(directory, "tasks.json")
+    tasks_by_date = legacy_dataset(count)
+    with open(json_path, "w") as file:
+        json.dump(tasks_by_date, file, indent=4)
+
+    import_time, store = timed(lambda: TaskStore(os.path.join(directory, "tasks.db"), json_path))
+    assert store.count_between("0000-01-01", "9999-12-31") == count
+    with store.connection:
+        store.connection.execute("UPDATE tasks SET completed = 1 WHERE date < ? AND id % 50 != 0",
+                                 (TODAY.isoformat(),))
+
+    week_start, week_end = TODAY - timedelta(days=TODAY.weekday()), TODAY + timedelta(days=6 - TODAY.weekday())
+
+    def legacy_add():
+        tasks_by_date.setdefault(TODAY.strftime("%d-%m-%Y"), []).append("nowe")
+        with open(json_path, "w") as file:
+            json.dump(tasks_by_date, file, indent=4)
+
+    rows = [
+        ("dodanie zadania",
+         timed(legacy_add, 5)[0],
+         timed(lambda: store.add(TODAY.isoformat(), "nowe"), 100)[0]),
+        ("liczba zadań w tygodniu",
+         timed(lambda: legacy_week_count(tasks_by_date, week_start, week_end), 5)[0],
+         timed(lambda: store.count_between(week_start.isoformat(), week_end.isoformat()), 100)[0]),
+        ("zaległe zadania",
+         timed(lambda: legacy_overdue(tasks_by_date, TODAY), 5)[0],
+         timed(lambda: store.overdue(TODAY.isoformat()), 5)[0]),
+    ]
+    print(f"{count} zadań, import tasks.json: {import_time:.2f} s")
+    for label, legacy, sqlite in rows:
+        print(f"{label:>24}: tasks.json {legacy * 1000:9.3f} ms   SQLite {sqlite * 1000:9.3f} ms")
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+"""Budżet czasu importu przy starcie aplikacji (python -X importtime).
+
+Importuje to, co jest potrzebne do pierwszego narysowania okna: main i moduł
+zakładki widocznej na starcie (focus_timer). Kończy się kodem 1, gdy:
+  - łączny czas importu modułu przekracza budżet (najlepszy z kilku przebiegów),
+  - przy starcie ładuje się moduł, który ma być importowany leniwie
+    (matplotlib, biblioteki Google, pozostałe zakładki).
+Budżety są celowo luźne - mają wyłapać regresję rzędu dodanej ciężkiej
+biblioteki, nie szum pomiaru.
+
+Uruchomienie (z katalogu projekt):
+    python benchmarks/check_import_budget.py [liczba_przebiegów]
+"""
+import os
+import subprocess
+import sys
+
+PROJECT = os.path.abspath(os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+# Moduł -> budżet łącznego czasu importu w ms (razem z zależnościami, w tej kolejności)
+BUDGETS_MS = {
+    "main": 300,  # głównie PySide6.QtWidgets
+    "focus_timer": 80,  # w tym ~30 ms na pierwsze użycie przestrzeni nazw PySide6.QtCore.Qt
+}
+# Moduły, które nie mogą być ładowane przed pierwszym narysowaniem okna
+DEFERRED = ["matplotlib", "numpy", "googleapiclient", "google_auth_oauthlib", "google.oauth2",
+            "todocalendar", "notes", "task_store"]
+
+
+def import_times():
+    """{moduł: łączny czas importu w ms} z jednego świeżego procesu"""
+    command = [sys.executable, "-X", "importtime", "-c", "import " + ", ".join(BUDGETS_MS)]
+    stderr = subprocess.run(command, cwd=PROJECT, capture_output=True, text=True, check=True).stderr
+    times = {}
+    for line in stderr.splitlines():
+        if not line.startswith("import time:") or "|" not in line:
+            continue
+        _, cumulative, name = line[len("import time:"):].split("|")
+        if not cumulative.strip().isdigit():
+            continue  # nagłówek
+        times[name.strip()] = int(cumulative) / 1000
+    return times
+
+
+def main():
+    runs = int(sys.argv[1]) if len(sys.argv) > 1 else 5
+    best = {}
+    loaded = set()
+    for _ in range(runs):
+        times = import_times()
+        loaded |= set(times)
+        for module in BUDGETS_MS:
+            best[module] = min(best.get(module, float("inf")), times.get(module, 0.0))
+
+    failures = []
+    for module, budget in BUDGETS_MS.items():
+        status = "OK" if best[module] <= budget else "PRZEKROCZONY"
+        print(f"{module:>12}: {best[module]:7.1f} ms (budżet {budget} ms) {status}")
+        if best[module] > budget:
+            failures.append(module)
+    for module in DEFERRED:
+        if any(name == module or name.startswith(module + ".") for name in loaded):
+            print(f"{module:>12}: ładowany przy starcie, a powinien leniwie")
+            failures.append(module)
+    if failures:
+        sys.exit(1)
+    print("budżet importów zachowany")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,205 @@
+"""Lokalny zamiennik usługi Google Calendar v3 do podstawienia w GoogleCalendarAdapter(service=...).
+
+Obsługuje tylko to, czego używa aplikacja: events().insert/delete/list(...).execute()
+i żądania batch (new_batch_http_request). list działa jak w Events API:
+strony (nextPageToken), pełna lista albo tylko zmiany od syncToken (łącznie
+z usuniętymi wydarzeniami, status "cancelled"), 410 dla wygasłego tokenu.
+Opóźnienie sieci, tryb offline i losowe błędy przejściowe (503) są konfigurowalne.
+Usunięcie wystąpienia wydarzenia cyklicznego ("<id serii>_YYYYMMDD") zapisuje
+anulowany wyjątek serii. Metody remote_* symulują zmiany wprowadzone
+bezpośrednio w Google Calendar; seed_events i remote_insert domyślnie
+tworzą wydarzenia ze znacznikiem aplikacji (jak dodane przez nią na innym
+urządzeniu), z app_event=False - wydarzenia spoza aplikacji.
+"""
+import itertools
+import random
+import threading
+import time
+
+import httplib2
+from googleapiclient.errors import HttpError
+
+from google_calendar_adapter import APP_PROPERTY
+
+
+def http_error(status, reason=""):
+    return HttpError(httplib2.Response({"status": status}), reason.encode())
+
+
+def _event(event_id, summary, date, app_event):
+    event = {"id": event_id, "summary": summary, "start": {"date": date}, "end": {"date": date}}
+    if app_event:
+        event["extendedProperties"] = {"private": {APP_PROPERTY: "1"}}
+    return event
+
+
+class FakeCalendarService:
+    def __init__(self, latency=0.05, failure_rate=0.0, offline=False, seed=0):
+        self.latency = latency
+        self.failure_rate = failure_rate
+        self.offline = offline
+        self.stored_events = {}
+        self.requests = 0
+        self.batches = 0
+        self.listed = 0  # wydarzenia zwrócone przez list
+        self._deleted = {}
+        self._changed_at = {}  # identyfikator -> numer ostatniej zmiany
+        self._sequence = 0
+        self._oldest_sync_token = 0
+        self._cursors = {}
+        self._cursor_ids = itertools.count()
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+    def seed_events(self, count, first_day="2024-01-01", app_event=True):
+        year, month, day = map(int, first_day.split("-"))
+        for i in range(count):
+            date = f"{year + i // 336:04}-{i // 28 % 12 + 1:02}-{day + i % 28:02}"
+            self._store(_event(f"seed{i}", f"wydarzenie {i}", date, app_event))
+
+    def remote_insert(self, summary, date, app_event=True):
+        with self._lock:
+            return self._store(_event(f"remote{self._sequence}", summary, date, app_event))
+
+    def remote_update(self, event_id, summary=None, date=None):
+        with self._lock:
+            event = dict(self.stored_events[event_id])
+            if summary is not None:
+                event["summary"] = summary
+            if date is not None:
+                event["start"] = event["end"] = {"date": date}
+            self._store(event)
+
+    def remote_delete(self, event_id):
+        with self._lock:
+            self._delete(event_id)
+
+    def expire_sync_tokens(self):
+        # Każdy wydany dotąd token zostanie odrzucony
+        self._oldest_sync_token = self._sequence + 1
+
+    def events(self):
+        return _Events(self)
+
+    def new_batch_http_request(self, callback=None):
+        return _Batch(self, callback)
+
+    def _round_trip(self):
+        if self.offline:
+            raise httplib2.ServerNotFoundError("Unable to find the server at www.googleapis.com")
+        time.sleep(self.latency)
+
+    def _apply(self, action):
+        with self._lock:
+            self.requests += 1
+            if self._random.random() < self.failure_rate:
+                raise http_error(503, "backendError")
+            return action()
+
+    def _insert(self, body):
+        event = dict(body)
+        event_id = event.setdefault("id", f"fake{self._sequence}")
+        if event_id in self.stored_events or event_id in self._deleted:
+            raise http_error(409, "duplicate")
+        return self._store(event)
+
+    def _delete(self, event_id):
+        series_id, _, day = event_id.partition("_")
+        if day and "recurrence" in self.stored_events.get(series_id, {}):
+            # Usunięcie wystąpienia wydarzenia cyklicznego zostawia anulowany wyjątek serii
+            if event_id in self._deleted:
+                raise http_error(410, "deleted")
+            self._deleted[event_id] = {"id": event_id, "status": "cancelled", "recurringEventId": series_id,
+                                       "originalStartTime": {"date": f"{day[0:4]}-{day[4:6]}-{day[6:8]}"}}
+            self._touch(event_id)
+            return ""
+        if self.stored_events.pop(event_id, None) is None:
+            raise http_error(410 if event_id in self._deleted else 404, "deleted")
+        self._deleted[event_id] = {"id": event_id, "status": "cancelled"}
+        self._touch(event_id)
+        return ""
+
+    def _store(self, event):
+        self.stored_events[event["id"]] = event
+        self._touch(event["id"])
+        return event
+
+    def _touch(self, event_id):
+        self._sequence += 1
+        self._changed_at[event_id] = self._sequence
+
+    def _list(self, syncToken=None, pageToken=None, maxResults=250):
+        if pageToken is None:
+            since = int(syncToken) if syncToken is not None else None
+            if since is not None and since < self._oldest_sync_token:
+                raise http_error(410, "fullSyncRequired")
+            # Stan z chwili pierwszej strony; zmiany w trakcie trafią do kolejnej synchronizacji
+            changed = [(sequence, event_id) for event_id, sequence in self._changed_at.items()
+                       if since is None or sequence > since]
+            changed.sort()
+            items = [self.stored_events.get(event_id) or self._deleted[event_id] for _, event_id in changed]
+            if since is None:
+                # Jak w Events API (showDeleted=False): anulowane wystąpienia serii zostają
+                items = [event for event in items
+                         if event.get("status") != "cancelled" or "recurringEventId" in event]
+            cursor = next(self._cursor_ids)
+            self._cursors[cursor] = (items, str(self._sequence))
+            offset = 0
+        else:
+            cursor, offset = map(int, pageToken.split(":"))
+        items, sync_token = self._cursors[cursor]
+        page = [dict(event) for event in items[offset:offset + maxResults]]
+        self.listed += len(page)
+        response = {"items": page}
+        if offset + maxResults < len(items):
+            response["nextPageToken"] = f"{cursor}:{offset + maxResults}"
+        else:
+            del self._cursors[cursor]
+            response["nextSyncToken"] = sync_token
+        return response
+
+
+class _Request:
+    def __init__(self, service, action):
+        self._service = service
+        self._action = action
+
+    def execute(self):
+        self._service._round_trip()
+        return self._service._apply(self._action)
+
+
+class _Events:
+    def __init__(self, service):
+        self._service = service
+
+    def insert(self, calendarId, body):
+        return _Request(self._service, lambda: self._service._insert(body))
+
+    def delete(self, calendarId, eventId):
+        return _Request(self._service, lambda: self._service._delete(eventId))
+
+    def list(self, calendarId, syncToken=None, pageToken=None, maxResults=250, **kwargs):
+        return _Request(self._service, lambda: self._service._list(syncToken, pageToken, maxResults))
+
+
+class _Batch:
+    def __init__(self, service, callback):
+        self._service = service
+        self._callback = callback
+        self._requests = []
+
+    def add(self, request, request_id=None, callback=None):
+        self._requests.append((request_id or str(len(self._requests)), request, callback or self._callback))
+
+    def execute(self):
+        # Jedna podróż w sieci na całą paczkę
+        self._service._round_trip()
+        self._service.batches += 1
+        for request_id, request, callback in self._requests:
+            try:
+                response, error = self._service._apply(request._action), None
+            except HttpError as e:
+                response, error = None, e
+            if callback is not None:
+                callback(request_id, response, error)
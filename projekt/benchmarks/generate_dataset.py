@@ -0,0 +1,181 @@
+"""Generator danych aplikacji w dużej skali, w formatach zapisywanych przez aplikację.
+
+Domyślnie (format bieżący) zapisuje w podanym katalogu:
+  - notes.json - tablica notatek z identyfikatorami, pola zakodowane
+    SimpleObfuscator kluczem z main.py, zapis przez NoteJournal (indent=4),
+  - tasks.db - baza TaskStore: zadania z ostatnich lat i najbliższych tygodni
+    (przeszłe w większości wykonane, część dni bardzo zajęta) oraz kilka
+    zadań cyklicznych,
+  - focus_sessions.log - dziennik sesji skupienia (jedna linia JSON na sesję).
+Z --legacy zapisuje dawne pliki, migrowane przy pierwszym uruchomieniu:
+notes.json bez identyfikatorów, tasks.json ({"dd-MM-yyyy": [tytuły]}),
+activities.json, stats.json i points.json.
+
+Dane są powtarzalne dla danego --seed. Treści notatek mają polskie znaki
+(kodowanie poza zakresem latin-1) i długości od kilku do setek słów.
+
+Uruchomienie (z katalogu projekt):
+    python benchmarks/generate_dataset.py KATALOG [--notes N] [--tasks N] [--sessions N]
+                                          [--seed S] [--legacy]
+"""
+import argparse
+import json
+import os
+import random
+import sys
+from datetime import date, datetime, timedelta
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from focus_log import DEFAULT_ACTIVITIES, LEGACY_ACTIVITIES, LEGACY_POINTS, LEGACY_STATS, POINTS_PER_SESSION  # noqa: E402
+from note_model import Note, NoteCodec, ObfuscatedNoteCodec, SimpleObfuscator  # noqa: E402
+from note_store import DATE_FORMAT, NoteJournal  # noqa: E402
+from recurrence import FREQUENCIES  # noqa: E402
+from task_store import LEGACY_DATE_FORMAT, TaskStore  # noqa: E402
+
+NOTES_KEY = 123  # klucz SimpleObfuscator z MainApp.create_notes
+CATEGORIES = ["Nauka", "Praca", "Kodowanie", "Zadania"]
+CATEGORY_WEIGHTS = [5, 3, 4, 2]
+WORDS = (
+    "notatka wykład ćwiczenia egzamin kolokwium projekt zadanie termin algorytm struktura danych "
+    "baza zapytanie indeks funkcja klasa obiekt wzorzec dekorator strategia stan fabryka "
+    "matematyka całka pochodna macierz wektor prawdopodobieństwo statystyka źródło książka "
+    "rozdział przykład rozwiązanie błąd poprawka spotkanie zespół raport prezentacja "
+    "żółty łódź gęś ćma źdźbło się że już też więc który która jest był będzie"
+).split()
+TASK_TITLES = ["Oddać projekt", "Przeczytać rozdział", "Zakupy", "Siłownia", "Spotkanie z grupą",
+               "Powtórka do egzaminu", "Zapłacić rachunki", "Napisać raport", "Zadzwonić do", "Sprzątanie"]
+HISTORY_DAYS = 3 * 365  # zakres dat notatek, zadań i sesji
+FUTURE_DAYS = 60  # zadania zaplanowane naprzód
+SESSION_MINUTES = [1, 5, 10, 15, 30, 25, 45, 60]  # przyciski FocusTimer i typowe wartości własne
+SESSION_WEIGHTS = [1, 3, 4, 4, 5, 6, 2, 1]
+
+
+def random_text(rnd, words):
+    return " ".join(rnd.choices(WORDS, k=words))
+
+
+def random_id(rnd):
+    # Ten sam kształt co uuid4().hex (new_note_id, new_event_id), ale powtarzalny
+    return "%032x" % rnd.getrandbits(128)
+
+
+def make_notes(count, rnd, today):
+    """Notatki w kolejności dodawania (rosnące daty), treść ~lognormalna długość"""
+    first = datetime.combine(today, datetime.min.time()) - timedelta(days=HISTORY_DAYS)
+    offsets = sorted(rnd.randrange(HISTORY_DAYS * 86400) for _ in range(count))
+    notes = []
+    for offset in offsets:
+        words = min(2000, max(3, int(rnd.lognormvariate(3.5, 1.0))))
+        created = (first + timedelta(seconds=offset)).strftime(DATE_FORMAT)
+        notes.append(Note(random_text(rnd, rnd.randint(1, 6)).capitalize(), random_text(rnd, words),
+                          rnd.choices(CATEGORIES, CATEGORY_WEIGHTS)[0], created, random_id(rnd)))
+    return notes
+
+
+def write_notes(directory, count, rnd, today, legacy=False):
+    notes = make_notes(count, rnd, today)
+    codec = ObfuscatedNoteCodec(SimpleObfuscator(NOTES_KEY))
+    records = codec.encode_notes(notes)
+    if legacy:
+        for record in records:
+            del record["id"]  # notatki sprzed wprowadzenia identyfikatorów
+    NoteJournal(os.path.join(directory, "notes.json")).write_snapshot(records)
+    return notes
+
+
+def task_days(count, rnd, today):
+    """Daty zadań: większość w przeszłości, część dni (terminy, sesja) kilka razy bardziej zajęta"""
+    days = [today + timedelta(days=offset) for offset in range(-HISTORY_DAYS, FUTURE_DAYS + 1)]
+    weights = [5 if rnd.random() < 0.1 else 1 for _ in days]
+    return sorted(rnd.choices(days, weights, k=count))
+
+
+def write_tasks(directory, count, rnd, today, legacy=False):
+    days = task_days(count, rnd, today)
+    titles = [f"{rnd.choice(TASK_TITLES)} {rnd.randint(1, 999)}" for _ in days]
+    if legacy:
+        tasks_by_date = {}
+        for day, title in zip(days, titles):
+            tasks_by_date.setdefault(day.strftime(LEGACY_DATE_FORMAT), []).append(title)
+        with open(os.path.join(directory, "tasks.json"), "w") as file:
+            json.dump(tasks_by_date, file, indent=4)
+        return
+    store = TaskStore(os.path.join(directory, "tasks.db"), legacy_json=None)
+    with store.connection:
+        store.connection.executemany(
+            "INSERT INTO tasks (date, title, completed, event_id) VALUES (?, ?, ?, ?)",
+            ((day.isoformat(), title, int(day < today and rnd.random() < 0.9), random_id(rnd))
+             for day, title in zip(days, titles))
+        )
+    for _ in range(max(1, count // 1000)):
+        start = today - timedelta(days=rnd.randrange(HISTORY_DAYS // 3))
+        store.add_recurring(start.isoformat(), rnd.choice(TASK_TITLES), rnd.choice(list(FREQUENCIES)),
+                            rnd.choice([1, 1, 2]))
+    store.close()
+
+
+def make_sessions(count, rnd, today):
+    """Sesje w ciągu dnia (8-23), chronologicznie, jak dopisuje je FocusLog"""
+    first = datetime.combine(today, datetime.min.time()) - timedelta(days=HISTORY_DAYS)
+    starts = sorted(first.timestamp() + rnd.randrange(HISTORY_DAYS) * 86400 + rnd.randrange(8 * 3600, 23 * 3600)
+                    for _ in range(count))
+    sessions = []
+    for start in starts:
+        duration = 60 * rnd.choices(SESSION_MINUTES, SESSION_WEIGHTS)[0]
+        sessions.append({"start": start, "end": start + duration + rnd.random() * 2,
+                         "activity": rnd.choice(DEFAULT_ACTIVITIES), "duration": duration,
+                         "points": POINTS_PER_SESSION})
+    return sessions
+
+
+def write_sessions(directory, count, rnd, today, legacy=False):
+    sessions = make_sessions(count, rnd, today)
+    if legacy:
+        minutes = dict.fromkeys(DEFAULT_ACTIVITIES, 0)
+        for session in sessions:
+            minutes[session["activity"]] += session["duration"] // 60
+        legacy_files = {
+            LEGACY_ACTIVITIES: {"activities": minutes},
+            LEGACY_STATS: {"total_time": sum(session["duration"] for session in sessions)},
+            LEGACY_POINTS: {"points": POINTS_PER_SESSION * len(sessions)},
+        }
+        for name, data in legacy_files.items():
+            with open(os.path.join(directory, name), "w") as file:
+                json.dump(data, file, indent=2)
+        return
+    with open(os.path.join(directory, "focus_sessions.log"), "w") as file:
+        file.writelines(json.dumps(session) + "\n" for session in sessions)
+
+
+def generate(directory, notes=10000, tasks=20000, sessions=5000, seed=0, legacy=False, today=None):
+    """Zapisuje komplet danych w directory; zwraca liczby notatek, zadań i sesji"""
+    os.makedirs(directory, exist_ok=True)
+    today = today or date.today()
+    rnd = random.Random(seed)
+    write_notes(directory, notes, rnd, today, legacy)
+    write_tasks(directory, tasks, rnd, today, legacy)
+    write_sessions(directory, sessions, rnd, today, legacy)
+    return {"notes": notes, "tasks": tasks, "sessions": sessions}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generator danych aplikacji w dużej skali")
+    parser.add_argument("directory")
+    parser.add_argument("--notes", type=int, default=10000)
+    parser.add_argument("--tasks", type=int, default=20000)
+    parser.add_argument("--sessions", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--legacy", action="store_true", help="dawne pliki JSON zamiast tasks.db i dziennika")
+    args = parser.parse_args()
+    generate(args.directory, args.notes, args.tasks, args.sessions, args.seed, args.legacy)
+    # Kontrola: dane czytają się tą samą ścieżką co w aplikacji
+    records = NoteJournal(os.path.join(args.directory, "notes.json")).load()
+    first = NoteCodec().notes_from_records(
+        ObfuscatedNoteCodec(SimpleObfuscator(NOTES_KEY)).deobfuscate_records(records[:1]))
+    print(f"{args.directory}: {len(records)} notatek (np. \"{first[0].title}\" z {first[0].date}), "
+          f"{args.tasks} zadań, {args.sessions} sesji" + (" - dawne formaty" if args.legacy else ""))
+
+
+if __name__ == "__main__":
+    main()
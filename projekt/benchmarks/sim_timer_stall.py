@@ -0,0 +1,135 @@
+"""Symulacja zablokowanej pętli zdarzeń w trakcie sesji Focus Timera.
+
+Co stall_interval sekund pętla zdarzeń jest blokowana na stall sekund
+(jak przy blokującym zapisie notatek albo rysowaniu wykresu). Mierzy:
+  - opóźnienie zakończenia sesji liczonej zegarem monotonicznym (powinno
+    być najwyżej jedną blokadą) wobec dawnego liczenia tyknięć QTimer co 1 s,
+  - pauzę i wznowienie: czas pauzy nie wlicza się do sesji,
+  - liczbę wybudzeń timera odświeżania, gdy zakładka jest ukryta (powinno być 0).
+Kończy się kodem 1, gdy któryś warunek nie jest spełniony.
+
+Uruchomienie (z katalogu projekt):
+    python benchmarks/sim_timer_stall.py [sekundy_sesji] [blokada_s] [co_ile_s]
+"""
+import os
+import sys
+import tempfile
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from PySide6.QtCore import QTimer  # noqa: E402
+from PySide6.QtWidgets import QApplication  # noqa: E402
+
+from focus_timer import FocusTimer  # noqa: E402
+
+
+class Session:
+    """Uruchamia sesję timera i zapisuje chwilę jej zakończenia (bez okna dialogowego)"""
+
+    def __init__(self, app, timer, seconds):
+        self.app = app
+        self.timer = timer
+        self.finished_at = None
+        self.refreshes = 0
+        self.seconds = seconds
+        timer.show_completion_message = self.completed
+        timer.timer.timeout.connect(self.count_refresh)
+
+    def completed(self):
+        self.finished_at = time.monotonic()
+
+    def count_refresh(self):
+        self.refreshes += 1
+
+    def run(self, actions=()):
+        """actions: [(sekunda od startu, funkcja)] wykonywane w trakcie sesji"""
+        self.finished_at = None
+        self.refreshes = 0
+        # Długość sesji w sekundach prosto do FocusSession - pole time_input ma krok 0.5 min
+        self.timer.session.start(self.seconds)
+        self.timer.sync_state()
+        started = time.monotonic()
+        pending = sorted(actions, key=lambda action: action[0])
+        while self.finished_at is None:
+            while pending and time.monotonic() - started >= pending[0][0]:
+                pending.pop(0)[1]()
+            self.app.processEvents()
+            time.sleep(0.005)
+        return self.finished_at - started
+
+
+def old_tick_counting(app, seconds, stall, stall_interval):
+    """Dawne zachowanie: +1 s na każde tyknięcie QTimer(1000), koniec po target tyknięciach"""
+    ticks = 0
+    done = []
+
+    def tick():
+        nonlocal ticks
+        ticks += 1
+        if ticks > seconds:
+            done.append(time.monotonic())
+
+    counter = QTimer()
+    counter.timeout.connect(tick)
+    staller = QTimer()
+    staller.timeout.connect(lambda: time.sleep(stall))
+    started = time.monotonic()
+    counter.start(1000)
+    staller.start(int(stall_interval * 1000))
+    while not done:
+        app.processEvents()
+        time.sleep(0.005)
+    counter.stop()
+    staller.stop()
+    return done[0] - started
+
+
+def main():
+    seconds = int(sys.argv[1]) if len(sys.argv) > 1 else 6
+    stall = float(sys.argv[2]) if len(sys.argv) > 2 else 1.5
+    stall_interval = float(sys.argv[3]) if len(sys.argv) > 3 else 2.5
+    app = QApplication([])
+    os.chdir(tempfile.mkdtemp())
+    timer = FocusTimer()
+    timer.resize(600, 900)
+    timer.show()
+    app.processEvents()
+    session = Session(app, timer, seconds)
+    failures = []
+
+    staller = QTimer()
+    staller.timeout.connect(lambda: time.sleep(stall))
+    staller.start(int(stall_interval * 1000))
+    elapsed = session.run()
+    staller.stop()
+    old = old_tick_counting(app, seconds, stall, stall_interval)
+    print(f"sesja {seconds} s, blokady {stall} s co {stall_interval} s: zegar monotoniczny {elapsed:.2f} s "
+          f"(opóźnienie {elapsed - seconds:+.2f} s), dawne tyknięcia {old:.2f} s ({old - seconds:+.2f} s)")
+    if not seconds <= elapsed <= seconds + stall + 0.2:
+        failures.append("zakończenie z zegarem monotonicznym niedokładne")
+
+    pause = 2.0
+    elapsed = session.run([(1.0, timer.pause_timer), (1.0 + pause, timer.pause_timer)])
+    print(f"pauza {pause} s w trakcie sesji: koniec po {elapsed:.2f} s (oczekiwane {seconds + pause:.2f} s)")
+    if abs(elapsed - (seconds + pause)) > 0.2:
+        failures.append("pauza zmieniła czas sesji")
+
+    elapsed = session.run([(0.5, timer.hide)])
+    hidden_refreshes = session.refreshes
+    timer.show()
+    elapsed_visible = session.run()
+    print(f"odświeżenia wyświetlacza: ukryta zakładka {hidden_refreshes} (sesja {elapsed:.2f} s), "
+          f"widoczna {session.refreshes} (sesja {elapsed_visible:.2f} s)")
+    if hidden_refreshes:
+        failures.append("timer odświeżania działa przy ukrytej zakładce")
+
+    print("sesji w dzienniku:", timer.stats.sessions)
+    if failures:
+        print("BŁĄD:", "; ".join(failures))
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
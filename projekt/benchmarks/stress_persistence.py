@@ -0,0 +1,86 @@
+"""Test obciążeniowy zapisu w tle (persistence.WriteBehindWriter).
+
+Wątek główny (jak wątek UI) zgłasza serię zapisów kilku plików i mierzy
+najdłuższy czas pojedynczego zgłoszenia, a wątek czytający w tym czasie
+cały czas parsuje pliki - żaden odczyt nie może trafić na ucięty JSON.
+Na końcu po flush() pliki muszą zawierać ostatnie zgłoszone dane.
+
+Uruchomienie (z katalogu projekt):
+    python benchmarks/stress_persistence.py [liczba_zapisów]
+"""
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+
+from persistence import WriteBehindWriter  # noqa: E402
+
+FILES = ["points.json", "stats.json", "activities.json", "tasks.json"]
+
+
+def payload(name, i):
+    if name == "tasks.json":
+        # Większy plik, żeby pojedynczy zapis trwał zauważalnie długo
+        return {f"{day:02}-01-2025": [f"zadanie {i}-{n}" for n in range(50)] for day in range(1, 29)}
+    return {"value": i, "name": name}
+
+
+def main():
+    count = int(sys.argv[1]) if len(sys.argv) > 1 else 20000
+    directory = tempfile.mkdtemp()
+    paths = [os.path.join(directory, name) for name in FILES]
+    writer = WriteBehindWriter(coalesce_window=0.05)
+    for path, name in zip(paths, FILES):
+        writer.write_json(path, payload(name, -1), indent=4)
+    writer.flush()
+
+    stop = threading.Event()
+    reads = torn = 0
+
+    def reader():
+        nonlocal reads, torn
+        while not stop.is_set():
+            for path in paths:
+                with open(path, "r") as file:
+                    text = file.read()
+                try:
+                    json.loads(text)
+                except json.JSONDecodeError:
+                    torn += 1
+                reads += 1
+
+    thread = threading.Thread(target=reader)
+    thread.start()
+
+    last = {}
+    worst = 0.0
+    start = time.perf_counter()
+    for i in range(count):
+        name = FILES[i % len(FILES)]
+        data = payload(name, i)
+        t = time.perf_counter()
+        writer.write_json(paths[i % len(FILES)], data, indent=4)
+        worst = max(worst, time.perf_counter() - t)
+        last[name] = data
+    elapsed = time.perf_counter() - start
+    writer.flush()
+    stop.set()
+    thread.join()
+
+    for path, name in zip(paths, FILES):
+        with open(path, "r") as file:
+            assert json.load(file) == last[name], f"{name}: plik nie zawiera ostatnich danych"
+        assert not os.path.exists(path + ".tmp"), f"{name}: pozostał plik tymczasowy"
+
+    print(f"zgłoszeń: {count}, łącznie {elapsed:.2f} s, najdłuższe zgłoszenie {worst * 1000:.3f} ms")
+    print(f"odczytów w trakcie: {reads}, uciętych plików: {torn}")
+    if torn:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,314 @@
+import json
+import random
+import sqlite3
+import threading
+import time
+import uuid
+from typing import Any, Callable, Collection, Dict, Iterable, List, Optional, Set
+
+from google_calendar_adapter import SyncTokenExpiredError
+from recurrence import series_event_id
+
+Operation = Dict[str, Any]
+
+# Wynik operacji, na którą nie przyszła odpowiedź (np. paczka nie doszła) - do ponowienia
+_NO_RESPONSE = object()
+
+
+def new_event_id() -> str:
+    # Cyfry szesnastkowe mieszczą się w alfabecie base32hex wymaganym przez
+    # Calendar API dla identyfikatorów wydarzeń nadawanych przez klienta
+    return uuid.uuid4().hex
+
+
+# Kolejka zmian w tej samej bazie co zadania (tasks.db): zadanie i jego operacja
+# dla Google Calendar są zapisywane w jednej transakcji (TaskStore(..., enqueue=True))
+OUTBOX_SCHEMA = """
+CREATE TABLE IF NOT EXISTS calendar_outbox (
+    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+    id TEXT NOT NULL UNIQUE,
+    event_id TEXT,
+    operation TEXT NOT NULL
+);
+CREATE INDEX IF NOT EXISTS calendar_outbox_by_event ON calendar_outbox (event_id);
+"""
+# Limit parametrów w jednym zapytaniu starszych wersji SQLite
+MAX_QUERY_PARAMS = 500
+
+
+def add_operations(connection: sqlite3.Connection, kind: str,
+                   fields_list: Iterable[Dict[str, Any]]) -> List[Operation]:
+    """Dopisuje operacje do kolejki; wywoływane wewnątrz transakcji (with connection)"""
+    operations = [{"id": uuid.uuid4().hex, "kind": kind, **fields} for fields in fields_list]
+    connection.executemany(
+        "INSERT OR IGNORE INTO calendar_outbox (id, event_id, operation) VALUES (?, ?, ?)",
+        [(operation["id"], operation.get("event_id"), json.dumps(operation)) for operation in operations]
+    )
+    return operations
+
+
+def pending_event_ids(connection: sqlite3.Connection) -> Set[str]:
+    rows = connection.execute("SELECT DISTINCT event_id FROM calendar_outbox WHERE event_id IS NOT NULL")
+    return {event_id for event_id, in rows}
+
+
+class CalendarOutbox:
+    """Trwała kolejka zmian do wysłania do Google Calendar (tabela calendar_outbox w tasks.db).
+
+    Zmiana trafia najpierw tutaj i dopiero stąd, w tle, do API - aplikacja
+    działa offline, a nieudane wysłanie nie gubi zmiany. Dodanie operacji to
+    zatwierdzona transakcja SQLite, więc awaria aplikacji jej nie gubi.
+    Obiekt jest używany z wątku UI i wątku synchronizacji (jedno połączenie pod blokadą).
+    """
+
+    def __init__(self, path: str = "tasks.db"):
+        self.path = path
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute("PRAGMA journal_mode=WAL")
+        self._connection.execute("PRAGMA synchronous=NORMAL")
+        self._connection.executescript(OUTBOX_SCHEMA)
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connection.execute("SELECT COUNT(*) FROM calendar_outbox").fetchone()[0]
+
+    def add(self, kind: str, **fields) -> Operation:
+        return self.add_many(kind, [fields])[0]
+
+    def add_many(self, kind: str, fields_list: Iterable[Dict[str, Any]]) -> List[Operation]:
+        """Dodaje wiele operacji jedną transakcją"""
+        with self._lock, self._connection:
+            return add_operations(self._connection, kind, fields_list)
+
+    def peek(self, limit: int) -> List[Operation]:
+        """Pierwsze operacje z kolejki, najwyżej limit i najwyżej jedna na wydarzenie.
+
+        Serwer wykonuje żądania z paczki w dowolnej kolejności, więc np. usunięcie
+        wydarzenia musi trafić do paczki następnej po tej z jego wstawieniem.
+        Wystąpienia wydarzenia cyklicznego liczą się jako to samo wydarzenie.
+        """
+        batch = []
+        event_ids = set()
+        with self._lock:
+            rows = self._connection.execute(
+                "SELECT operation FROM calendar_outbox ORDER BY seq LIMIT ?", (limit,)
+            ).fetchall()
+        for operation, in rows:
+            operation = json.loads(operation)
+            event_id = operation.get("event_id")
+            if event_id is not None:
+                event_id = series_event_id(event_id)
+                if event_id in event_ids:
+                    break
+                event_ids.add(event_id)
+            batch.append(operation)
+        return batch
+
+    def pending_event_ids(self) -> Set[str]:
+        with self._lock:
+            return pending_event_ids(self._connection)
+
+    def remove(self, operation_ids: Iterable[str]) -> None:
+        operation_ids = list(operation_ids)
+        if not operation_ids:
+            return
+        with self._lock, self._connection:
+            for start in range(0, len(operation_ids), MAX_QUERY_PARAMS):
+                chunk = operation_ids[start:start + MAX_QUERY_PARAMS]
+                self._connection.execute(
+                    f"DELETE FROM calendar_outbox WHERE id IN ({', '.join('?' * len(chunk))})", chunk
+                )
+
+    def close(self) -> None:
+        with self._lock:
+            self._connection.close()
+
+
+class CalendarPuller:
+    """Pobiera z Google Calendar zmiany od ostatniej synchronizacji (syncToken) i nanosi je na zadania.
+
+    open_store tworzy TaskStore z własnym połączeniem SQLite - wywoływane
+    w wątku synchronizacji, bo połączenia nie wolno współdzielić między wątkami.
+    on_changes dostaje listę dat, w których zmieniły się zadania.
+    """
+
+    def __init__(self, adapter, open_store: Callable[[], Any],
+                 on_changes: Optional[Callable[[List[str]], None]] = None):
+        self.adapter = adapter
+        self._open_store = open_store
+        self.on_changes = on_changes
+        self._store = None
+
+    def pull(self, pending_event_ids: Collection[str] = ()) -> int:
+        """Jedna synchronizacja; zwraca liczbę zmienionych zadań"""
+        if self._store is None:
+            self._store = self._open_store()
+        sync_token = self._store.sync_token()
+        try:
+            changed_dates, touched = self._pull(sync_token, pending_event_ids)
+        except SyncTokenExpiredError:
+            # Token wygasł - pełna synchronizacja od nowa
+            self._store.set_sync_token(None)
+            changed_dates, touched = self._pull(None, pending_event_ids)
+        if changed_dates and self.on_changes is not None:
+            self.on_changes(sorted(changed_dates))
+        return touched
+
+    def close(self) -> None:
+        if self._store is not None:
+            self._store.close()
+            self._store = None
+
+    def _pull(self, sync_token: Optional[str], pending_event_ids: Collection[str]):
+        changed_dates: Set[str] = set()
+        touched = 0
+        # Przy pełnej synchronizacji zbieramy identyfikatory, żeby usunąć zadania,
+        # których wydarzenia zniknęły z serwera
+        seen: Optional[Set[str]] = set() if sync_token is None else None
+        for events, next_sync_token in self.adapter.list_changes(sync_token):
+            if seen is not None:
+                seen.update(event["id"] for event in events if event.get("status") != "cancelled")
+                if next_sync_token is not None:
+                    dates, count = self._store.remove_missing_events(seen, pending_event_ids)
+                    changed_dates |= dates
+                    touched += count
+            dates, count = self._store.apply_remote_events(events, pending_event_ids, next_sync_token)
+            changed_dates |= dates
+            touched += count
+        return changed_dates, touched
+
+
+class CalendarSyncWorker:
+    """Wątek synchronizacji z Google Calendar.
+
+    Opróżnia CalendarOutbox paczkami (batch requests), a gdy kolejka jest
+    pusta, co pull_interval sekund pobiera zmiany z serwera (CalendarPuller).
+    Po błędzie sieci lub błędzie przejściowym czeka coraz dłużej
+    (wykładniczo, z losowym rozrzutem) i próbuje ponownie; błędy trwałe
+    (np. 400) usuwają operację z kolejki, żeby nie blokowała pozostałych.
+    """
+
+    def __init__(self, outbox: CalendarOutbox, adapter, batch_size: int = 50,
+                 retry_delay: float = 1.0, max_retry_delay: float = 300.0,
+                 puller: Optional[CalendarPuller] = None, pull_interval: float = 300.0):
+        self.outbox = outbox
+        self.adapter = adapter
+        self.batch_size = batch_size
+        self.retry_delay = retry_delay
+        self.max_retry_delay = max_retry_delay
+        self.puller = puller
+        self.pull_interval = pull_interval
+        self._next_pull = time.monotonic()
+        self._condition = threading.Condition()
+        self._stopping = False
+        self._retry_now = False
+        self._busy = False
+        self._thread: Optional[threading.Thread] = None
+
+    def start(self) -> None:
+        if self._thread is None:
+            self._thread = threading.Thread(target=self._run, name="calendar-sync", daemon=True)
+            self._thread.start()
+
+    def enqueue(self, kind: str, **fields) -> Operation:
+        """Zapisuje zmianę w kolejce i budzi wątek; nie czeka na sieć"""
+        return self.enqueue_many(kind, [fields])[0]
+
+    def enqueue_many(self, kind: str, fields_list: Iterable[Dict[str, Any]]) -> List[Operation]:
+        operations = self.outbox.add_many(kind, fields_list)
+        if operations:
+            self.notify()
+        return operations
+
+    def notify(self) -> None:
+        with self._condition:
+            self._condition.notify_all()
+
+    def retry_now(self) -> None:
+        """Przerywa oczekiwanie po błędzie (np. po połączeniu z API na żądanie użytkownika)"""
+        with self._condition:
+            self._retry_now = True
+            self._condition.notify_all()
+
+    def request_pull(self) -> None:
+        """Pobiera zmiany z serwera od razu, bez czekania na pull_interval"""
+        with self._condition:
+            self._next_pull = time.monotonic()
+            self._condition.notify_all()
+
+    def stop(self, timeout: Optional[float] = None) -> None:
+        with self._condition:
+            self._stopping = True
+            self._condition.notify_all()
+        if self._thread is not None:
+            self._thread.join(timeout)
+
+    def wait_idle(self, timeout: Optional[float] = None) -> bool:
+        """Czeka, aż kolejka zostanie opróżniona; zwraca False po upływie czasu"""
+        with self._condition:
+            return self._condition.wait_for(lambda: not self._busy and not len(self.outbox), timeout)
+
+    def _run(self) -> None:
+        failures = 0
+        try:
+            while True:
+                with self._condition:
+                    self._busy = False
+                    self._condition.notify_all()
+                    while not (self._stopping or len(self.outbox) or self._pull_due()):
+                        self._condition.wait(self._time_to_pull())
+                    if self._stopping:
+                        return
+                    self._busy = True
+                # Najpierw wysyłamy lokalne zmiany, dopiero przy pustej kolejce pobieramy zdalne
+                succeeded = self._push_batch() if len(self.outbox) else self._pull()
+                if succeeded:
+                    failures = 0
+                    continue
+                failures += 1
+                delay = min(self.retry_delay * 2 ** (failures - 1), self.max_retry_delay)
+                with self._condition:
+                    self._condition.wait_for(lambda: self._stopping or self._retry_now,
+                                             delay * random.uniform(0.5, 1.0))
+                    self._retry_now = False
+        finally:
+            if self.puller is not None:
+                self.puller.close()
+            self.outbox.close()
+
+    def _push_batch(self) -> bool:
+        batch = self.outbox.peek(self.batch_size)
+        try:
+            results = self.adapter.execute_batch(batch)
+        except Exception as e:
+            # Brak sieci lub poświadczeń - cała paczka czeka na kolejną próbę
+            print(f"Synchronizacja z Google Calendar nieudana: {e}")
+            results = {}
+        done = []
+        for operation in batch:
+            error = results.get(operation["id"], _NO_RESPONSE)
+            if error is None:
+                done.append(operation["id"])
+            elif error is not _NO_RESPONSE and not self.adapter.is_retryable(error):
+                print(f"Odrzucono zmianę {operation['kind']} ({operation.get('summary')}): {error}")
+                done.append(operation["id"])
+        self.outbox.remove(done)
+        return len(done) == len(batch)
+
+    def _pull(self) -> bool:
+        try:
+            self.puller.pull(self.outbox.pending_event_ids())
+        except Exception as e:
+            print(f"Pobieranie zmian z Google Calendar nieudane: {e}")
+            return False
+        self._next_pull = time.monotonic() + self.pull_interval
+        return True
+
+    def _pull_due(self) -> bool:
+        return self.puller is not None and time.monotonic() >= self._next_pull
+
+    def _time_to_pull(self) -> Optional[float]:
+        if self.puller is None:
+            return None
+        return max(0.0, self._next_pull - time.monotonic())
@@ -0,0 +1,222 @@
+import os
+import time
+from typing import Dict, List, NamedTuple, Optional, Tuple
+
+import numpy as np
+
+from focus_log import FocusLog, Record
+from persistence import write_behind
+
+DAY = 24 * 60 * 60
+# Dziennik dłuższy o tyle sesji od zapisanej kopii kolumn - odświeżamy kopię przy wczytaniu
+CACHE_REFRESH_ROWS = 1000
+
+
+class Streaks(NamedTuple):
+    current: int  # kolejne dni ze skupieniem kończące się dziś (albo wczoraj)
+    longest: int
+
+
+class FocusAnalytics:
+    """Statystyki sesji skupienia liczone operacjami NumPy na całej historii.
+
+    Sesje z dziennika (focus_log) trafiają do kolumn: początek, czas trwania,
+    kod aktywności. Kolumny są kopiowane do pliku <dziennik>.npz razem
+    z pozycją w dzienniku, więc przy starcie parsowany jest tylko nowy
+    fragment dziennika. Agregaty (sumy dzienne, aktywności, mapa godzina ×
+    dzień tygodnia, najdłuższa seria) są liczone raz dla całej historii,
+    a po każdej sesji zmieniają się tylko jej dzień, tydzień i komórka mapy.
+
+    Dni są liczone w bieżącej strefie czasowej (utc_offset w sekundach).
+    """
+
+    def __init__(self, log: FocusLog, cache_path: Optional[str] = None, utc_offset: Optional[int] = None):
+        self.log = log
+        self.cache_path = cache_path if cache_path is not None else log.path + ".npz"
+        self.utc_offset = time.localtime().tm_gmtoff if utc_offset is None else utc_offset
+        self.activities: List[str] = []
+        self._codes: Dict[str, int] = {}
+        # Kolumny sesji z dziennika do pozycji _log_offset (to trafia do .npz)
+        self._columns = (np.zeros(0), np.zeros(0, np.int64), np.zeros(0, np.int32))
+        # Sesje dodane po wczytaniu; w dzienniku są dalej niż _log_offset
+        self._new_rows: List[Tuple[float, int, int]] = []
+        self._log_offset = 0
+        self.sessions = 0
+        self.first_day = 0  # numer dnia (od 1970-01-01) pierwszego elementu daily
+        self.daily = np.zeros(0, np.int64)  # sekundy skupienia w kolejnych dniach
+        self.activity_totals = np.zeros(0, np.int64)
+        self.heatmap = np.zeros((7, 24), np.int64)  # [dzień tygodnia od poniedziałku, godzina] -> sekundy
+        self.longest_streak = 0
+        self.load()
+
+    def load(self) -> None:
+        """Kolumny z pliku .npz + sesje dopisane do dziennika od jego zapisu"""
+        self._load_cache()
+        records, self._log_offset = self.log.read_from(self._log_offset)
+        starts, durations, codes = self._session_columns(records)
+        cached_starts, cached_durations, cached_codes = self._columns
+        self._columns = (np.concatenate((cached_starts, starts)), np.concatenate((cached_durations, durations)),
+                         np.concatenate((cached_codes, codes)))
+        self.recompute()
+        if len(starts) >= CACHE_REFRESH_ROWS:
+            self.save_cache()
+
+    def recompute(self) -> None:
+        """Pełne przeliczenie agregatów z kolumn - kilka przebiegów wektorowych"""
+        starts, durations, codes = self._all_columns()
+        self.sessions = len(starts)
+        self.activity_totals = np.bincount(codes, weights=durations, minlength=len(self.activities)).astype(np.int64)
+        if not self.sessions:
+            self.first_day, self.daily = 0, np.zeros(0, np.int64)
+            self.heatmap = np.zeros((7, 24), np.int64)
+            self.longest_streak = 0
+            return
+        local = starts + self.utc_offset
+        days = (local // DAY).astype(np.int64)
+        self.first_day = int(days.min())
+        self.daily = np.bincount(days - self.first_day, weights=durations).astype(np.int64)
+        hours = (local % DAY // 3600).astype(np.int64)
+        cells = _weekday(days) * 24 + hours
+        self.heatmap = np.bincount(cells, weights=durations, minlength=7 * 24).astype(np.int64).reshape(7, 24)
+        runs = _run_lengths(self.daily > 0)
+        self.longest_streak = int(runs.max()) if len(runs) else 0
+
+    def add_session(self, record: Record) -> None:
+        """Dolicza jedną sesję - zmienia tylko jej dzień, komórkę mapy i serię kończącą się tym dniem"""
+        if record.get("kind") == "legacy":
+            return
+        start, duration = float(record["start"]), int(record["duration"])
+        code = self._code(record["activity"])
+        self._new_rows.append((start, duration, code))
+        self.sessions += 1
+        local = start + self.utc_offset
+        day = int(local // DAY)
+        if not len(self.daily):
+            self.first_day, self.daily = day, np.zeros(1, np.int64)
+        elif day < self.first_day:
+            self.daily = np.concatenate((np.zeros(self.first_day - day, np.int64), self.daily))
+            self.first_day = day
+        elif day - self.first_day >= len(self.daily):
+            self.daily = np.concatenate((self.daily, np.zeros(day - self.first_day - len(self.daily) + 1, np.int64)))
+        self.daily[day - self.first_day] += duration
+        self.heatmap[_weekday(day), int(local % DAY // 3600)] += duration
+        if code >= len(self.activity_totals):
+            self.activity_totals = np.concatenate(
+                (self.activity_totals, np.zeros(code - len(self.activity_totals) + 1, np.int64))
+            )
+        self.activity_totals[code] += duration
+        self.longest_streak = max(self.longest_streak, self._streak_around(day - self.first_day))
+
+    def daily_minutes(self, days: int = 30, today: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(daty, minuty) dla ostatnich days dni, kończąc na dziś"""
+        today = self.today() if today is None else today
+        first = today - days + 1
+        minutes = self._daily_range(first, today + 1) / 60
+        return np.arange(first, today + 1).astype("datetime64[D]"), minutes
+
+    def weekly_minutes(self, weeks: int = 12, today: Optional[int] = None) -> Tuple[np.ndarray, np.ndarray]:
+        """(poniedziałki, minuty) dla ostatnich weeks tygodni, łącznie z bieżącym"""
+        today = self.today() if today is None else today
+        monday = today - int(_weekday(today))
+        first = monday - 7 * (weeks - 1)
+        seconds = self._daily_range(first, monday + 7).reshape(weeks, 7).sum(axis=1)
+        return np.arange(first, monday + 1, 7).astype("datetime64[D]"), seconds / 60
+
+    def activity_minutes(self) -> Dict[str, float]:
+        return {activity: self.activity_totals[code] / 60 for code, activity in enumerate(self.activities)
+                if code < len(self.activity_totals)}
+
+    def heatmap_minutes(self) -> np.ndarray:
+        return self.heatmap / 60
+
+    def streaks(self, today: Optional[int] = None) -> Streaks:
+        today = self.today() if today is None else today
+        current = 0
+        for end in (today, today - 1):  # dzisiejsza sesja mogła się jeszcze nie odbyć
+            index = end - self.first_day
+            if 0 <= index < len(self.daily) and self.daily[index] > 0:
+                current = self._streak_before(index)
+                break
+        return Streaks(current, self.longest_streak)
+
+    def today(self) -> int:
+        return int((time.time() + self.utc_offset) // DAY)
+
+    def save_cache(self) -> None:
+        """Zapisuje kolumny i pozycję w dzienniku w tle (write_behind)"""
+        starts, durations, codes = self._columns
+        activities = np.array(self.activities, dtype=str)
+        offset = self._log_offset
+        path = self.cache_path
+
+        def write():
+            tmp_path = path + ".tmp.npz"
+            np.savez(tmp_path, starts=starts, durations=durations, codes=codes, activities=activities,
+                     log_offset=np.int64(offset))
+            os.replace(tmp_path, path)
+
+        write_behind.submit(path, write)
+
+    def _load_cache(self) -> None:
+        try:
+            with np.load(self.cache_path) as cache:
+                offset = int(cache["log_offset"])
+                if not os.path.exists(self.log.path) or offset > os.path.getsize(self.log.path):
+                    return  # dziennik podmieniony albo skrócony - kopia nieaktualna
+                self.activities = [str(activity) for activity in cache["activities"]]
+                self._codes = {activity: code for code, activity in enumerate(self.activities)}
+                self._columns = (cache["starts"], cache["durations"], cache["codes"])
+                self._log_offset = offset
+        except (FileNotFoundError, OSError, ValueError, KeyError):
+            return
+
+    def _session_columns(self, records: List[Record]) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        sessions = [record for record in records if record.get("kind") != "legacy" and "start" in record]
+        starts = np.fromiter((record["start"] for record in sessions), np.float64, len(sessions))
+        durations = np.fromiter((record["duration"] for record in sessions), np.int64, len(sessions))
+        codes = np.fromiter((self._code(record["activity"]) for record in sessions), np.int32, len(sessions))
+        return starts, durations, codes
+
+    def _code(self, activity: str) -> int:
+        code = self._codes.get(activity)
+        if code is None:
+            code = self._codes[activity] = len(self.activities)
+            self.activities.append(activity)
+        return code
+
+    def _all_columns(self) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+        if not self._new_rows:
+            return self._columns
+        new_columns = [np.array(column) for column in zip(*self._new_rows)]
+        return tuple(np.concatenate((column, new.astype(column.dtype)))
+                     for column, new in zip(self._columns, new_columns))
+
+    def _daily_range(self, first: int, end: int) -> np.ndarray:
+        """Sekundy w dniach [first, end) - dni spoza historii mają 0"""
+        result = np.zeros(end - first, np.int64)
+        low, high = max(first, self.first_day), min(end, self.first_day + len(self.daily))
+        if low < high:
+            result[low - first:high - first] = self.daily[low - self.first_day:high - self.first_day]
+        return result
+
+    def _streak_before(self, index: int) -> int:
+        """Długość serii aktywnych dni kończącej się na index"""
+        inactive = np.flatnonzero(self.daily[:index + 1][::-1] == 0)
+        return int(inactive[0]) if len(inactive) else index + 1
+
+    def _streak_around(self, index: int) -> int:
+        after = np.flatnonzero(self.daily[index:] == 0)
+        end = index + (int(after[0]) if len(after) else len(self.daily) - index) - 1
+        return self._streak_before(end)
+
+
+def _weekday(days):
+    # 1970-01-01 to czwartek; poniedziałek = 0
+    return (days + 3) % 7
+
+
+def _run_lengths(active: np.ndarray) -> np.ndarray:
+    """Długości kolejnych serii wartości True"""
+    padded = np.concatenate(([False], active, [False]))
+    edges = np.flatnonzero(padded[1:] != padded[:-1])
+    return edges[1::2] - edges[::2]
@@ -0,0 +1,140 @@
+import json
+import os
+import threading
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from persistence import append_line
+
+Record = Dict[str, Any]
+
+DEFAULT_ACTIVITIES = ("Reading", "Coding", "Studying", "Relaxing")
+POINTS_PER_SESSION = 10
+
+# Dawne pliki, zastąpione przez dziennik sesji (migrowane przy pierwszym uruchomieniu)
+LEGACY_POINTS = "points.json"
+LEGACY_STATS = "stats.json"
+LEGACY_ACTIVITIES = "activities.json"
+
+
+class FocusStats:
+    """Agregaty dziennika sesji utrzymywane w pamięci; każdy wpis zmienia je w O(1)"""
+
+    def __init__(self):
+        self.points = 0
+        self.total_time = 0  # sekundy
+        self.sessions = 0
+        self.activity_minutes: Dict[str, int] = dict.fromkeys(DEFAULT_ACTIVITIES, 0)
+
+    def apply(self, record: Record) -> None:
+        self.points += record.get("points", 0)
+        self.total_time += record.get("duration", 0)
+        if record.get("kind") == "legacy":
+            # Sumy z dawnych plików - bez historii pojedynczych sesji
+            for activity, minutes in record.get("activity_minutes", {}).items():
+                self.activity_minutes[activity] = self.activity_minutes.get(activity, 0) + minutes
+            return
+        self.sessions += 1
+        activity = record["activity"]
+        self.activity_minutes[activity] = self.activity_minutes.get(activity, 0) + record["duration"] // 60
+
+
+class FocusLog:
+    """Dziennik ukończonych sesji skupienia (jedna linia JSON na sesję).
+
+    Zastępuje points.json, stats.json i activities.json: ukończenie sesji to
+    jedno dopisanie do pliku, a punkty, łączny czas i minuty na aktywność są
+    agregatami odtwarzanymi z dziennika jednym przebiegiem przy starcie.
+    """
+
+    def __init__(self, path: str = "focus_sessions.log", legacy_dir: Optional[str] = "."):
+        self.path = path
+        self.stats = FocusStats()
+        self._lock = threading.Lock()
+        if not os.path.exists(path) and legacy_dir is not None:
+            self.migrate_legacy(legacy_dir)
+        for record in self.records():
+            self.stats.apply(record)
+
+    def records(self) -> Iterator[Record]:
+        """Strumieniowo czyta dziennik, bez wczytywania całego pliku"""
+        try:
+            with open(self.path, "r") as file:
+                for line in file:
+                    try:
+                        yield json.loads(line)
+                    except json.JSONDecodeError:
+                        # Urwany ostatni wpis po awarii - pomijamy
+                        continue
+        except FileNotFoundError:
+            return
+
+    def read_from(self, offset: int = 0) -> Tuple[List[Record], int]:
+        """Pełne wpisy dopisane od bajtu offset i pozycja za ostatnim z nich.
+
+        Całość jest parsowana jednym wywołaniem json.loads (kilka razy szybciej
+        niż linia po linii); po uszkodzonym wpisie wracamy do parsowania po linii.
+        """
+        try:
+            with open(self.path, "rb") as file:
+                file.seek(offset)
+                data = file.read()
+        except FileNotFoundError:
+            return [], offset
+        end = data.rfind(b"\n") + 1  # urwany ostatni wpis zostaje na później
+        lines = data[:end].decode().splitlines()
+        try:
+            records = json.loads("[" + ",".join(lines) + "]")
+        except json.JSONDecodeError:
+            records = []
+            for line in lines:
+                try:
+                    records.append(json.loads(line))
+                except json.JSONDecodeError:
+                    continue
+        return records, offset + end
+
+    def record_session(self, start: float, end: float, activity: str, duration: int,
+                       points: int = POINTS_PER_SESSION) -> Record:
+        record = {"start": start, "end": end, "activity": activity, "duration": duration, "points": points}
+        self._append(record)
+        self.stats.apply(record)
+        return record
+
+    def migrate_legacy(self, directory: str) -> bool:
+        """Przenosi sumy z dawnych plików do dziennika jednym wpisem "legacy".
+
+        activities.json bywa zapisany płasko ({"Reading": 2, ...}) albo
+        zagnieżdżony ({"activities": {...}}); stats.json jako obiekt
+        z total_time albo lista czasów sesji. Dawne pliki zostają bez zmian.
+        """
+        points = _read_json(os.path.join(directory, LEGACY_POINTS))
+        stats = _read_json(os.path.join(directory, LEGACY_STATS))
+        activities = _read_json(os.path.join(directory, LEGACY_ACTIVITIES))
+        if points is None and stats is None and activities is None:
+            return False
+        if isinstance(activities, dict) and isinstance(activities.get("activities"), dict):
+            activities = activities["activities"]
+        if isinstance(stats, list):
+            stats = {"total_time": sum(stats)}
+        record = {
+            "kind": "legacy",
+            "points": points.get("points", 0) if isinstance(points, dict) else 0,
+            "duration": stats.get("total_time", 0) if isinstance(stats, dict) else 0,
+            "activity_minutes": {activity: minutes for activity, minutes in (activities or {}).items()
+                                 if isinstance(minutes, int)},
+        }
+        self._append(record, sync=True)
+        return True
+
+    def _append(self, record: Record, sync: bool = False) -> None:
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            append_line(self.path, line, sync)
+
+
+def _read_json(path: str) -> Any:
+    try:
+        with open(path, "r") as file:
+            return json.load(file)
+    except (FileNotFoundError, json.JSONDecodeError):
+        return None
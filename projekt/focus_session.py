@@ -0,0 +1,144 @@
+import time
+from typing import Callable, Optional
+
+
+# Klasy stanów - przejścia sesji skupienia, bez widżetów i timerów Qt
+class TimerState:
+    name = "idle"
+
+    def start(self, session: "FocusSession", target_time: int) -> None:
+        pass
+
+    def stop(self, session: "FocusSession") -> None:
+        pass
+
+    def reset(self, session: "FocusSession") -> None:
+        pass
+
+    def pause(self, session: "FocusSession") -> None:
+        pass
+
+    def finish(self, session: "FocusSession") -> bool:
+        return False
+
+
+class IdleState(TimerState):
+    def start(self, session, target_time):
+        session.accumulated_time = 0.0
+        session.target_time = target_time
+        session.start_time = session.wall_clock()
+        session.resume_clock()
+        session.state = RunningState()
+
+
+class RunningState(TimerState):
+    name = "running"
+
+    def stop(self, session):
+        session.pause_clock()
+        session.state = IdleState()
+
+    def reset(self, session):
+        session.pause_clock()
+        session.accumulated_time = 0.0
+        session.state = IdleState()
+
+    def pause(self, session):
+        session.pause_clock()
+        session.state = PausedState()
+
+    def finish(self, session):
+        if session.elapsed() < session.target_time:
+            # Timer jednorazowy może się obudzić minimalnie za wcześnie
+            return False
+        session.pause_clock()
+        session.accumulated_time = float(session.target_time)
+        session.state = CompletedState()
+        return True
+
+
+class PausedState(RunningState):
+    """Sesja wstrzymana - zegar stoi, dotychczasowy czas zostaje w accumulated_time"""
+    name = "paused"
+
+    def start(self, session, target_time):
+        self.pause(session)
+
+    def pause(self, session):
+        session.resume_clock()
+        session.state = RunningState()
+
+    def finish(self, session):
+        return False
+
+
+class CompletedState(TimerState):
+    name = "completed"
+
+    def start(self, session, target_time):
+        session.state = IdleState()
+        session.state.start(session, target_time)
+
+
+class FocusSession:
+    """Maszyna stanów sesji skupienia liczona zegarem monotonicznym.
+
+    Nie zależy od Qt: widżet (FocusTimer) wywołuje przejścia, a potem
+    na podstawie stanu ustawia przyciski i timer końca sesji (remaining()).
+    Zegary są wstrzykiwane, więc przebieg sesji da się odtworzyć bez czekania.
+    """
+
+    def __init__(self, clock: Callable[[], float] = time.monotonic, wall_clock: Callable[[], float] = time.time):
+        self.clock = clock
+        self.wall_clock = wall_clock
+        self.state: TimerState = IdleState()  # Początkowy stan
+        self.target_time = 0  # sekundy
+        self.accumulated_time = 0.0  # sekundy sprzed ostatniej pauzy
+        self.clock_started: Optional[float] = None  # clock() przy starcie/wznowieniu
+        self.start_time: Optional[float] = None  # czas ścienny startu sesji (do dziennika)
+
+    @property
+    def is_running(self) -> bool:
+        """Sesja rozpoczęta i nie zakończona - także wstrzymana"""
+        return self.state.name in ("running", "paused")
+
+    @property
+    def is_ticking(self) -> bool:
+        return self.clock_started is not None
+
+    def start(self, target_time: int) -> None:
+        self.state.start(self, target_time)
+
+    def stop(self) -> None:
+        self.state.stop(self)
+
+    def reset(self) -> None:
+        self.state.reset(self)
+
+    def pause(self) -> None:
+        """Wstrzymuje albo wznawia sesję"""
+        self.state.pause(self)
+
+    def finish(self) -> bool:
+        """Kończy sesję, jeśli minął jej czas; True, gdy sesja została ukończona"""
+        return self.state.finish(self)
+
+    def elapsed(self) -> float:
+        """Sekundy sesji bez pauz, niezależnie od opóźnień pętli zdarzeń"""
+        if self.clock_started is None:
+            return self.accumulated_time
+        return self.accumulated_time + self.clock() - self.clock_started
+
+    def seconds(self) -> int:
+        """Pełne sekundy do wyświetlenia, najwyżej czas sesji"""
+        return min(int(self.elapsed()), self.target_time)
+
+    def remaining(self) -> float:
+        return max(0.0, self.target_time - self.elapsed())
+
+    def resume_clock(self) -> None:
+        self.clock_started = self.clock()
+
+    def pause_clock(self) -> None:
+        self.accumulated_time = self.elapsed()
+        self.clock_started = None
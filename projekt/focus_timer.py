@@ -1,89 +1,31 @@
-import json
-import time
+import math
 from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel, QDoubleSpinBox, QPushButton, QMessageBox, QHBoxLayout, QComboBox
-from PySide6.QtCore import QTimer
-from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
-from matplotlib.figure import Figure
-import matplotlib.pyplot as plt
-
-# Klasy stanów
-class TimerState:
-    def start_timer(self, timer):
-        pass
-
-    def stop_timer(self, timer):
-        pass
-
-    def reset_timer(self, timer):
-        pass
-
-    def update_timer(self, timer):
-        pass
-
-class IdleState(TimerState):
-    def start_timer(self, timer):
-        if not timer.is_running:
-            timer.time_elapsed = 0
-            timer.target_time = int(timer.time_input.value() * 60)
-            timer.start_time = time.time()
-            timer.timer.start(1000)
-            timer.is_running = True
-            timer.time_input.hide()
-            timer.current_state = RunningState()
-
-class RunningState(TimerState):
-    def stop_timer(self, timer):
-        timer.timer.stop()
-        timer.is_running = False
-        timer.time_input.show()
-        timer.current_state = IdleState()
-
-    def reset_timer(self, timer):
-        timer.timer.stop()
-        timer.time_elapsed = 0
-        timer.time_display.setText("00:00")
-        timer.is_running = False
-        timer.time_input.show()
-        timer.current_state = IdleState()
-
-    def update_timer(self, timer):
-        if timer.time_elapsed < timer.target_time:
-            timer.time_elapsed += 1
-            minutes = timer.time_elapsed // 60
-            seconds = timer.time_elapsed % 60
-            timer.time_display.setText(f"{minutes:02}:{seconds:02}")
-        else:
-            timer.timer.stop()
-            timer.is_running = False
-            timer.add_points()
-            timer.update_stats()
-            timer.update_activities()
-            timer.show_completion_message()
-            timer.time_input.show()
-            timer.current_state = CompletedState()
-
-class CompletedState(TimerState):
-    def start_timer(self, timer):
-        timer.current_state = IdleState()
-        timer.current_state.start_timer(timer)
+from PySide6.QtCore import Qt, QEvent, QTimer
+from focus_log import FocusLog
+from focus_session import FocusSession
 
 # Główna klasa FocusTimer
 class FocusTimer(QWidget):
     def __init__(self):
         super().__init__()
+        # Czas sesji liczony z zegara monotonicznego; koniec sesji wyznacza jeden
+        # timer jednorazowy, a timer odświeżania działa tylko, gdy zakładka jest widoczna
         self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.CoarseTimer)
         self.timer.timeout.connect(self.update_timer)
-        self.time_elapsed = 0
-        self.is_running = False
-        self.start_time = None
-        self.points = 0
+        self.deadline_timer = QTimer(self)
+        self.deadline_timer.setSingleShot(True)
+        self.deadline_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.deadline_timer.timeout.connect(self.finish_timer)
+        # Stany sesji i zegar bez Qt; widżet tylko odwzorowuje stan na przyciski i timery
+        self.session = FocusSession()
+        self.watched_window = None
         self.activity = "Reading"
-        self.activities = {"Reading": 0, "Coding": 0, "Studying": 0, "Relaxing": 0}
-        self.current_state = IdleState()  # Początkowy stan
-        self.load_points()
-        self.load_activities()
+        # Dziennik sesji; punkty, czas i aktywności to agregaty w pamięci
+        self.focus_log = FocusLog()
+        self.stats = self.focus_log.stats
+        # Styl (styles.qss) ustawia okno główne - obejmuje też tę zakładkę
         self.initUI()
-        self.load_stylesheet()
 
     def initUI(self):
         layout = QVBoxLayout()
@@ -93,7 +35,7 @@ class FocusTimer(QWidget):
 
         # Activity selection
         self.activity_selector = QComboBox(self)
-        self.activity_selector.addItems(self.activities.keys())
+        self.activity_selector.addItems(self.stats.activity_minutes.keys())
         self.activity_selector.currentTextChanged.connect(self.set_activity)
         layout.addWidget(self.activity_selector)
 
@@ -118,6 +60,11 @@ class FocusTimer(QWidget):
         self.start_button.clicked.connect(self.start_timer)
         layout.addWidget(self.start_button)
 
+        self.pause_button = QPushButton("Pause", self)
+        self.pause_button.setObjectName("pause_button")
+        self.pause_button.clicked.connect(self.pause_timer)
+        layout.addWidget(self.pause_button)
+
         self.stop_button = QPushButton("Stop", self)
         self.stop_button.setObjectName("stop_button")
         self.stop_button.clicked.connect(self.confirm_stop_timer)
@@ -133,21 +80,99 @@ class FocusTimer(QWidget):
         self.stats_button.clicked.connect(self.show_stats)
         layout.addWidget(self.stats_button)
 
-        self.points_display = QLabel(f"Points: {self.points}", self)
+        self.analytics_button = QPushButton("Show Analytics", self)
+        self.analytics_button.setObjectName("analytics_button")
+        self.analytics_button.clicked.connect(self.toggle_analytics)
+        layout.addWidget(self.analytics_button)
+
+        self.points_display = QLabel(f"Points: {self.stats.points}", self)
         layout.addWidget(self.points_display)
 
-        # Pie chart
-        self.figure = Figure()
-        self.canvas = FigureCanvas(self.figure)
-        layout.addWidget(self.canvas)
-        self.update_pie_chart()
+        # Pie chart - matplotlib jest importowany dopiero po pierwszym narysowaniu zakładki
+        self.chart_layout = QVBoxLayout()
+        layout.addLayout(self.chart_layout)
+        self.figure = None
+        self.canvas = None
+        self.chart_pending = False
+        self.pie_wedges = []
+        self.pie_labels = []
+        self.pie_autotexts = []
+        self.chart_data = None  # (aktywności, minuty) ostatnio narysowane
+
+        # Wykresy statystyk (NumPy) - budowane dopiero po kliknięciu "Show Analytics"
+        self.analytics_layout = QVBoxLayout()
+        layout.addLayout(self.analytics_layout)
+        self.analytics = None
+        self.analytics_figure = None
+        self.analytics_canvas = None
 
         self.setLayout(layout)
         self.setWindowTitle("Focus Timer")
 
-    def load_stylesheet(self):
-        with open("styles.qss", "r") as file:
-            self.setStyleSheet(file.read())
+    def showEvent(self, event):
+        super().showEvent(event)
+        # Minimalizacja okna nie chowa zakładki - obserwujemy stan okna
+        if self.watched_window is not self.window():
+            self.watched_window = self.window()
+            self.watched_window.installEventFilter(self)
+        self.update_refresh_timer()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.update_refresh_timer()
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Type.WindowStateChange:
+            self.update_refresh_timer()
+        return False
+
+    def update_refresh_timer(self):
+        """Odświeżanie co sekundę tylko dla trwającej sesji w widocznej zakładce"""
+        visible = self.isVisible() and not self.window().isMinimized()
+        if visible and self.session.is_ticking:
+            if not self.timer.isActive():
+                self.refresh_display()
+                self.timer.start(1000)
+        else:
+            self.timer.stop()
+
+    def sync_state(self):
+        """Przyciski, pole czasu i timery zgodne ze stanem sesji po przejściu"""
+        if self.session.is_ticking:
+            self.deadline_timer.start(math.ceil(self.session.remaining() * 1000))
+        else:
+            self.deadline_timer.stop()
+        self.pause_button.setText("Resume" if self.session.state.name == "paused" else "Pause")
+        self.time_input.setVisible(not self.session.is_running)
+        self.update_refresh_timer()
+        self.refresh_display()
+
+    def refresh_display(self):
+        elapsed = self.session.seconds()
+        minutes = elapsed // 60
+        seconds = elapsed % 60
+        self.time_display.setText(f"{minutes:02}:{seconds:02}")
+
+    def paintEvent(self, event):
+        super().paintEvent(event)
+        if self.canvas is None and not self.chart_pending:
+            # Wykres powstaje dopiero po pierwszym narysowaniu zakładki -
+            # import matplotlib nie opóźnia pojawienia się okna
+            self.chart_pending = True
+            QTimer.singleShot(0, self.create_chart)
+
+    def create_chart(self):
+        self.chart_pending = False
+        if self.canvas is not None:
+            return
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+
+        self.figure = Figure()
+        self.canvas = FigureCanvas(self.figure)
+        self.canvas.setMinimumHeight(200)  # matplotlib nie rysuje na płótnie o zerowej wysokości
+        self.chart_layout.addWidget(self.canvas)
+        self.update_pie_chart()
 
     def add_time_button(self, layout, label, minutes):
         button = QPushButton(label, self)
@@ -163,19 +188,33 @@ class FocusTimer(QWidget):
 
     # Metody związane ze stanami
     def start_timer(self):
-        self.current_state.start_timer(self)
+        self.session.start(int(self.time_input.value() * 60))
+        self.sync_state()
 
     def stop_timer(self):
-        self.current_state.stop_timer(self)
+        self.session.stop()
+        self.sync_state()
 
     def reset_timer(self):
-        self.current_state.reset_timer(self)
+        self.session.reset()
+        self.sync_state()
+
+    def pause_timer(self):
+        self.session.pause()
+        self.sync_state()
 
     def update_timer(self):
-        self.current_state.update_timer(self)
+        self.refresh_display()
+
+    def finish_timer(self):
+        completed = self.session.finish()
+        self.sync_state()
+        if completed:
+            self.record_session()
+            self.show_completion_message()
 
     def confirm_stop_timer(self):
-        if self.is_running:
+        if self.session.is_running:
             msg_box = QMessageBox()
             msg_box.setIcon(QMessageBox.Icon.Question)
             msg_box.setText("Really wanna stop? Don't give up!")
@@ -188,7 +227,7 @@ class FocusTimer(QWidget):
                 self.stop_timer()
 
     def confirm_reset_timer(self):
-        if self.is_running:
+        if self.session.is_running:
             msg_box = QMessageBox()
             msg_box.setIcon(QMessageBox.Icon.Question)
             msg_box.setText("Are you sure you want to reset the timer?")
@@ -200,82 +239,115 @@ class FocusTimer(QWidget):
             if result == QMessageBox.StandardButton.Yes:
                 self.reset_timer()
 
-    def add_points(self):
-        self.points += 10
-        self.save_points()
-        self.points_display.setText(f"Points: {self.points}")
-
-    def save_points(self):
-        with open("points.json", "w") as file:
-            json.dump({"points": self.points}, file)
-
-    def load_points(self):
-        try:
-            with open("points.json", "r") as file:
-                data = json.load(file)
-                self.points = data.get("points", 0)
-        except (FileNotFoundError, json.JSONDecodeError):
-            self.points = 0
-
-    def update_stats(self):
-        try:
-            with open("stats.json", "r") as file:
-                data = json.load(file)
-                if isinstance(data, list):
-                    total_time = sum(data)
-                    data = {"total_time": total_time}
-        except (FileNotFoundError, json.JSONDecodeError):
-            data = {"total_time": 0}
-
-        data["total_time"] += self.time_elapsed
-        with open("stats.json", "w") as file:
-            json.dump(data, file)
+    def record_session(self):
+        """Ukończona sesja to jeden wpis w dzienniku zamiast zapisu trzech plików"""
+        record = self.focus_log.record_session(self.session.start_time, self.session.wall_clock(), self.activity,
+                                               self.session.seconds())
+        self.points_display.setText(f"Points: {self.stats.points}")
+        self.update_pie_chart()
+        if self.analytics is not None:
+            self.analytics.add_session(record)
+            self.update_analytics_chart()
 
     def show_stats(self):
-        try:
-            with open("stats.json", "r") as file:
-                data = json.load(file)
-                if isinstance(data, list):
-                    total_time = sum(data)
-                    data = {"total_time": total_time}
-                total_time = data.get("total_time", 0)
-                minutes = total_time // 60
-                seconds = total_time % 60
-                self.time_display.setText(f"Total Focus Time: {minutes:02}:{seconds:02}")
-        except (FileNotFoundError, json.JSONDecodeError):
-            self.time_display.setText("Total Focus Time: 00:00")
+        minutes = self.stats.total_time // 60
+        seconds = self.stats.total_time % 60
+        self.time_display.setText(f"Total Focus Time: {minutes:02}:{seconds:02}")
 
     def show_completion_message(self):
-        minutes = self.time_elapsed // 60
+        minutes = self.session.seconds() // 60
         msg_box = QMessageBox()
         msg_box.setIcon(QMessageBox.Icon.Information)
         msg_box.setText(f"Timer ended. {minutes} minutes passed. Keep Going!")
         msg_box.setWindowTitle("Focus Timer")
         msg_box.exec()
 
-    def update_activities(self):
-        self.activities[self.activity] += self.time_elapsed // 60
-        self.save_activities()
-        self.update_pie_chart()
-
-    def save_activities(self):
-        with open("activities.json", "w") as file:
-            json.dump(self.activities, file)
-
-    def load_activities(self):
-        try:
-            with open("activities.json", "r") as file:
-                self.activities = json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            self.activities = {"Reading": 0, "Coding": 0, "Studying": 0, "Relaxing": 0}
-
     def update_pie_chart(self):
-        self.figure.clear()
-        ax = self.figure.add_subplot(111)
-        activities = list(self.activities.keys())
-        times = list(self.activities.values())
-
+        """Aktualizuje wykres; bez zmian w danych nic nie jest rysowane ponownie"""
+        if self.canvas is None:
+            return  # wykres powstanie przy pierwszym pokazaniu
+        activities = tuple(self.stats.activity_minutes.keys())
+        times = tuple(self.stats.activity_minutes.values())
+        if (activities, times) == self.chart_data:
+            return
         if sum(times) == 0:
-            times = [1] * len(times)
-        ax.pie(times, labels=activities, autopct='%1.1f%%', startangle=140)
-        self.canvas.draw()
+            times = (1,) * len(times)
+        if self.chart_data is not None and activities == self.chart_data[0]:
+            self.move_wedges(times)
+        else:
+            # Pierwsze rysowanie albo nowa aktywność - budujemy wykres od nowa
+            self.figure.clear()
+            ax = self.figure.add_subplot(111)
+            self.pie_wedges, self.pie_labels, self.pie_autotexts = ax.pie(
+                times, labels=activities, autopct='%1.1f%%', startangle=140
+            )
+        self.chart_data = (activities, tuple(self.stats.activity_minutes.values()))
+        self.canvas.draw_idle()
+
+    def move_wedges(self, times):
+        # Ta sama geometria co Axes.pie (startangle=140, domyślne odległości etykiet)
+        total = sum(times)
+        theta1 = 140 / 360
+        for wedge, label, autotext, time_value in zip(self.pie_wedges, self.pie_labels, self.pie_autotexts, times):
+            fraction = time_value / total
+            theta2 = theta1 + fraction
+            wedge.set_theta1(360 * theta1)
+            wedge.set_theta2(360 * theta2)
+            middle = math.pi * (theta1 + theta2)
+            label_x = 1.1 * math.cos(middle)
+            label.set_position((label_x, 1.1 * math.sin(middle)))
+            label.set_horizontalalignment('left' if label_x > 0 else 'right')
+            autotext.set_position((0.6 * math.cos(middle), 0.6 * math.sin(middle)))
+            autotext.set_text('%1.1f%%' % (100 * fraction))
+            theta1 = theta2
+
+    def toggle_analytics(self):
+        if self.analytics_canvas is None:
+            self.create_analytics_chart()
+        visible = not self.analytics_canvas.isVisible()
+        self.analytics_canvas.setVisible(visible)
+        self.analytics_button.setText("Hide Analytics" if visible else "Show Analytics")
+        self.update_analytics_chart()
+
+    def create_analytics_chart(self):
+        from matplotlib.backends.backend_qt5agg import FigureCanvasQTAgg as FigureCanvas
+        from matplotlib.figure import Figure
+        from focus_analytics import FocusAnalytics
+
+        self.analytics = FocusAnalytics(self.focus_log)
+        self.analytics_figure = Figure(figsize=(8, 6))
+        self.analytics_canvas = FigureCanvas(self.analytics_figure)
+        self.analytics_canvas.setMinimumHeight(360)
+        self.analytics_canvas.hide()
+        self.analytics_layout.addWidget(self.analytics_canvas)
+
+    def update_analytics_chart(self):
+        """Dzienne i tygodniowe minuty, mapa godzina × dzień tygodnia i serie dni"""
+        if self.analytics_canvas is None or not self.analytics_canvas.isVisible():
+            return
+        figure = self.analytics_figure
+        figure.clear()
+        grid = figure.add_gridspec(2, 2)
+        streaks = self.analytics.streaks()
+        figure.suptitle(f"Streak: {streaks.current} days (longest {streaks.longest})")
+
+        daily = figure.add_subplot(grid[0, :])
+        dates, minutes = self.analytics.daily_minutes(30)
+        daily.bar(dates.astype(object), minutes, color="#4CAF50")
+        daily.set_title("Last 30 days (min)")
+        daily.tick_params(axis="x", labelrotation=45, labelsize=7)
+
+        weekly = figure.add_subplot(grid[1, 0])
+        weeks, minutes = self.analytics.weekly_minutes(12)
+        weekly.bar([week.astype(object).strftime("%d.%m") for week in weeks], minutes, color="#2196F3")
+        weekly.set_title("Weekly (min)")
+        weekly.tick_params(axis="x", labelrotation=90, labelsize=7)
+
+        heatmap = figure.add_subplot(grid[1, 1])
+        heatmap.imshow(self.analytics.heatmap_minutes(), aspect="auto", cmap="Oranges")
+        heatmap.set_yticks(range(7), ["Mon", "Tue", "Wed", "Thu", "Fri", "Sat", "Sun"], fontsize=7)
+        heatmap.set_xticks(range(0, 24, 3))
+        heatmap.set_title("Hour x weekday (min)")
+
+        figure.tight_layout()
+        self.analytics_canvas.draw_idle()
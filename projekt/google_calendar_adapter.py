@@ -1,24 +1,88 @@
 import json
 import os
 import datetime
-from google.auth.transport.requests import Request
-from google.oauth2.credentials import Credentials
-from google_auth_oauthlib.flow import InstalledAppFlow
-from googleapiclient.discovery import build
-from googleapiclient.errors import HttpError
+import threading
+
+# Biblioteki Google (ok. 0,2 s importu) ładujemy dopiero przy łączeniu z API
 
 SCOPES = ["https://www.googleapis.com/auth/calendar"]
+CALENDAR_ID = "primary"
+DISCOVERY_URL = "https://www.googleapis.com/discovery/v1/apis/calendar/v3/rest"
+# Kody, po których warto ponowić żądanie (limity i przejściowe błędy serwera)
+RETRYABLE_STATUSES = {429, 500, 502, 503, 504}
+RATE_LIMIT_REASONS = (b"rateLimitExceeded", b"userRateLimitExceeded")
+# Znacznik wydarzeń tworzonych przez aplikację (extendedProperties.private) - przy pobieraniu
+# zmian pomijamy pozostałe wydarzenia z kalendarza użytkownika
+APP_PROPERTY = "studyTimeManager"
+
+
+def is_app_event(event):
+    return event.get("extendedProperties", {}).get("private", {}).get(APP_PROPERTY) == "1"
+
+
+class CalendarUnavailableError(Exception):
+    pass
+
+
+class SyncTokenExpiredError(Exception):
+    """Serwer odrzucił syncToken (410 Gone) - potrzebna pełna synchronizacja"""
+
 
 class GoogleCalendarAdapter:
-    def __init__(self):
-        self.creds = self.get_credentials()
-        if self.creds:
-            self.service = build("calendar", "v3", credentials=self.creds)
-        else:
-            print("Uwaga: Brak ważnych poświadczeń. Ustaw tokeny dostępu w token.json lub uruchom autoryzację.")
-
-    def get_credentials(self):
-        """Uzyskaj poświadczenia do Google Calendar API"""
+    def __init__(self, service=None):
+        # service pozwala podstawić lokalny zamiennik API (np. w benchmarkach).
+        # Bez niego konstruktor nic nie robi - poświadczenia i usługa powstają
+        # przy pierwszym użyciu (connect), zwykle w wątku synchronizacji
+        self.service = service
+        self.creds = None
+        self._connect_lock = threading.Lock()
+        self._warned = False
+
+    def connect(self, interactive=False):
+        """Uzyskuje poświadczenia i tworzy usługę; zwraca usługę albo None.
+
+        Nieudana próba (brak sieci, wygasły token) nie jest zapamiętywana -
+        wątek synchronizacji woła connect przy każdej próbie, więc ponowne
+        łączenie idzie w rytmie jego opóźnień. Autoryzacja w przeglądarce
+        startuje tylko z interactive=True, czyli na żądanie użytkownika.
+        """
+        with self._connect_lock:
+            if self.service is None:
+                self.creds = self.get_credentials(interactive)
+                if self.creds:
+                    self.service = self.build_service(credentials=self.creds)
+                elif not self._warned:
+                    self._warned = True
+                    print("Uwaga: Brak ważnych poświadczeń. Ustaw tokeny dostępu w token.json lub uruchom autoryzację.")
+        return self.service
+
+    def connect_in_background(self, interactive=False, on_done=None):
+        """connect() w osobnym wątku; on_done(połączono) jest wywoływane w tym wątku"""
+        def run():
+            service = self.connect(interactive)
+            if on_done is not None:
+                on_done(service is not None)
+        threading.Thread(target=run, name="calendar-connect", daemon=True).start()
+
+    def build_service(self, **kwargs):
+        """Tworzy usługę z lokalnej kopii dokumentu discovery, bez pobierania go z sieci"""
+        from googleapiclient.discovery import build_from_document
+        return build_from_document(self.discovery_document(), **kwargs)
+
+    @staticmethod
+    def discovery_document():
+        from googleapiclient.discovery_cache import get_static_doc
+        document = get_static_doc("calendar", "v3")
+        if document is None:
+            # Wersja biblioteki bez dokumentów w pakiecie - pobieramy z sieci
+            import httplib2
+            _, document = httplib2.Http().request(DISCOVERY_URL)
+        return json.loads(document)
+
+    def get_credentials(self, interactive=False):
+        """Uzyskaj poświadczenia do Google Calendar API (bez interactive - tylko z token.json)"""
+        from google.auth.transport.requests import Request
+        from google.oauth2.credentials import Credentials
         creds = None
         
         # Sprawdź czy plik token.json istnieje i czy zawiera prawdziwe tokeny
@@ -41,9 +105,9 @@ class GoogleCalendarAdapter:
                     creds.refresh(Request())
                 except Exception as e:
                     print(f"Nie można odświeżyć tokenu: {e}")
-                    return self.run_authorization_flow()
+                    return self.run_authorization_flow() if interactive else None
             else:
-                return self.run_authorization_flow()
+                return self.run_authorization_flow() if interactive else None
                 
             # Zapisz nowe tokeny
             with open("token.json", "w") as token:
@@ -53,6 +117,7 @@ class GoogleCalendarAdapter:
     
     def run_authorization_flow(self):
         """Uruchamia pełny proces autoryzacji"""
+        from google_auth_oauthlib.flow import InstalledAppFlow
         try:
             if os.path.exists("credentials.json"):
                 with open("credentials.json", "r") as f:
@@ -72,23 +137,99 @@ class GoogleCalendarAdapter:
             print(f"Błąd podczas autoryzacji: {e}")
             return None
 
-    def add_event(self, title, date):
-        if not hasattr(self, 'service'):
-            print("Brak połączenia z Google Calendar API. Ustaw poprawne tokeny.")
-            return False
-            
+    @staticmethod
+    def event_body(title, date, event_id=None, recurrence=None):
         event = {
             "summary": title,
-            "start": {"date": date},  
-            "end": {"date": date}
+            "start": {"date": date},
+            "end": {"date": date},
+            "extendedProperties": {"private": {APP_PROPERTY: "1"}}
         }
+        if event_id is not None:
+            event["id"] = event_id
+        if recurrence is not None:
+            # Jedno wydarzenie cykliczne (RRULE) zamiast osobnego wydarzenia na każdy dzień
+            event["recurrence"] = recurrence
+        return event
 
-        print(f"Dodawanie wydarzenia do kalendarza: {title} na {date}")
+    def execute_batch(self, operations):
+        """Wysyła operacje z kolejki jednym żądaniem batch.
 
-        try:
-            self.service.events().insert(calendarId="primary", body=event).execute()
-            print("Wydarzenie dodane pomyślnie!")
-            return True
-        except Exception as e:
-            print(f"Błąd przy dodawaniu wydarzenia: {e}")
+        Zwraca {id operacji: None albo wyjątek}. Brak połączenia z API
+        zgłasza wyjątek dla całej paczki.
+        """
+        if self.connect() is None:
+            raise CalendarUnavailableError("Brak połączenia z Google Calendar API")
+        results = {}
+
+        def callback(request_id, response, exception):
+            results[request_id] = exception
+
+        batch = self.service.new_batch_http_request(callback=callback)
+        for operation in operations:
+            batch.add(self.request_for(operation), request_id=operation["id"])
+        batch.execute()
+        for operation in operations:
+            if self.is_already_applied(operation, results.get(operation["id"])):
+                # Ponowienie zmiany, która wcześniej doszła (stały identyfikator wydarzenia)
+                results[operation["id"]] = None
+        return results
+
+    def list_changes(self, sync_token=None, page_size=2500):
+        """Generator stron zmian w kalendarzu: (wydarzenia, nextSyncToken albo None).
+
+        Bez sync_token zwraca wszystkie wydarzenia (pełna synchronizacja); z nim
+        tylko zmienione od tamtej chwili, łącznie z usuniętymi (status "cancelled").
+        nextSyncToken przychodzi na ostatniej stronie.
+        """
+        from googleapiclient.errors import HttpError
+        if self.connect() is None:
+            raise CalendarUnavailableError("Brak połączenia z Google Calendar API")
+        page_token = None
+        while True:
+            params = {"calendarId": CALENDAR_ID, "maxResults": page_size}
+            if sync_token is not None:
+                params["syncToken"] = sync_token
+            if page_token is not None:
+                params["pageToken"] = page_token
+            try:
+                response = self.service.events().list(**params).execute()
+            except HttpError as e:
+                if e.resp.status == 410:
+                    raise SyncTokenExpiredError() from e
+                raise
+            page_token = response.get("nextPageToken")
+            yield response.get("items", []), response.get("nextSyncToken")
+            if page_token is None:
+                return
+
+    def request_for(self, operation):
+        events = self.service.events()
+        if operation["kind"] == "insert":
+            body = self.event_body(operation["summary"], operation["date"], operation.get("event_id"),
+                                   operation.get("recurrence"))
+            return events.insert(calendarId=CALENDAR_ID, body=body)
+        if operation["kind"] == "delete":
+            return events.delete(calendarId=CALENDAR_ID, eventId=operation["event_id"])
+        raise ValueError(f"Nieznany rodzaj operacji: {operation['kind']}")
+
+    @staticmethod
+    def is_already_applied(operation, error):
+        from googleapiclient.errors import HttpError
+        if not isinstance(error, HttpError):
             return False
+        if operation["kind"] == "insert":
+            return error.resp.status == 409  # wydarzenie o tym identyfikatorze już istnieje
+        if operation["kind"] == "delete":
+            return error.resp.status in (404, 410)  # już usunięte
+        return False
+
+    @staticmethod
+    def is_retryable(error):
+        from googleapiclient.errors import HttpError
+        if not isinstance(error, HttpError):
+            return True  # błąd sieci
+        status = error.resp.status
+        if status == 403:
+            return any(reason in error.content for reason in RATE_LIMIT_REASONS)
+        return status in RETRYABLE_STATUSES
@@ -1,8 +1,6 @@
 import sys
-from PySide6.QtWidgets import QApplication, QMainWindow, QTabWidget
-from focus_timer import FocusTimer
-# from todocalendar import ToDoCalendar
-from notes import Notes, SimpleObfuscator, ObfuscatedNotesDecorator
+from PySide6.QtWidgets import QApplication, QMainWindow, QTabWidget, QWidget, QVBoxLayout
+from persistence import write_behind
 # from google_calendar_adapter import GoogleCalendarAdapter
 
 class MainApp(QMainWindow):
@@ -16,19 +14,60 @@ class MainApp(QMainWindow):
 
         # self.google_calendar = GoogleCalendarAdapter()
 
+        self.focus_timer_tab = None
+        self.todo_calendar_tab = None
+        self.notes_tab = None
+
+        # Zakładki są budowane przy pierwszym wyświetleniu; do tego czasu w oknie
+        # jest tylko pusta strona, a moduł zakładki nie jest nawet importowany
+        self.tab_factories = [
+            ("Focus Timer", self.create_focus_timer),
+            ("ToDoCalendar", self.create_todo_calendar),
+            ("Notes", self.create_notes),
+        ]
+        self.built_tabs = set()
+        for title, _ in self.tab_factories:
+            page = QWidget()
+            QVBoxLayout(page).setContentsMargins(0, 0, 0, 0)
+            self.tab_widget.addTab(page, title)
+        self.tab_widget.currentChanged.connect(self.build_tab)
+
+        # Jedyny odczyt styles.qss - styl okna obejmuje wszystkie zakładki
+        self.load_stylesheet("styles.qss")
+        self.build_tab(self.tab_widget.currentIndex())
+
+    def build_tab(self, index):
+        if index < 0 or index in self.built_tabs:
+            return
+        self.built_tabs.add(index)
+        _, factory = self.tab_factories[index]
+        self.tab_widget.widget(index).layout().addWidget(factory())
+
+    def create_focus_timer(self):
+        from focus_timer import FocusTimer
         self.focus_timer_tab = FocusTimer()
-        # self.todo_calendar_tab = ToDoCalendar()
+        return self.focus_timer_tab
+
+    def create_todo_calendar(self):
+        from todocalendar import ToDoCalendar
+        self.todo_calendar_tab = ToDoCalendar()
+        return self.todo_calendar_tab
 
+    def create_notes(self):
+        from notes import Notes, SimpleObfuscator, ObfuscatedNotesDecorator
         # Tworzenie podstawowego komponentu notatek i dekorowanie go
         base_notes = Notes()
         obfuscator = SimpleObfuscator(key=123)
         self.notes_tab = ObfuscatedNotesDecorator(base_notes, obfuscator)
+        return self.notes_tab.widget
 
-        self.tab_widget.addTab(self.focus_timer_tab, "Focus Timer")
-        # self.tab_widget.addTab(self.todo_calendar_tab, "ToDoCalendar")
-        self.tab_widget.addTab(self.notes_tab.widget, "Notes")
-
-        self.load_stylesheet("styles.qss")
+    def closeEvent(self, event):
+        if self.notes_tab is not None:
+            self.notes_tab.widget.shutdown()
+        if self.todo_calendar_tab is not None:
+            self.todo_calendar_tab.shutdown()
+        write_behind.flush()
+        super().closeEvent(event)
 
     def load_stylesheet(self, filepath):
         try:
@@ -41,4 +80,4 @@ if __name__ == "__main__":
     app = QApplication(sys.argv)
     window = MainApp()
     window.show()
-    sys.exit(app.exec())
\ No newline at end of file
+    sys.exit(app.exec())
@@ -0,0 +1,302 @@
+from typing import List, Dict, Any, Optional, Callable
+from collections import OrderedDict
+import bisect
+import sys
+import threading
+import uuid
+from datetime import datetime
+from note_store import DATE_FORMAT, parse_date, timestamp_to_date
+
+# Klasy strategii sortowania
+class NoteSortStrategy:
+    # Klucz liczony raz na notatkę i zapamiętywany w SortedNoteIndex; strategia może
+    # też nadpisać tylko sort() - wtedy indeks układa notatki wynikiem sort()
+    reverse = False
+
+    def key(self, note: 'Note') -> Any:
+        raise NotImplementedError
+
+    @property
+    def uses_key(self) -> bool:
+        return type(self).key is not NoteSortStrategy.key
+
+    def sort(self, notes: List['Note']) -> List['Note']:
+        return sorted(notes, key=self.key, reverse=self.reverse)
+
+class SortByDate(NoteSortStrategy):
+    reverse = True
+
+    def key(self, note: 'Note') -> Any:
+        return note.timestamp
+
+
+class SortByTitle(NoteSortStrategy):
+    def key(self, note: 'Note') -> Any:
+        return note.title.casefold()
+
+class SortByCategory(NoteSortStrategy):
+    def key(self, note: 'Note') -> Any:
+        return note.category.casefold()
+
+class SortedNoteIndex:
+    """Notatki utrzymywane w kolejności danej strategii, z zapamiętanymi kluczami.
+
+    Dodanie notatki to wyszukiwanie binarne pozycji zamiast ponownego sortowania.
+    Indeks jest przechowywany rosnąco; dla strategii z reverse=True wiersze są
+    odczytywane od końca.
+    """
+    def __init__(self, strategy: NoteSortStrategy, notes: List['Note']):
+        self.strategy = strategy
+        if not strategy.uses_key:
+            self._sort_without_key(notes)
+            return
+        keys = [strategy.key(note) for note in notes]
+        order = sorted(range(len(notes)), key=keys.__getitem__)
+        self._keys = [keys[i] for i in order]
+        self._notes = [notes[i] for i in order]
+
+    def __len__(self) -> int:
+        return len(self._notes)
+
+    def __getitem__(self, row: int) -> 'Note':
+        if self.strategy.reverse:
+            return self._notes[len(self._notes) - 1 - row]
+        return self._notes[row]
+
+    def insert(self, note: 'Note') -> int:
+        """Wstawia notatkę i zwraca jej wiersz w kolejności strategii"""
+        if not self.strategy.uses_key:
+            self._sort_without_key(self._notes + [note])
+            return self.row_for_position(self._notes.index(note))
+        key = self.strategy.key(note)
+        position = bisect.bisect_right(self._keys, key)
+        self._keys.insert(position, key)
+        self._notes.insert(position, note)
+        return self.row_for_position(position)
+
+    def insert_row(self, note: 'Note') -> int:
+        """Wiersz, który notatka zajmie po wstawieniu"""
+        if not self.strategy.uses_key:
+            return self.strategy.sort(self._notes + [note]).index(note)
+        position = bisect.bisect_right(self._keys, self.strategy.key(note))
+        if self.strategy.reverse:
+            return len(self._notes) - position
+        return position
+
+    def row_for_position(self, position: int) -> int:
+        if self.strategy.reverse:
+            return len(self._notes) - 1 - position
+        return position
+
+    def _sort_without_key(self, notes: List['Note']) -> None:
+        # Bez klucza każda zmiana to pełne sort(); kluczem jest pozycja w jego wyniku
+        ordered = self.strategy.sort(list(notes))
+        if self.strategy.reverse:
+            ordered.reverse()  # przechowujemy tak, żeby __getitem__ oddawał kolejność sort()
+        self._notes = ordered
+        self._keys = list(range(len(ordered)))
+
+class SimpleObfuscator:
+    def __init__(self, key: int):
+        self.key = key
+        # Tablica translacji bajtów - szybka ścieżka dla tekstów ze znakami < 256
+        self._byte_table: Optional[bytes] = bytes(b ^ key for b in range(256)) if 0 <= key < 256 else None
+        # Maska dla jednego znaku w UTF-32 - ścieżka ogólna (XOR na całym buforze)
+        self._word_mask: bytes = key.to_bytes(4, "little")
+
+    def obfuscate(self, text: str) -> str:
+        return self._xor(text)
+
+    def deobfuscate(self, text: str) -> str:
+        return self._xor(text)
+
+    def obfuscate_many(self, texts: List[str]) -> List[str]:
+        return self._xor_many(texts)
+
+    def deobfuscate_many(self, texts: List[str]) -> List[str]:
+        return self._xor_many(texts)
+
+    def _xor(self, text: str) -> str:
+        """XOR każdego kodu znaku z kluczem, wynik identyczny z chr(ord(c) ^ key)"""
+        if self._byte_table is not None:
+            try:
+                return text.encode("latin-1").translate(self._byte_table).decode("latin-1")
+            except UnicodeEncodeError:
+                pass
+        data = text.encode("utf-32-le", "surrogatepass")
+        mask = int.from_bytes(self._word_mask * len(text), "little")
+        xored = (int.from_bytes(data, "little") ^ mask).to_bytes(len(data), "little")
+        return xored.decode("utf-32-le", "surrogatepass")
+
+    def _xor_many(self, texts: List[str]) -> List[str]:
+        # Jeden przebieg po sklejonym buforze, potem cięcie według długości
+        joined = self._xor("".join(texts))
+        result = []
+        start = 0
+        for text in texts:
+            end = start + len(text)
+            result.append(joined[start:end])
+            start = end
+        return result
+
+def new_note_id() -> str:
+    return uuid.uuid4().hex
+
+class Note:
+    # Zwarta reprezentacja dla dużych archiwów: bez __dict__, kategorie internowane
+    # (kilka wartości współdzielonych przez wszystkie notatki), data jako liczba sekund;
+    # raw_date to oryginalny napis tylko dla dat spoza DATE_FORMAT (zwykle None)
+    __slots__ = ("id", "title", "content", "category", "timestamp", "raw_date")
+
+    def __init__(self, title: str, content: str, category: str, date: str, note_id: Optional[str] = None):
+        # Notatki z plików sprzed wprowadzenia identyfikatorów dostają nowy przy wczytaniu
+        self.id = note_id or new_note_id()
+        self.title = title
+        self.content = content
+        self.category = sys.intern(category)
+        self.timestamp, self.raw_date = parse_date(date)
+
+    @property
+    def date(self) -> str:
+        if self.raw_date is not None:
+            return self.raw_date
+        return timestamp_to_date(self.timestamp)
+
+    @date.setter
+    def date(self, value: str) -> None:
+        self.timestamp, self.raw_date = parse_date(value)
+
+    def save_data(self) -> Dict[str, str]:
+        return {
+            "title": self.title,
+            "content": self.content,
+            "category": self.category,
+            "date": self.date,
+            "id": self.id
+        }
+
+class NoteBodyCache:
+    """Cache LRU odkodowanych treści notatek, ograniczony rozmiarem w bajtach.
+
+    Czytany z wątku UI i z wątku budującego indeks wyszukiwania, więc zmiany są pod blokadą.
+    """
+    def __init__(self, decode: Callable[[str], str], max_bytes: int = 8 * 1024 * 1024):
+        self._decode = decode
+        self.max_bytes = max_bytes
+        self.size = 0
+        self._entries: "OrderedDict[str, str]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, raw: str) -> str:
+        with self._lock:
+            text = self._entries.get(raw)
+            if text is not None:
+                self._entries.move_to_end(raw)
+                return text
+        text = self._decode(raw)
+        text_size = sys.getsizeof(text)
+        if text_size > self.max_bytes:
+            return text
+        with self._lock:
+            if raw in self._entries:
+                return text
+            self._entries[raw] = text
+            self.size += text_size
+            while self.size > self.max_bytes:
+                _, evicted = self._entries.popitem(last=False)
+                self.size -= sys.getsizeof(evicted)
+        return text
+
+class LazyNote(Note):
+    """Notatka, której treść jest odkodowywana dopiero przy otwarciu"""
+    __slots__ = ("raw_content", "_content", "_body_cache")
+
+    def __init__(self, title: str, raw_content: str, category: str, date: str, body_cache: NoteBodyCache,
+                 note_id: Optional[str] = None):
+        self.id = note_id or new_note_id()
+        self._body_cache = body_cache
+        self.raw_content: Optional[str] = raw_content
+        self._content = ""
+        self.title = title
+        self.category = sys.intern(category)
+        self.timestamp, self.raw_date = parse_date(date)
+
+    @property
+    def content(self) -> str:
+        if self.raw_content is None:
+            return self._content
+        return self._body_cache.get(self.raw_content)
+
+    @content.setter
+    def content(self, value: str) -> None:
+        self.raw_content = None
+        self._content = value
+
+class NoteFactory:
+    @staticmethod
+    def create_note(category: str, title: str, content: str) -> Note:
+        current_date = datetime.now().strftime(DATE_FORMAT)
+        return Note(title, content, category, current_date, new_note_id())
+
+class NoteCodec:
+    """Rekordy z notes.json <-> notatki; zapis jawny"""
+    def note_from_record(self, data: Dict[str, str]) -> Note:
+        return Note(
+            data['title'],
+            data['content'],
+            data.get('category', 'Nauka'),
+            data.get('date', datetime.now().strftime(DATE_FORMAT)),
+            data.get('id')
+        )
+
+    def notes_from_records(self, records: List[Dict[str, str]]) -> List[Note]:
+        return [self.note_from_record(data) for data in records]
+
+    def encode_notes(self, notes: List[Note]) -> List[Dict[str, str]]:
+        return [note.save_data() for note in notes]
+
+class ObfuscatedNoteCodec(NoteCodec):
+    """Zapis zakodowany SimpleObfuscator; treść odkodowywana dopiero przy otwarciu notatki"""
+    def __init__(self, obfuscator: SimpleObfuscator, body_cache_bytes: int = 8 * 1024 * 1024):
+        self.obfuscator = obfuscator
+        self.body_cache = NoteBodyCache(obfuscator.deobfuscate, body_cache_bytes)
+
+    # Wersje wsadowe - wszystkie pola wszystkich notatek kodowane jednym przebiegiem
+    def obfuscate_records(self, records: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        return self.transform_records(records, self.obfuscator.obfuscate_many)
+
+    def deobfuscate_records(self, records: List[Dict[str, str]]) -> List[Dict[str, str]]:
+        return self.transform_records(records, self.obfuscator.deobfuscate_many)
+
+    @staticmethod
+    def transform_records(records: List[Dict[str, str]], transform,
+                          fields=("title", "content", "category", "date")) -> List[Dict[str, str]]:
+        values = iter(transform([record[field] for record in records for field in fields]))
+        return [{field: next(values) for field in fields} for _ in records]
+
+    # Przy starcie odkodowujemy tylko nagłówki (tytuł, kategoria, data),
+    # treść pozostaje zakodowana do momentu otwarcia notatki
+    def notes_from_records(self, records: List[Dict[str, str]]) -> List[Note]:
+        headers = self.transform_records(records, self.obfuscator.deobfuscate_many,
+                                         fields=("title", "category", "date"))
+        return [
+            LazyNote(header["title"], record["content"], header["category"], header["date"], self.body_cache,
+                     record.get("id"))
+            for header, record in zip(headers, records)
+        ]
+
+    def encode_notes(self, notes: List[Note]) -> List[Dict[str, str]]:
+        # Treści, które nie były edytowane, zapisujemy w postaci już zakodowanej
+        raw_contents = [getattr(note, "raw_content", None) for note in notes]
+        notes_data = [
+            {"title": note.title, "content": note.content if raw is None else "",
+             "category": note.category, "date": note.date}
+            for note, raw in zip(notes, raw_contents)
+        ]
+        encoded = self.obfuscate_records(notes_data)
+        for note, data, raw in zip(notes, encoded, raw_contents):
+            if raw is not None:
+                data["content"] = raw
+            # Identyfikator jest losowy i nie niesie treści - zapisujemy go jawnie
+            data["id"] = note.id
+        return encoded
@@ -0,0 +1,189 @@
+import base64
+import bisect
+import json
+import re
+import sys
+from array import array
+from typing import Callable, Dict, Iterable, List, Optional, Set, Tuple
+
+from note_store import date_to_timestamp
+from persistence import atomic_write_json
+
+TOKEN_RE = re.compile(r"\w+")
+DATE_FILTER_RE = re.compile(r"\b(from|to):(\d{4}-\d{2}-\d{2})")
+INDEX_VERSION = 2
+
+
+def tokenize(text: str) -> List[str]:
+    return TOKEN_RE.findall(text.casefold())
+
+
+def parse_query(query: str) -> Tuple[str, Optional[str], Optional[str]]:
+    """Wydziela z zapytania filtry "from:YYYY-MM-DD" i "to:YYYY-MM-DD" """
+    filters = dict(DATE_FILTER_RE.findall(query))
+    return DATE_FILTER_RE.sub(" ", query), filters.get("from"), filters.get("to")
+
+
+def _identity_many(texts: List[str]) -> List[str]:
+    return list(texts)
+
+
+class NoteSearchIndex:
+    """Odwrócony indeks notatek: słowa z tytułu i treści, kategoria, zakres dat.
+
+    Zapisywany obok notes.json, żeby po starcie indeksować tylko notatki, których
+    w nim jeszcze nie ma. Słowa w pliku przechodzą przez encode_many (np. XOR
+    z SimpleObfuscator), więc indeks nie zawiera jawnego tekstu notatek.
+    Notatki są w indeksie reprezentowane numerami, a listy wystąpień słów
+    tablicami liczb, zapisywanymi do pliku jednym blokiem binarnym.
+    """
+
+    def __init__(self, path: str,
+                 encode_many: Callable[[List[str]], List[str]] = _identity_many,
+                 decode_many: Callable[[List[str]], List[str]] = _identity_many):
+        self.path = path
+        self._encode_many = encode_many
+        self._decode_many = decode_many
+        self.is_built = False
+        self.dirty = False
+        self._ids: List[str] = []  # numer notatki -> identyfikator
+        self._numbers: Dict[str, int] = {}  # identyfikator -> numer
+        self._postings: Dict[str, array] = {}
+        self._vocabulary: List[str] = []  # posortowany - wyszukiwanie po prefiksie
+        self._categories: Dict[str, Set[int]] = {}
+        self._dates: List[Tuple[int, int]] = []  # posortowane pary (znacznik czasu, numer)
+
+    def __contains__(self, note_id: str) -> bool:
+        return note_id in self._numbers
+
+    def empty_copy(self) -> "NoteSearchIndex":
+        """Niezbudowany indeks z tym samym plikiem i kodowaniem słów (np. do budowy w tle)"""
+        return NoteSearchIndex(self.path, self._encode_many, self._decode_many)
+
+    def build(self, notes: Iterable, interrupted: Callable[[], bool] = lambda: False) -> None:
+        """Wczytuje zapisany indeks i dopisuje do niego brakujące notatki.
+
+        interrupted jest sprawdzane co kilkaset notatek; przerwana budowa
+        zostawia indeks niezbudowany (is_built False).
+        """
+        notes = list(notes)
+        self._load()
+        if not self._numbers.keys() <= {note.id for note in notes}:
+            # Indeks nie pasuje do pliku notatek (np. podmieniony notes.json) - budujemy od nowa
+            self._reset_terms()
+        self._categories = {}
+        self._dates = []
+        for position, note in enumerate(notes):
+            if position % 512 == 0 and interrupted():
+                return
+            number = self._numbers.get(note.id)
+            if number is None:
+                number = self._add_terms(note)
+                self.dirty = True
+            self._categories.setdefault(note.category, set()).add(number)
+            self._dates.append((note.timestamp, number))
+        self._dates.sort()
+        self._vocabulary = sorted(self._postings)
+        self.is_built = True
+
+    def add(self, note) -> None:
+        new_terms: List[str] = []
+        number = self._add_terms(note, new_terms)
+        for term in new_terms:
+            bisect.insort(self._vocabulary, term)
+        self._categories.setdefault(note.category, set()).add(number)
+        bisect.insort(self._dates, (note.timestamp, number))
+        self.dirty = True
+
+    def search(self, query: str = "", category: Optional[str] = None,
+               date_from: Optional[str] = None, date_to: Optional[str] = None) -> Optional[Set[str]]:
+        """Zwraca identyfikatory pasujących notatek albo None, gdy nie ma żadnego kryterium.
+
+        Każde słowo zapytania dopasowuje słowa indeksu zaczynające się od niego
+        (wyszukiwanie w trakcie pisania). Daty w formacie "YYYY-MM-DD", włącznie.
+        """
+        candidates: List[Set[int]] = []
+        for token in set(tokenize(query)):
+            candidates.append(self._match_prefix(token))
+        if category:
+            candidates.append(self._categories.get(category, set()))
+        if date_from or date_to:
+            start = date_to_timestamp((date_from or "1970-01-01") + " 00:00:00")
+            end = date_to_timestamp((date_to or "9999-12-31") + " 23:59:59")
+            low = bisect.bisect_left(self._dates, (start,))
+            high = bisect.bisect_right(self._dates, (end, sys.maxsize))
+            candidates.append({number for _, number in self._dates[low:high]})
+        if not candidates:
+            return None
+        candidates.sort(key=len)
+        result = set(candidates[0])
+        for numbers in candidates[1:]:
+            result &= numbers
+            if not result:
+                break
+        return set(map(self._ids.__getitem__, result))
+
+    def save(self) -> None:
+        if not self.dirty:
+            return
+        terms = list(self._postings)
+        postings = array("i")
+        for term in terms:
+            postings.extend(self._postings[term])
+        if sys.byteorder == "big":
+            postings.byteswap()
+        data = {
+            "version": INDEX_VERSION,
+            "ids": self._ids,
+            "terms": self._encode_many(terms),
+            "lengths": [len(self._postings[term]) for term in terms],
+            "postings": base64.b64encode(postings.tobytes()).decode("ascii"),
+        }
+        atomic_write_json(self.path, data, separators=(",", ":"))
+        self.dirty = False
+
+    def _match_prefix(self, prefix: str) -> Set[int]:
+        vocabulary = self._vocabulary
+        start = end = bisect.bisect_left(vocabulary, prefix)
+        while end < len(vocabulary) and vocabulary[end].startswith(prefix):
+            end += 1
+        postings = self._postings
+        return set().union(*[postings[term] for term in vocabulary[start:end]])
+
+    def _add_terms(self, note, new_terms: Optional[List[str]] = None) -> int:
+        number = len(self._ids)
+        self._ids.append(note.id)
+        self._numbers[note.id] = number
+        postings = self._postings
+        for term in set(tokenize(note.title)) | set(tokenize(note.content)):
+            numbers = postings.get(term)
+            if numbers is None:
+                numbers = postings[term] = array("i")
+                if new_terms is not None:
+                    new_terms.append(term)
+            numbers.append(number)
+        return number
+
+    def _reset_terms(self) -> None:
+        self._ids = []
+        self._numbers = {}
+        self._postings = {}
+
+    def _load(self) -> None:
+        self._reset_terms()
+        try:
+            with open(self.path, "r") as file:
+                data = json.load(file)
+        except (FileNotFoundError, json.JSONDecodeError):
+            return
+        if data.get("version") != INDEX_VERSION:
+            return
+        postings = array("i", base64.b64decode(data["postings"]))
+        if sys.byteorder == "big":
+            postings.byteswap()
+        self._ids = data["ids"]
+        self._numbers = {note_id: number for number, note_id in enumerate(self._ids)}
+        start = 0
+        for term, length in zip(self._decode_many(data["terms"]), data["lengths"]):
+            self._postings[term] = postings[start:start + length]
+            start += length
@@ -0,0 +1,261 @@
+import json
+import os
+import shutil
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, IO, Iterator, List, Optional, Tuple
+
+from persistence import append_line, end_partial_line
+
+Record = Dict[str, Any]
+
+DATE_FORMAT = "%Y-%m-%d %H:%M:%S"
+_EPOCH = datetime(1970, 1, 1)
+_SECOND = timedelta(seconds=1)
+
+
+def date_to_timestamp(date: str) -> int:
+    """Data notatki w formacie DATE_FORMAT jako liczba sekund od 1970-01-01.
+
+    Czas lokalny traktujemy jak UTC (bez stref i zmian czasu), więc konwersja
+    w obie strony zawsze odtwarza ten sam napis.
+    """
+    return parse_date(date)[0]
+
+
+def parse_date(date: str) -> Tuple[int, Optional[str]]:
+    """(liczba sekund, napis do zachowania) - drugi element to None, gdy timestamp_to_date odtworzy date.
+
+    Daty w innym zapisie (mikrosekundy, separator "T", strefa) albo nieczytelne
+    zachowujemy w oryginale, żeby zapis notatki ich nie zmieniał.
+    """
+    try:
+        parsed = datetime.fromisoformat(date)
+    except ValueError:
+        # Uszkodzona data w pliku - do sortowania początek osi czasu zamiast blokować wczytanie
+        return 0, date
+    timestamp = (parsed.replace(tzinfo=None) - _EPOCH) // _SECOND
+    # Bez mikrosekund i strefy isoformat(" ") to dokładnie DATE_FORMAT
+    if parsed.microsecond or parsed.tzinfo is not None or parsed.isoformat(" ") != date:
+        return timestamp, date
+    return timestamp, None
+
+
+def timestamp_to_date(timestamp: int) -> str:
+    return (_EPOCH + timedelta(seconds=timestamp)).strftime(DATE_FORMAT)
+
+_WHITESPACE = " \t\n\r"
+
+
+def iter_json_array(file: IO[str], chunk_size: int = 64 * 1024) -> Iterator[Any]:
+    """Parsuje tablicę JSON z pliku element po elemencie, bez wczytywania całości"""
+    decoder = json.JSONDecoder()
+    buffer = ""
+    pos = 0
+    eof = False
+    read_size = chunk_size
+    in_array = False
+    while True:
+        while pos < len(buffer) and (buffer[pos] in _WHITESPACE or (in_array and buffer[pos] == ",")):
+            pos += 1
+        if pos >= len(buffer) and not eof:
+            chunk = file.read(read_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            continue
+        if not in_array:
+            if buffer[pos:pos + 1] != "[":
+                raise json.JSONDecodeError("Expecting '['", buffer, pos)
+            in_array = True
+            pos += 1
+            continue
+        if pos >= len(buffer):
+            raise json.JSONDecodeError("Unterminated array", buffer, pos)
+        if buffer[pos] == "]":
+            return
+        try:
+            value, end = decoder.raw_decode(buffer, pos)
+            # Element jest pełny dopiero, gdy widać za nim separator (liczba "1.5e10"
+            # ucięta na "1.5e" też parsuje się poprawnie)
+            after = end
+            while after < len(buffer) and buffer[after] in _WHITESPACE:
+                after += 1
+            complete = eof or (after < len(buffer) and buffer[after] in ",]")
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            complete = False
+        if not complete:
+            # Element przecięty granicą porcji - doczytujemy; rozmiar rośnie
+            # geometrycznie, żeby bardzo duże notatki nie były parsowane wielokrotnie
+            chunk = file.read(read_size)
+            eof = not chunk
+            buffer, pos = buffer[pos:] + chunk, 0
+            read_size *= 2
+            continue
+        read_size = chunk_size
+        yield value
+        pos = end
+
+
+class NoteJournal:
+    """Magazyn notatek w strukturze logu: snapshot (notes.json) + dziennik dopisywanych rekordów.
+
+    Pliki obok snapshotu:
+      <plik>.log             - rekordy dopisywane przy każdym zapisie (jedna linia JSON na rekord)
+      <plik>.log.compacting  - zamrożona część dziennika w trakcie kompaktowania
+      <plik>.tmp             - nowy snapshot w trakcie zapisu
+
+    Usunięcie zamrożonego dziennika jest punktem zatwierdzenia kompaktowania,
+    więc po awarii w dowolnym momencie odczyt odtwarza spójny stan.
+    """
+
+    def __init__(self, snapshot_path: str, compact_threshold: int = 1024 * 1024):
+        self.snapshot_path = snapshot_path
+        self.log_path = snapshot_path + ".log"
+        self.frozen_log_path = snapshot_path + ".log.compacting"
+        self.tmp_path = snapshot_path + ".tmp"
+        self.compact_threshold = compact_threshold
+        self._lock = threading.Lock()
+        self._compaction: Optional[threading.Thread] = None
+
+    def load(self) -> List[Record]:
+        """Odtwarza stan: snapshot + zamrożony dziennik + bieżący dziennik"""
+        records = []
+        for batch, _, _ in self.iter_batches():
+            records.extend(batch)
+        return records
+
+    def iter_batches(self, batch_size: int = 2000) -> Iterator[Tuple[List[Record], int, int]]:
+        """Strumieniowo odtwarza stan porcjami: (rekordy, przeczytane bajty, rozmiar snapshotu).
+
+        Dzienniki są małe (ograniczone progiem kompaktowania), więc wczytujemy je
+        od razu; rekord z identyfikatorem obecnym w snapshocie zastępuje jego wersję.
+        """
+        self.wait()
+        self._recover()
+        log_records: List[Record] = []
+        updates: Dict[str, Record] = {}
+        for record in self._read_log(self.frozen_log_path) + self._read_log(self.log_path):
+            record_id = record.get("id")
+            if record_id is None:
+                log_records.append(record)
+            else:
+                if record_id not in updates:
+                    log_records.append(record)
+                updates[record_id] = record
+
+        total = os.path.getsize(self.snapshot_path) if os.path.exists(self.snapshot_path) else 0
+        batch: List[Record] = []
+        if total:
+            with open(self.snapshot_path, "r") as file:
+                for record in iter_json_array(file):
+                    record_id = record.get("id")
+                    if record_id in updates:
+                        record = updates.pop(record_id)
+                    batch.append(record)
+                    if len(batch) >= batch_size:
+                        yield batch, file.buffer.tell(), total
+                        batch = []
+        for record in log_records:
+            record_id = record.get("id")
+            if record_id is not None:
+                if record_id not in updates:
+                    continue  # już zastąpił rekord ze snapshotu
+                record = updates.pop(record_id)
+            batch.append(record)
+            if len(batch) >= batch_size:
+                yield batch, total, total
+                batch = []
+        if batch:
+            yield batch, total, total
+
+    def append(self, record: Record) -> bool:
+        """Dopisuje rekord w czasie O(1); zwraca True, gdy dziennik przekroczył próg kompaktowania"""
+        line = json.dumps(record) + "\n"
+        with self._lock:
+            size = append_line(self.log_path, line)
+        return size >= self.compact_threshold
+
+    def compact_in_background(self, produce_snapshot: Callable[[], List[Record]]) -> None:
+        """Składa dziennik w snapshot w wątku roboczym.
+
+        produce_snapshot jest wywoływane w wątku roboczym i musi zwracać stan
+        z chwili wywołania tej metody (np. operować na kopii listy notatek).
+        """
+        with self._lock:
+            if self._compaction is not None and self._compaction.is_alive():
+                return
+            self._freeze_log()
+            self._compaction = threading.Thread(
+                target=self._compact, args=(produce_snapshot,), daemon=True
+            )
+            self._compaction.start()
+
+    def save_in_background(self, produce_snapshot: Callable[[], List[Record]]) -> None:
+        """Pełny zapis poza wątkiem UI; czeka tylko, jeśli trwa poprzednie kompaktowanie"""
+        self.wait()
+        self.compact_in_background(produce_snapshot)
+
+    def write_snapshot(self, records: List[Record]) -> None:
+        """Pełny, synchroniczny zapis wszystkich rekordów (np. po migracji danych)"""
+        self.wait()
+        with self._lock:
+            self._freeze_log()
+        self._compact(lambda: records)
+
+    def wait(self) -> None:
+        """Czeka na zakończenie trwającego kompaktowania"""
+        compaction = self._compaction
+        if compaction is not None:
+            compaction.join()
+
+    def _freeze_log(self) -> None:
+        # Znacznik zamrożonego dziennika istnieje zawsze, nawet pusty - bez niego
+        # niedokończony plik .tmp mógłby zostać uznany za gotowy snapshot
+        if not os.path.exists(self.log_path):
+            open(self.frozen_log_path, "a").close()
+        elif os.path.exists(self.frozen_log_path):
+            # Zamrożony dziennik z kompaktowania przerwanego awarią - jego rekordy nie są
+            # jeszcze w snapshocie, więc dopisujemy do niego bieżący zamiast go nadpisać
+            with open(self.frozen_log_path, "ab+") as target:
+                end_partial_line(target)
+                with open(self.log_path, "rb") as source:
+                    shutil.copyfileobj(source, target)
+            os.remove(self.log_path)
+        else:
+            os.replace(self.log_path, self.frozen_log_path)
+
+    def _compact(self, produce_snapshot: Callable[[], List[Record]]) -> None:
+        records = produce_snapshot()
+        with open(self.tmp_path, "w") as file:
+            json.dump(records, file, indent=4)
+            file.flush()
+            os.fsync(file.fileno())
+        os.remove(self.frozen_log_path)  # punkt zatwierdzenia
+        os.replace(self.tmp_path, self.snapshot_path)
+
+    def _recover(self) -> None:
+        if not os.path.exists(self.tmp_path):
+            return
+        if os.path.exists(self.frozen_log_path):
+            # Kompaktowanie przerwane przed zatwierdzeniem - snapshot .tmp może być niepełny
+            os.remove(self.tmp_path)
+        else:
+            # Zatwierdzone, ale nie podmienione
+            os.replace(self.tmp_path, self.snapshot_path)
+
+    @staticmethod
+    def _read_log(path: str) -> List[Record]:
+        records = []
+        try:
+            with open(path, "r") as file:
+                for line in file:
+                    try:
+                        records.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # Urwany ostatni wpis po awarii - pomijamy
+                        continue
+        except FileNotFoundError:
+            pass
+        return records
@@ -1,11 +1,17 @@
-from typing import List, Dict, Any, Optional
+from typing import List, Dict, Any, Optional, Callable, Sequence
 import json
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLabel, QLineEdit,
-    QPushButton, QTextEdit, QMessageBox, QListWidget, QListWidgetItem, QComboBox
+    QPushButton, QTextEdit, QMessageBox, QListView, QComboBox, QProgressBar
 )
-from datetime import datetime
-from abc import ABC, abstractmethod
+from PySide6.QtCore import Qt, QAbstractListModel, QModelIndex, QTimer, QThread, Signal
+from note_store import NoteJournal
+# Notatki, sortowanie i kodowanie nie zależą od Qt - widżety poniżej tylko je opakowują
+from note_model import (
+    Note, NoteFactory, NoteCodec, ObfuscatedNoteCodec,
+    NoteSortStrategy, SortByDate, SortByTitle, SortByCategory, SortedNoteIndex, SimpleObfuscator
+)
+from note_search import NoteSearchIndex, parse_query
 
 # Interfejs dla notatek
 class NotesInterface:
@@ -19,54 +25,86 @@ class NotesInterface:
     def save_note(self) -> None:
         pass
 
-# Klasy strategii sortowania
-class NoteSortStrategy:
-    def sort(self, notes: List['Note']) -> List['Note']:
+    def append_note(self, note: Any) -> None:
         pass
 
-class SortByDate(NoteSortStrategy):
-    def sort(self, notes: List['Note']) -> List['Note']:
-        return sorted(notes, key=lambda note: note.date, reverse=True)
-
-
-class SortByTitle(NoteSortStrategy):
-    def sort(self, notes: List['Note']) -> List['Note']:
-        return sorted(notes, key=lambda note: note.title.lower())
-
-class SortByCategory(NoteSortStrategy):
-    def sort(self, notes: List['Note']) -> List['Note']:
-        return sorted(notes, key=lambda note: note.category.lower())
-
-class SimpleObfuscator:
-    def __init__(self, key: int):
-        self.key = key
-
-    def obfuscate(self, text: str) -> str:
-        return ''.join(chr(ord(c) ^ self.key) for c in text)
-
-    def deobfuscate(self, text: str) -> str:
-        return ''.join(chr(ord(c) ^ self.key) for c in text)
-
-class Note:
-    def __init__(self, title: str, content: str, category: str, date: str):
-        self.title = title
-        self.content = content
-        self.category = category
-        self.date = date
-
-    def save_data(self) -> Dict[str, str]:
-        return {
-            "title": self.title,
-            "content": self.content,
-            "category": self.category,
-            "date": self.date
-        }
-
-class NoteFactory:
-    @staticmethod
-    def create_note(category: str, title: str, content: str) -> Note:
-        current_date = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-        return Note(title, content, category, current_date)
+class NotesListModel(QAbstractListModel):
+    """Model listy notatek - widok tworzy tylko widoczne wiersze"""
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._notes: Sequence[Note] = []
+
+    def rowCount(self, parent=QModelIndex()) -> int:
+        return 0 if parent.isValid() else len(self._notes)
+
+    def data(self, index: QModelIndex, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        note = self._notes[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return f"{note.title} ({note.category}) - {note.date}"
+        if role == Qt.ItemDataRole.UserRole:
+            return note.id
+        return None
+
+    def displayed_notes(self) -> Sequence[Note]:
+        return self._notes
+
+    def set_notes(self, notes: Sequence[Note]) -> None:
+        self.beginResetModel()
+        self._notes = notes
+        self.endResetModel()
+
+    def append_notes(self, notes: List[Note]) -> None:
+        # Wymaga, żeby model wyświetlał listę, do której dopisujemy (Notes.notes w trakcie wczytywania)
+        first = len(self._notes)
+        self.beginInsertRows(QModelIndex(), first, first + len(notes) - 1)
+        self._notes.extend(notes)
+        self.endInsertRows()
+
+    def insert_note(self, note: Note) -> None:
+        # Wymaga, żeby model wyświetlał SortedNoteIndex
+        row = self._notes.insert_row(note)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._notes.insert(note)
+        self.endInsertRows()
+
+class NoteLoader(QThread):
+    """Wczytuje notatki strumieniowo w wątku roboczym i przekazuje je porcjami"""
+    batch_loaded = Signal(list)
+    progress = Signal(int)
+
+    def __init__(self, journal: NoteJournal, notes_from_records: Callable[[List[Dict[str, str]]], List['Note']],
+                 batch_size: int = 2000, parent=None):
+        super().__init__(parent)
+        self._journal = journal
+        self._notes_from_records = notes_from_records
+        self._batch_size = batch_size
+        self.missing_ids = False
+
+    def run(self) -> None:
+        try:
+            for records, done, total in self._journal.iter_batches(self._batch_size):
+                if self.isInterruptionRequested():
+                    return
+                if not self.missing_ids and any("id" not in record for record in records):
+                    self.missing_ids = True
+                self.batch_loaded.emit(self._notes_from_records(records))
+                self.progress.emit(done * 100 // total if total else 100)
+        except json.JSONDecodeError:
+            pass
+
+class SearchIndexBuilder(QThread):
+    """Buduje indeks wyszukiwania (odkodowanie i tokenizacja treści, zapis pliku) w wątku roboczym"""
+    def __init__(self, index: NoteSearchIndex, notes: List[Note], parent=None):
+        super().__init__(parent)
+        self.index = index
+        self._notes = notes
+
+    def run(self) -> None:
+        self.index.build(self._notes, self.isInterruptionRequested)
+        if self.index.is_built:
+            self.index.save()
 
 class Notes(QWidget, NotesInterface):
     def __init__(self):
@@ -75,7 +113,16 @@ class Notes(QWidget, NotesInterface):
         self.setGeometry(100, 100, 800, 500)
 
         self.json_file: str = "notes.json"
-        self.notes: List[Note] = self.load_notes()
+        self.journal = NoteJournal(self.json_file)
+        self.codec: NoteCodec = NoteCodec()
+        self.search_index = NoteSearchIndex(self.json_file + ".idx")
+        self.notes: List[Note] = []
+        self.notes_by_id: Dict[str, Note] = {}
+        self.sorted_indexes: Dict[type, SortedNoteIndex] = {}
+        self.loader: Optional[NoteLoader] = None
+        self.index_builder: Optional[SearchIndexBuilder] = None
+        self.loading = False
+        self._save_after_load = False
         self.sort_strategy: NoteSortStrategy = SortByDate()  # Domyślna strategia
 
         main_layout = QHBoxLayout()
@@ -115,12 +162,41 @@ class Notes(QWidget, NotesInterface):
         main_layout.addLayout(input_layout, 2)
 
         # Prawy panel
-        self.notes_list = QListWidget()
-        self.notes_list.itemClicked.connect(self.load_note)
-        main_layout.addWidget(self.notes_list, 1)
+        list_layout = QVBoxLayout()
+
+        search_layout = QHBoxLayout()
+        self.search_input = QLineEdit(self)
+        self.search_input.setPlaceholderText("Search... (from:YYYY-MM-DD to:YYYY-MM-DD)")
+        self.search_input.textChanged.connect(self.refresh_notes_list)
+        search_layout.addWidget(self.search_input, 2)
+
+        self.search_category = QComboBox(self)
+        self.search_category.addItems(["All categories", "Nauka", "Praca", "Kodowanie", "Zadania"])
+        self.search_category.currentTextChanged.connect(self.refresh_notes_list)
+        search_layout.addWidget(self.search_category, 1)
+        list_layout.addLayout(search_layout)
+
+        self.loading_bar = QProgressBar(self)
+        self.loading_bar.setRange(0, 100)
+        self.loading_bar.setFormat("Loading notes... %p%")
+        self.loading_bar.hide()
+        list_layout.addWidget(self.loading_bar)
+
+        self.notes_model = NotesListModel(self)
+        self.notes_list = QListView()
+        self.notes_list.setUniformItemSizes(True)
+        # Układ wierszy liczony porcjami w pętli zdarzeń - lista jest interaktywna od razu
+        self.notes_list.setLayoutMode(QListView.LayoutMode.Batched)
+        self.notes_list.setBatchSize(1000)
+        self.notes_list.setModel(self.notes_model)
+        self.notes_list.clicked.connect(self.load_note)
+        list_layout.addWidget(self.notes_list)
+        main_layout.addLayout(list_layout, 1)
 
         self.setLayout(main_layout)
         self.refresh_notes_list()
+        # Wczytywanie startuje po pętli zdarzeń, gdy dekorator zdążył już podmienić kodowanie
+        QTimer.singleShot(0, self.load_notes_async)
 
     def change_sort_strategy(self, strategy_name: str) -> None:
         if strategy_name == "Sort by Date":
@@ -131,28 +207,98 @@ class Notes(QWidget, NotesInterface):
             self.sort_strategy = SortByCategory()
 
     def apply_sort(self) -> None:
-        self.notes = self.sort_strategy.sort(self.notes)
         self.refresh_notes_list()
 
+    def set_notes(self, notes: List[Note]) -> None:
+        self.notes = notes
+        self.notes_by_id = {note.id: note for note in notes}
+        self.sorted_indexes = {}
+
+    def sorted_index(self) -> SortedNoteIndex:
+        # Indeks dla strategii budowany przy pierwszym użyciu, potem tylko aktualizowany
+        index = self.sorted_indexes.get(type(self.sort_strategy))
+        if index is None:
+            index = SortedNoteIndex(self.sort_strategy, self.notes)
+            self.sorted_indexes[type(self.sort_strategy)] = index
+        return index
+
+    def load_notes_async(self) -> None:
+        self.loading = True
+        self.sorted_indexes = {}
+        self.refresh_notes_list()
+        self.loading_bar.setValue(0)
+        self.loading_bar.show()
+        self.loader = NoteLoader(self.journal, self.notes_from_records, parent=self)
+        self.loader.batch_loaded.connect(self.add_loaded_notes)
+        self.loader.progress.connect(self.loading_bar.setValue)
+        self.loader.finished.connect(self.on_notes_loaded)
+        self.loader.start()
+
+    def add_loaded_notes(self, notes: List[Note]) -> None:
+        # Notatki zapisane w trakcie wczytywania wracają też z dziennika - pomijamy je
+        notes = [note for note in notes if note.id not in self.notes_by_id]
+        if not notes:
+            return
+        self.notes_by_id.update((note.id, note) for note in notes)
+        # Koszt porcji zależy tylko od jej rozmiaru: wiersze dopisujemy na końcu listy
+        if self.notes_model.displayed_notes() is self.notes:
+            self.notes_model.append_notes(notes)
+        else:
+            self.notes.extend(notes)
+
+    def on_notes_loaded(self) -> None:
+        # Wywoływane po wszystkich porcjach z kolejki zdarzeń - self.notes to już całe archiwum
+        self.loading = False
+        self.loading_bar.hide()
+        if self.loader.isInterruptionRequested():
+            return
+        # Indeks sortowania budujemy raz, dla całego archiwum
+        self.refresh_notes_list()
+        # Migracja utrwala nadane identyfikatory, żeby były stabilne między uruchomieniami;
+        # zapis odłożony w trakcie wczytywania wykonujemy teraz
+        if self.loader.missing_ids or self._save_after_load:
+            self._save_after_load = False
+            self.save_notes()
+        self.build_search_index()
+
+    def notes_from_records(self, records: List[Dict[str, str]]) -> List[Note]:
+        return self.codec.notes_from_records(records)
+
     def load_notes(self) -> List[Note]:
+        """Synchroniczne wczytanie całego archiwum (zakładka wczytuje je w tle - load_notes_async)"""
         try:
-            with open(self.json_file, "r") as file:
-                data = json.load(file)
-                return [self.create_note_from_data(note_data) for note_data in data]
-        except (FileNotFoundError, json.JSONDecodeError):
-            return []
+            records = self.journal.load()
+        except json.JSONDecodeError:
+            records = []
+        self.set_notes(self.notes_from_records(records))
+        if any("id" not in record for record in records):
+            # Migracja: utrwalamy nadane identyfikatory, żeby były stabilne między uruchomieniami
+            self.save_notes()
+        self.refresh_notes_list()
+        return self.notes
 
     def create_note_from_data(self, data: Dict[str, str]) -> Note:
-        return Note(
-            data['title'],
-            data['content'],
-            data.get('category', 'Nauka'),
-            data.get('date', datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
-        )
+        return self.codec.note_from_record(data)
 
     def save_notes(self) -> None:
-        with open(self.json_file, "w") as file:
-            json.dump([note.save_data() for note in self.notes], file, indent=4)
+        if self.loading:
+            # Snapshot z części archiwum zastąpiłby notes.json - zapis po wczytaniu (on_notes_loaded)
+            self._save_after_load = True
+            return
+        notes = list(self.notes)
+        self.journal.save_in_background(lambda: self.codec.encode_notes(notes))
+
+    def append_note(self, note: Note) -> None:
+        # Zapis pojedynczej notatki to dopisanie rekordu do dziennika, niezależnie od liczby notatek
+        self.notes.append(note)
+        self.notes_by_id[note.id] = note
+        if self.journal.append(self.codec.encode_notes([note])[0]):
+            if self.loading:
+                # Rekord jest już w dzienniku; kompaktujemy dopiero pełne archiwum
+                self._save_after_load = True
+                return
+            notes = list(self.notes)
+            self.journal.compact_in_background(lambda: self.codec.encode_notes(notes))
 
     def save_note(self) -> None:
         title = self.note_title.text().strip()
@@ -161,88 +307,113 @@ class Notes(QWidget, NotesInterface):
 
         if title and content:
             note = NoteFactory.create_note(category, title, content)
-            self.notes.append(note)
-            self.save_notes()
+            self.append_note(note)
             self.note_title.clear()
             self.note_content.clear()
-            self.refresh_notes_list()
+            self.on_note_added(note)
             QMessageBox.information(self, "Success", "Note saved successfully!")
         else:
             QMessageBox.warning(self, "Warning", "Both title and content are required to save a note.")
 
     def refresh_notes_list(self) -> None:
-        self.notes_list.clear()
-        sorted_notes = self.sort_strategy.sort(self.notes)
-        for note in sorted_notes:
-            item = QListWidgetItem(f"{note.title} ({note.category}) - {note.date}")
-            self.notes_list.addItem(item)
-
-    def load_note(self, item: QListWidgetItem) -> None:
+        found_ids = self.search_notes()
+        if found_ids is None and self.loading:
+            # W trakcie wczytywania lista w kolejności pliku, bez sortowania przy każdej porcji
+            self.notes_model.set_notes(self.notes)
+        elif found_ids is None:
+            self.notes_model.set_notes(self.sorted_index())
+        else:
+            found = [self.notes_by_id[note_id] for note_id in found_ids]
+            self.notes_model.set_notes(self.sort_strategy.sort(found))
+
+    def search_notes(self) -> Optional[set]:
+        """Identyfikatory notatek pasujących do pola wyszukiwania albo None bez filtra"""
+        text, date_from, date_to = parse_query(self.search_input.text())
+        category = self.search_category.currentText()
+        category = None if category == "All categories" else category
+        if not (text.strip() or category or date_from or date_to):
+            return None
+        if not self.search_index.is_built:
+            # Indeks powstaje w tle - lista odświeży się po jego podmianie (on_search_index_built)
+            self.build_search_index()
+            return set()
+        return self.search_index.search(text, category, date_from, date_to)
+
+    def build_search_index(self) -> None:
+        if self.search_index.is_built or self.loading:
+            return
+        if self.index_builder is not None and self.index_builder.isRunning():
+            return
+        self.index_builder = SearchIndexBuilder(self.search_index.empty_copy(), list(self.notes), parent=self)
+        self.index_builder.finished.connect(self.on_search_index_built)
+        self.index_builder.start()
+
+    def on_search_index_built(self) -> None:
+        index = self.index_builder.index
+        if not index.is_built:
+            return
+        # Notatki zapisane w trakcie budowy nie trafiły do kopii listy
         for note in self.notes:
-            if f"{note.title} ({note.category}) - {note.date}" == item.text():
-                self.note_title.setText(note.title)
-                self.note_content.setText(note.content)
-                self.note_category.setCurrentText(note.category)
-                break
+            if note.id not in index:
+                index.add(note)
+        self.search_index = index
+        if self.notes_model.displayed_notes() is not self.sorted_indexes.get(type(self.sort_strategy)):
+            self.refresh_notes_list()
+
+    def on_note_added(self, note: Note) -> None:
+        if self.search_index.is_built:
+            self.search_index.add(note)
+        displayed = self.notes_model.displayed_notes()
+        for index in self.sorted_indexes.values():
+            if index is displayed:
+                self.notes_model.insert_note(note)
+            else:
+                index.insert(note)
+        # Lista przefiltrowana albo posortowana inną strategią niż wybrana - pełne odświeżenie
+        if displayed is not self.sorted_indexes.get(type(self.sort_strategy)):
+            self.refresh_notes_list()
+
+    def shutdown(self) -> None:
+        if self.loader is not None:
+            self.loader.requestInterruption()
+            self.loader.wait()
+        if self.index_builder is not None:
+            self.index_builder.requestInterruption()
+            self.index_builder.wait()
+        self.journal.wait()
+        if self.search_index.is_built:
+            self.search_index.save()
+
+    def load_note(self, index: QModelIndex) -> None:
+        note = self.notes_by_id.get(index.data(Qt.ItemDataRole.UserRole))
+        if note is not None:
+            self.note_title.setText(note.title)
+            self.note_content.setText(note.content)
+            self.note_category.setCurrentText(note.category)
 
 class ObfuscatedNotesDecorator(NotesInterface):
-    def __init__(self, notes_component: Notes, obfuscator: SimpleObfuscator):
+    def __init__(self, notes_component: Notes, obfuscator: SimpleObfuscator,
+                 body_cache_bytes: int = 8 * 1024 * 1024):
         self._notes = notes_component
         self._obfuscator = obfuscator
+        self._codec = ObfuscatedNoteCodec(obfuscator, body_cache_bytes)
+        # Słowa w zapisanym indeksie wyszukiwania kodujemy tak samo jak treść notatek
+        self._notes.search_index = NoteSearchIndex(
+            self._notes.json_file + ".idx", obfuscator.obfuscate_many, obfuscator.deobfuscate_many
+        )
         self.widget = self._notes
-        # Podpinamy nasze metody do komponentu
-        self._notes.save_note = self.save_note.__get__(self)
-        self._notes.save_notes = self.save_notes.__get__(self)
-        self._notes.load_notes = self.load_notes.__get__(self)
-        # Ładujemy notatki od razu
-        self.load_notes()
+        # Wczytywanie (także w tle) i zapisy komponentu używają naszego kodowania
+        self._notes.codec = self._codec
 
+    # Zachowanie komponentu bez zmian - inne jest tylko kodowanie rekordów i indeksu
     def load_notes(self) -> List[Note]:
-        try:
-            with open(self._notes.json_file, "r") as file:
-                obfuscated_notes = json.load(file)
-                deobfuscated_notes = [self._deobfuscate_note(note) for note in obfuscated_notes]
-                self._notes.notes = [self._notes.create_note_from_data(note) for note in deobfuscated_notes]
-                self._notes.refresh_notes_list()
-                return self._notes.notes
-        except (FileNotFoundError, json.JSONDecodeError):
-            self._notes.notes = []
-            return []
+        return self._notes.load_notes()
 
     def save_notes(self) -> None:
-        notes_data = [note.save_data() for note in self._notes.notes]
-        obfuscated_notes = [self._obfuscate_note(note) for note in notes_data]
-        with open(self._notes.json_file, "w") as file:
-            json.dump(obfuscated_notes, file, indent=4)
+        self._notes.save_notes()
 
     def save_note(self) -> None:
-        title = self._notes.note_title.text().strip()
-        content = self._notes.note_content.toPlainText().strip()
-        category = self._notes.note_category.currentText()
+        self._notes.save_note()
 
-        if title and content:
-            note = NoteFactory.create_note(category, title, content)
-            self._notes.notes.append(note)
-            self.save_notes()
-            self._notes.note_title.clear()
-            self._notes.note_content.clear()
-            self._notes.refresh_notes_list()
-            QMessageBox.information(self._notes, "Success", "Note saved successfully!")
-        else:
-            QMessageBox.warning(self._notes, "Warning", "Both title and content are required to save a note.")
-
-    def _obfuscate_note(self, note: Dict[str, str]) -> Dict[str, str]:
-        return {
-            "title": self._obfuscator.obfuscate(note["title"]),
-            "content": self._obfuscator.obfuscate(note["content"]),
-            "category": self._obfuscator.obfuscate(note["category"]),
-            "date": self._obfuscator.obfuscate(note["date"])
-        }
-
-    def _deobfuscate_note(self, note: Dict[str, str]) -> Dict[str, str]:
-        return {
-            "title": self._obfuscator.deobfuscate(note["title"]),
-            "content": self._obfuscator.deobfuscate(note["content"]),
-            "category": self._obfuscator.deobfuscate(note["category"]),
-            "date": self._obfuscator.deobfuscate(note["date"])
-        }
+    def append_note(self, note: Note) -> None:
+        self._notes.append_note(note)
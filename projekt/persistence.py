@@ -0,0 +1,111 @@
+import atexit
+import json
+import os
+import threading
+import time
+from typing import Any, BinaryIO, Callable, Dict, Optional, Tuple
+
+
+def atomic_write_json(path: str, data: Any, **dump_kwargs) -> None:
+    """Zapis przez plik tymczasowy + fsync + atomowa podmiana - po awarii plik
+    jest albo stary, albo nowy, nigdy ucięty"""
+    tmp_path = path + ".tmp"
+    with open(tmp_path, "w") as file:
+        json.dump(data, file, **dump_kwargs)
+        file.flush()
+        os.fsync(file.fileno())
+    os.replace(tmp_path, path)
+
+
+def end_partial_line(file: BinaryIO) -> None:
+    """Kończy urwany ostatni wpis dziennika (plik otwarty w trybie "ab+").
+
+    Po awarii w trakcie zapisu plik może kończyć się bez "\n" - następny
+    rekord skleiłby się z urwanym i przy odczycie oba zostałyby pominięte.
+    """
+    file.seek(0, os.SEEK_END)
+    if file.tell():
+        file.seek(-1, os.SEEK_END)
+        if file.read(1) != b"\n":
+            file.write(b"\n")
+
+
+def append_line(path: str, line: str, sync: bool = False) -> int:
+    """Dopisuje linię (z "\n" na końcu) do pliku dziennika; zwraca nowy rozmiar pliku"""
+    with open(path, "ab+") as file:
+        end_partial_line(file)
+        file.write(line.encode("utf-8"))
+        if sync:
+            file.flush()
+            os.fsync(file.fileno())
+        return file.tell()
+
+
+class WriteBehindWriter:
+    """Wspólna usługa zapisu plików poza wątkiem UI.
+
+    Zapisy trafiają do kolejki; kolejne zapisy tego samego pliku w oknie
+    coalesce_window są łączone w jeden (wygrywają najnowsze dane).
+    Jeden wątek roboczy wykonuje zapisy po kolei, więc zapisy jednego pliku
+    nigdy się nie wyprzedzają.
+    """
+
+    def __init__(self, coalesce_window: float = 0.5):
+        self.coalesce_window = coalesce_window
+        self._pending: Dict[str, Tuple[float, Callable[[], None]]] = {}
+        self._writing = 0
+        self._condition = threading.Condition()
+        self._thread: Optional[threading.Thread] = None
+
+    def submit(self, path: str, job: Callable[[], None]) -> None:
+        with self._condition:
+            if path in self._pending:
+                # Łączenie: termin zostaje z pierwszego zgłoszenia, zadanie jest najnowsze
+                deadline = self._pending[path][0]
+            else:
+                deadline = time.monotonic() + self.coalesce_window
+            self._pending[path] = (deadline, job)
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="write-behind", daemon=True)
+                self._thread.start()
+            self._condition.notify_all()
+
+    def write_json(self, path: str, data: Any, **dump_kwargs) -> None:
+        """Planuje zapis danych JSON; data nie może być później modyfikowane (przekaż kopię)"""
+        self.submit(path, lambda: atomic_write_json(path, data, **dump_kwargs))
+
+    def flush(self) -> None:
+        """Wykonuje od razu wszystkie zaplanowane zapisy i czeka na ich zakończenie"""
+        with self._condition:
+            now = time.monotonic()
+            self._pending = {path: (now, job) for path, (_, job) in self._pending.items()}
+            self._condition.notify_all()
+            while self._pending or self._writing:
+                self._condition.wait()
+
+    def _run(self) -> None:
+        while True:
+            with self._condition:
+                while not self._pending:
+                    self._condition.wait()
+                path, (deadline, job) = min(self._pending.items(), key=lambda item: item[1][0])
+                delay = deadline - time.monotonic()
+                if delay > 0:
+                    self._condition.wait(delay)
+                    continue
+                del self._pending[path]
+                self._writing += 1
+            try:
+                job()
+            except Exception as e:
+                # Dowolny błąd zadania nie może zatrzymać jedynego wątku zapisu (flush czekałby w nieskończoność)
+                print(f"Błąd zapisu pliku {path}: {e}")
+            finally:
+                with self._condition:
+                    self._writing -= 1
+                    self._condition.notify_all()
+
+
+# Wspólna instancja dla całej aplikacji; przy wyjściu zapisujemy wszystko, co czeka w kolejce
+write_behind = WriteBehindWriter()
+atexit.register(write_behind.flush)
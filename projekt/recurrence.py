@@ -0,0 +1,87 @@
+from datetime import date, timedelta
+from typing import Iterator, List, NamedTuple, Optional, Tuple
+
+# Długość kroku reguły w dniach dla interval = 1
+FREQUENCIES = {"daily": 1, "weekly": 7}
+
+
+class RecurrenceRule(NamedTuple):
+    """Zadanie cykliczne zapisane raz: od start co interval dni/tygodni, opcjonalnie do until (włącznie)"""
+    id: int
+    title: str
+    start: str  # ISO "YYYY-MM-DD"
+    frequency: str  # klucz FREQUENCIES
+    interval: int
+    until: Optional[str]
+    event_id: Optional[str] = None
+
+    @property
+    def step(self) -> int:
+        return FREQUENCIES[self.frequency] * self.interval
+
+
+def occurrences(rule: RecurrenceRule, start: str, end: str) -> Iterator[str]:
+    """Leniwie generuje daty wystąpień reguły w przedziale [start, end].
+
+    Pierwsze wystąpienie w przedziale jest wyliczane od razu, więc koszt
+    zależy od liczby wystąpień w przedziale, a nie od wieku reguły.
+    """
+    first = date.fromisoformat(rule.start)
+    low = max(first, date.fromisoformat(start))
+    high = date.fromisoformat(end)
+    if rule.until is not None:
+        high = min(high, date.fromisoformat(rule.until))
+    step = timedelta(days=rule.step)
+    day = low + timedelta(days=-(low - first).days % rule.step)
+    while day <= high:
+        yield day.isoformat()
+        day += step
+
+
+def to_rrule(rule: RecurrenceRule) -> str:
+    """Reguła w formacie RRULE (RFC 5545) dla wydarzenia cyklicznego Google Calendar"""
+    parts = [f"FREQ={rule.frequency.upper()}"]
+    if rule.interval != 1:
+        parts.append(f"INTERVAL={rule.interval}")
+    if rule.until is not None:
+        parts.append("UNTIL=" + rule.until.replace("-", ""))
+    return "RRULE:" + ";".join(parts)
+
+
+def parse_rrule(recurrence: List[str], start: str) -> Optional[Tuple[str, int, Optional[str]]]:
+    """Odczytuje (frequency, interval, until) z pola recurrence wydarzenia.
+
+    Zwraca None dla reguł, których aplikacja nie potrafi odwzorować
+    (np. kilka dni tygodnia, COUNT, wyjątki EXDATE).
+    """
+    if len(recurrence) != 1 or not recurrence[0].startswith("RRULE:"):
+        return None
+    fields = dict(part.split("=", 1) for part in recurrence[0][len("RRULE:"):].split(";") if "=" in part)
+    frequency = fields.pop("FREQ", "").lower()
+    if frequency not in FREQUENCIES:
+        return None
+    interval = int(fields.pop("INTERVAL", "1"))
+    until = fields.pop("UNTIL", None)
+    if until is not None:
+        until = f"{until[0:4]}-{until[4:6]}-{until[6:8]}"
+    weekdays = fields.pop("BYDAY", None)
+    if weekdays is not None and (frequency != "weekly" or weekdays != _weekday_code(start)):
+        return None
+    fields.pop("WKST", None)
+    if fields:
+        return None
+    return frequency, interval, until
+
+
+def instance_event_id(event_id: str, day: str) -> str:
+    """Identyfikator pojedynczego wystąpienia całodniowego wydarzenia cyklicznego w Google Calendar"""
+    return f"{event_id}_{day.replace('-', '')}"
+
+
+def series_event_id(event_id: str) -> str:
+    """Identyfikator wydarzenia cyklicznego, do którego należy wystąpienie (dla zwykłych - ten sam)"""
+    return event_id.split("_", 1)[0]
+
+
+def _weekday_code(day: str) -> str:
+    return ["MO", "TU", "WE", "TH", "FR", "SA", "SU"][date.fromisoformat(day).weekday()]
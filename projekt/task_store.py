@@ -0,0 +1,552 @@
+import calendar
+import json
+import sqlite3
+from datetime import datetime
+from typing import Any, Collection, Dict, Iterable, List, NamedTuple, Optional, Sequence, Set, Tuple
+
+from calendar_sync import MAX_QUERY_PARAMS, OUTBOX_SCHEMA, add_operations, new_event_id, pending_event_ids
+from google_calendar_adapter import is_app_event
+from recurrence import RecurrenceRule, instance_event_id, occurrences, parse_rrule, to_rrule
+
+LEGACY_DATE_FORMAT = "%d-%m-%Y"  # klucze dawnego tasks.json ("dd-MM-yyyy")
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    date TEXT NOT NULL,
+    title TEXT NOT NULL,
+    completed INTEGER NOT NULL DEFAULT 0,
+    event_id TEXT
+);
+CREATE INDEX IF NOT EXISTS tasks_by_date ON tasks (date);
+CREATE INDEX IF NOT EXISTS tasks_by_completed_date ON tasks (completed, date);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT NOT NULL
+);
+CREATE TABLE IF NOT EXISTS recurring_tasks (
+    id INTEGER PRIMARY KEY AUTOINCREMENT,
+    title TEXT NOT NULL,
+    start_date TEXT NOT NULL,
+    frequency TEXT NOT NULL,
+    interval INTEGER NOT NULL DEFAULT 1,
+    until_date TEXT,
+    event_id TEXT
+);
+CREATE INDEX IF NOT EXISTS recurring_tasks_by_start ON recurring_tasks (start_date);
+CREATE INDEX IF NOT EXISTS recurring_tasks_by_event ON recurring_tasks (event_id);
+CREATE TABLE IF NOT EXISTS occurrence_overrides (
+    rule_id INTEGER NOT NULL,
+    date TEXT NOT NULL,
+    state TEXT NOT NULL,
+    PRIMARY KEY (rule_id, date)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS occurrence_overrides_by_date ON occurrence_overrides (date);
+"""
+
+# Stany pojedynczych wystąpień zadania cyklicznego; wystąpienia bez wpisu są do zrobienia
+DONE = "done"
+SKIPPED = "skipped"
+# Data zastępcza w wyniku apply_remote_events: zmieniła się reguła cykliczna (wiele dni)
+ALL_DATES = "*"
+
+# Liczniki zadań na dzień (otwarte/wykonane) utrzymywane przez wyzwalacze -
+# odczyt miesiąca to najwyżej 31 wierszy, niezależnie od liczby wszystkich zadań
+DENSITY_SCHEMA = """
+CREATE TABLE IF NOT EXISTS task_counts (
+    date TEXT PRIMARY KEY,
+    open INTEGER NOT NULL,
+    done INTEGER NOT NULL
+) WITHOUT ROWID;
+CREATE TRIGGER IF NOT EXISTS task_counts_insert AFTER INSERT ON tasks BEGIN
+    INSERT INTO task_counts (date, open, done) VALUES (NEW.date, NEW.completed = 0, NEW.completed != 0)
+        ON CONFLICT (date) DO UPDATE SET open = open + excluded.open, done = done + excluded.done;
+END;
+CREATE TRIGGER IF NOT EXISTS task_counts_delete AFTER DELETE ON tasks BEGIN
+    UPDATE task_counts SET open = open - (OLD.completed = 0), done = done - (OLD.completed != 0)
+        WHERE date = OLD.date;
+    DELETE FROM task_counts WHERE date = OLD.date AND open = 0 AND done = 0;
+END;
+CREATE TRIGGER IF NOT EXISTS task_counts_update AFTER UPDATE OF date, completed ON tasks BEGIN
+    UPDATE task_counts SET open = open - (OLD.completed = 0), done = done - (OLD.completed != 0)
+        WHERE date = OLD.date;
+    DELETE FROM task_counts WHERE date = OLD.date AND open = 0 AND done = 0;
+    INSERT INTO task_counts (date, open, done) VALUES (NEW.date, NEW.completed = 0, NEW.completed != 0)
+        ON CONFLICT (date) DO UPDATE SET open = open + excluded.open, done = done + excluded.done;
+END;
+"""
+
+
+class DayCounts(NamedTuple):
+    open: int
+    done: int
+
+
+TASK_COLUMNS = "id, date, title, completed, event_id"
+RULE_COLUMNS = "id, title, start_date, frequency, interval, until_date, event_id"
+
+
+class Task(NamedTuple):
+    id: int
+    date: str  # ISO "YYYY-MM-DD" - sortuje się chronologicznie
+    title: str
+    completed: bool
+    # Stały identyfikator wydarzenia w Google Calendar; None dla zadań
+    # zaimportowanych z tasks.json (ich wydarzenia mają identyfikatory nadane przez serwer)
+    event_id: Optional[str] = None
+    # Wystąpienie zadania cyklicznego: id reguły (id zadania jest wtedy None)
+    rule_id: Optional[int] = None
+
+
+class TaskStore:
+    """Zadania w bazie SQLite (tasks.db) z indeksami po dacie i stanie wykonania.
+
+    Każda zmiana to zapis jednego wiersza zamiast przepisywania całego pliku,
+    a zapytania o zakres dat ("ten tydzień", "zaległe") korzystają z indeksów.
+    Przy pierwszym uruchomieniu importuje zadania z dawnego tasks.json.
+    Metody z enqueue=True zapisują w tej samej transakcji operację dla Google
+    Calendar (tabela calendar_outbox, czytana przez CalendarOutbox) - zadanie
+    nigdy nie istnieje bez swojej zmiany w kolejce.
+    """
+
+    def __init__(self, path: str = "tasks.db", legacy_json: Optional[str] = "tasks.json"):
+        self.path = path
+        self.connection = sqlite3.connect(path)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        # W trybie WAL NORMAL nie grozi uszkodzeniem bazy, najwyżej utratą ostatniej zmiany po awarii zasilania
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.executescript(SCHEMA)
+        self.connection.executescript(OUTBOX_SCHEMA)
+        self._migrate()
+        self._create_density_index()
+        if legacy_json is not None:
+            self.import_legacy_json(legacy_json)
+
+    def close(self) -> None:
+        self.connection.close()
+
+    def add(self, date: str, title: str, enqueue: bool = False) -> Task:
+        event_id = new_event_id()
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO tasks (date, title, event_id) VALUES (?, ?, ?)", (date, title, event_id)
+            )
+            if enqueue:
+                add_operations(self.connection, "insert", [{"event_id": event_id, "summary": title, "date": date}])
+        return Task(cursor.lastrowid, date, title, False, event_id)
+
+    def delete(self, task_id: int, enqueue: bool = False) -> None:
+        self.delete_many([task_id], enqueue)
+
+    def delete_many(self, task_ids: Sequence[int], enqueue: bool = False) -> List[Task]:
+        """Usuwa zadania w jednej transakcji (jeden zapis na dysk); zwraca usunięte zadania"""
+        with self.connection:
+            deleted = self._delete_tasks(task_ids)
+            if enqueue:
+                add_operations(self.connection, "delete", [{"event_id": task.event_id, "summary": task.title}
+                                                           for task in deleted if task.event_id])
+        return deleted
+
+    def set_completed(self, task_id: int, completed: bool) -> None:
+        with self.connection:
+            self.connection.execute(
+                "UPDATE tasks SET completed = ? WHERE id = ?", (int(completed), task_id)
+            )
+
+    def tasks_for_date(self, date: str) -> List[Task]:
+        """Zadania dnia razem z wystąpieniami zadań cyklicznych"""
+        return self.tasks_between(date, date) + self.occurrences_between(date, date)
+
+    def tasks_between(self, start: str, end: str, completed: Optional[bool] = None) -> List[Task]:
+        """Zwykłe zadania z przedziału dat [start, end] (włącznie), w kolejności dodania w obrębie dnia"""
+        query, params = self._range_query(f"SELECT {TASK_COLUMNS}", start, end, completed)
+        return self._tasks(self.connection.execute(query + " ORDER BY date, id", params))
+
+    def count_between(self, start: str, end: str, completed: Optional[bool] = None) -> int:
+        query, params = self._range_query("SELECT COUNT(*)", start, end, completed)
+        return self.connection.execute(query, params).fetchone()[0]
+
+    def overdue(self, today: str) -> List[Task]:
+        """Niewykonane zadania z dni przed today"""
+        return self._tasks(self.connection.execute(
+            f"SELECT {TASK_COLUMNS} FROM tasks WHERE completed = 0 AND date < ? ORDER BY date, id",
+            (today,),
+        ))
+
+    def month_counts(self, year: int, month: int) -> Dict[str, DayCounts]:
+        """Liczby zadań w dniach miesiąca, które mają jakiekolwiek zadania"""
+        prefix = f"{year:04}-{month:02}"
+        rows = self.connection.execute(
+            "SELECT date, open, done FROM task_counts WHERE date BETWEEN ? AND ?",
+            (prefix + "-01", prefix + "-31"),
+        )
+        counts = {date: DayCounts(open_count, done) for date, open_count, done in rows}
+        last_day = calendar.monthrange(year, month)[1]
+        return self._add_occurrence_counts(counts, prefix + "-01", f"{prefix}-{last_day:02}")
+
+    def day_counts(self, date: str) -> DayCounts:
+        row = self.connection.execute(
+            "SELECT open, done FROM task_counts WHERE date = ?", (date,)
+        ).fetchone()
+        counts = {date: DayCounts(*row)} if row else {}
+        return self._add_occurrence_counts(counts, date, date).get(date, DayCounts(0, 0))
+
+    def add_recurring(self, start: str, title: str, frequency: str, interval: int = 1,
+                      until: Optional[str] = None, enqueue: bool = False) -> RecurrenceRule:
+        """Zapisuje zadanie cykliczne jednym wierszem; wystąpienia powstają dopiero przy odczycie"""
+        event_id = new_event_id()
+        with self.connection:
+            cursor = self.connection.execute(
+                "INSERT INTO recurring_tasks (title, start_date, frequency, interval, until_date, event_id) "
+                "VALUES (?, ?, ?, ?, ?, ?)", (title, start, frequency, interval, until, event_id)
+            )
+            rule = RecurrenceRule(cursor.lastrowid, title, start, frequency, interval, until, event_id)
+            if enqueue:
+                add_operations(self.connection, "insert", [{"event_id": event_id, "summary": title, "date": start,
+                                                            "recurrence": [to_rrule(rule)]}])
+        return rule
+
+    def rules_between(self, start: str, end: str) -> List[RecurrenceRule]:
+        """Reguły, które mogą mieć wystąpienia w przedziale [start, end]"""
+        rows = self.connection.execute(
+            f"SELECT {RULE_COLUMNS} FROM recurring_tasks "
+            "WHERE start_date <= ? AND (until_date IS NULL OR until_date >= ?)", (end, start)
+        )
+        return [RecurrenceRule(*row) for row in rows]
+
+    def occurrences_between(self, start: str, end: str) -> List[Task]:
+        """Wystąpienia zadań cyklicznych w przedziale, z nałożonymi stanami (wykonane/pominięte).
+
+        Koszt zależy od liczby reguł obejmujących przedział i wystąpień w nim,
+        nie od liczby wszystkich wystąpień od początku reguł.
+        """
+        rules = self.rules_between(start, end)
+        if not rules:
+            return []
+        states = self._occurrence_states(start, end)
+        tasks = []
+        for rule in rules:
+            for day in occurrences(rule, start, end):
+                state = states.get((rule.id, day))
+                if state == SKIPPED:
+                    continue
+                event_id = instance_event_id(rule.event_id, day) if rule.event_id else None
+                tasks.append(Task(None, day, rule.title, state == DONE, event_id, rule.id))
+        tasks.sort(key=lambda task: task.date)
+        return tasks
+
+    def set_occurrence_state(self, rule_id: int, date: str, state: Optional[str]) -> None:
+        """Ustawia stan jednego wystąpienia (DONE, SKIPPED albo None - do zrobienia)"""
+        self.set_occurrence_states([(rule_id, date)], state)
+
+    def set_occurrence_states(self, occurrence_keys: Iterable[Tuple[int, str]], state: Optional[str]) -> None:
+        with self.connection:
+            self._set_occurrence_states(occurrence_keys, state)
+
+    def skip_occurrences(self, occurrences: Sequence[Task], enqueue: bool = False) -> None:
+        """Oznacza wystąpienia jako pominięte; z enqueue usuwa je też z Google Calendar (w tej samej transakcji)"""
+        with self.connection:
+            self._set_occurrence_states([(task.rule_id, task.date) for task in occurrences], SKIPPED)
+            if enqueue:
+                add_operations(self.connection, "delete", [{"event_id": task.event_id, "summary": task.title}
+                                                           for task in occurrences if task.event_id])
+
+    def sync_token(self) -> Optional[str]:
+        """syncToken ostatniej synchronizacji z Google Calendar"""
+        return self._meta("calendar_sync_token")
+
+    def set_sync_token(self, sync_token: Optional[str]) -> None:
+        with self.connection:
+            self._set_meta("calendar_sync_token", sync_token)
+
+    def apply_remote_events(self, events: Iterable[Dict[str, Any]], skip_event_ids: Collection[str] = (),
+                            sync_token: Optional[str] = None) -> Tuple[Set[str], int]:
+        """Nanosi zmienione wydarzenia z Google Calendar na zadania, dopasowując je po event_id.
+
+        Nowe wydarzenia trafiają do zadań tylko, gdy utworzyła je aplikacja
+        (is_app_event) - pozostałe wydarzenia kalendarza użytkownika są pomijane.
+        Zadania z dawnego tasks.json (bez event_id) są łączone ze swoimi
+        wydarzeniami po dacie i tytule zamiast dodawania kopii.
+        Konflikty: wydarzenie z niewysłaną jeszcze lokalną zmianą (skip_event_ids
+        i operacje w calendar_outbox) jest pomijane - zmiana lokalna trafi na serwer
+        i go nadpisze. W pozostałych przypadkach wygrywa stan z serwera; stan
+        wykonania zadania istnieje tylko lokalnie i jest zachowywany. sync_token
+        zapisujemy w tej samej transakcji.
+        Zwraca (daty, w których coś się zmieniło, liczba zmienionych zadań).
+        """
+        changed_dates: Set[str] = set()
+        touched = 0
+        with self.connection:
+            skip_event_ids = self._begin_pull(skip_event_ids)
+            for event in events:
+                event_id = event["id"]
+                if event_id in skip_event_ids:
+                    continue
+                if "recurringEventId" in event or "recurrence" in event or self._rule_id(event_id) is not None:
+                    if self._apply_remote_recurring(event):
+                        changed_dates.add(ALL_DATES)
+                        touched += 1
+                    continue
+                row = self.connection.execute(
+                    "SELECT id, date, title FROM tasks WHERE event_id = ?", (event_id,)
+                ).fetchone()
+                if event.get("status") == "cancelled":
+                    if row is not None:
+                        self.connection.execute("DELETE FROM tasks WHERE id = ?", (row[0],))
+                        changed_dates.add(row[1])
+                        touched += 1
+                    continue
+                date = event_date(event)
+                title = event.get("summary", "")
+                if date is None:
+                    continue
+                if row is None:
+                    legacy = self.connection.execute(
+                        "SELECT id FROM tasks WHERE event_id IS NULL AND date = ? AND title = ? LIMIT 1", (date, title)
+                    ).fetchone()
+                    if legacy is not None:
+                        # Wydarzenie zadania z tasks.json (identyfikator nadał serwer) - tylko je łączymy
+                        self.connection.execute("UPDATE tasks SET event_id = ? WHERE id = ?", (event_id, legacy[0]))
+                        continue
+                    if not is_app_event(event):
+                        continue
+                    self.connection.execute(
+                        "INSERT INTO tasks (date, title, event_id) VALUES (?, ?, ?)", (date, title, event_id)
+                    )
+                elif (row[1], row[2]) != (date, title):
+                    self.connection.execute(
+                        "UPDATE tasks SET date = ?, title = ? WHERE id = ?", (date, title, row[0])
+                    )
+                    changed_dates.add(row[1])
+                else:
+                    continue
+                changed_dates.add(date)
+                touched += 1
+            if sync_token is not None:
+                self._set_meta("calendar_sync_token", sync_token)
+        return changed_dates, touched
+
+    def remove_missing_events(self, seen_event_ids: Collection[str],
+                              skip_event_ids: Collection[str] = ()) -> Tuple[Set[str], int]:
+        """Po pełnej synchronizacji usuwa zadania, których wydarzeń nie ma już na serwerze.
+
+        Zadania z operacją w kolejce (np. dodane w trakcie pobierania listy)
+        jeszcze nie dotarły na serwer - zostają.
+        """
+        with self.connection:
+            skip_event_ids = self._begin_pull(skip_event_ids)
+            rows = self.connection.execute("SELECT id, date, event_id FROM tasks WHERE event_id IS NOT NULL")
+            missing = [(task_id, date) for task_id, date, event_id in rows
+                       if event_id not in seen_event_ids and event_id not in skip_event_ids]
+            self._delete_tasks([task_id for task_id, _ in missing])
+            changed_dates = {date for _, date in missing}
+            rules = self.connection.execute("SELECT id, event_id FROM recurring_tasks WHERE event_id IS NOT NULL")
+            missing_rules = [rule_id for rule_id, event_id in rules
+                             if event_id not in seen_event_ids and event_id not in skip_event_ids]
+            for rule_id in missing_rules:
+                self._delete_rule(rule_id)
+        if missing_rules:
+            changed_dates.add(ALL_DATES)
+        return changed_dates, len(missing) + len(missing_rules)
+
+    def import_legacy_json(self, path: str) -> int:
+        """Jednorazowo przenosi zadania z tasks.json ({"dd-MM-yyyy": [tytuły]}); zwraca ich liczbę"""
+        if self._meta("legacy_json_imported"):
+            return 0
+        try:
+            with open(path, "r") as file:
+                tasks_by_date: Dict[str, List[str]] = json.load(file)
+        except FileNotFoundError:
+            tasks_by_date = {}
+        except json.JSONDecodeError:
+            print(f"Nie można odczytać pliku {path} - zadania nie zostały zaimportowane")
+            return 0
+        rows = list(self._legacy_rows(tasks_by_date))
+        with self.connection:
+            self.connection.executemany("INSERT INTO tasks (date, title) VALUES (?, ?)", rows)
+            self._set_meta("legacy_json_imported", "1")
+        return len(rows)
+
+    @staticmethod
+    def _legacy_rows(tasks_by_date: Dict[str, List[str]]) -> Iterable[tuple]:
+        for key, titles in tasks_by_date.items():
+            try:
+                date = datetime.strptime(key, LEGACY_DATE_FORMAT).date().isoformat()
+            except ValueError:
+                print(f"Pominięto zadania z nieprawidłową datą: {key}")
+                continue
+            for title in titles:
+                yield date, title
+
+    def _apply_remote_recurring(self, event: Dict[str, Any]) -> bool:
+        """Zmiana wydarzenia cyklicznego albo jego wystąpienia; zwraca True, gdy coś zmieniła"""
+        if "recurringEventId" in event:
+            # Wyjątek w serii: odwzorowujemy tylko usunięcie wystąpienia
+            rule_id = self._rule_id(event["recurringEventId"])
+            day = event_date({"start": event.get("originalStartTime", {})})
+            if rule_id is None or day is None or event.get("status") != "cancelled":
+                return False
+            state = self.connection.execute(
+                "SELECT state FROM occurrence_overrides WHERE rule_id = ? AND date = ?", (rule_id, day)
+            ).fetchone()
+            if state is not None and state[0] == SKIPPED:
+                return False
+            self.connection.execute(
+                "INSERT OR REPLACE INTO occurrence_overrides (rule_id, date, state) VALUES (?, ?, ?)",
+                (rule_id, day, SKIPPED),
+            )
+            return True
+        rule_id = self._rule_id(event["id"])
+        if event.get("status") == "cancelled":
+            if rule_id is None:
+                return False
+            self._delete_rule(rule_id)
+            return True
+        if rule_id is None and not is_app_event(event):
+            return False  # wydarzenie cykliczne spoza aplikacji
+        start = event_date(event)
+        rule = parse_rrule(event.get("recurrence", []), start) if start else None
+        if rule is None:
+            return False  # reguła, której aplikacja nie potrafi odwzorować
+        values = (event.get("summary", ""), start, *rule)
+        if rule_id is None:
+            self.connection.execute(
+                "INSERT INTO recurring_tasks (title, start_date, frequency, interval, until_date, event_id) "
+                "VALUES (?, ?, ?, ?, ?, ?)", (*values, event["id"])
+            )
+            return True
+        current = self.connection.execute(
+            "SELECT title, start_date, frequency, interval, until_date FROM recurring_tasks WHERE id = ?",
+            (rule_id,),
+        ).fetchone()
+        if current == values:
+            return False
+        self.connection.execute(
+            "UPDATE recurring_tasks SET title = ?, start_date = ?, frequency = ?, interval = ?, until_date = ? "
+            "WHERE id = ?", (*values, rule_id)
+        )
+        return True
+
+    def _set_occurrence_states(self, occurrence_keys: Iterable[Tuple[int, str]], state: Optional[str]) -> None:
+        # Wywoływane wewnątrz transakcji (with self.connection)
+        if state is None:
+            self.connection.executemany(
+                "DELETE FROM occurrence_overrides WHERE rule_id = ? AND date = ?", occurrence_keys
+            )
+        else:
+            self.connection.executemany(
+                "INSERT OR REPLACE INTO occurrence_overrides (rule_id, date, state) VALUES (?, ?, ?)",
+                [(rule_id, date, state) for rule_id, date in occurrence_keys],
+            )
+
+    def _delete_tasks(self, task_ids: Sequence[int]) -> List[Task]:
+        # Wywoływane wewnątrz transakcji (with self.connection)
+        deleted: List[Task] = []
+        for start in range(0, len(task_ids), MAX_QUERY_PARAMS):
+            chunk = list(task_ids[start:start + MAX_QUERY_PARAMS])
+            placeholders = ", ".join("?" * len(chunk))
+            deleted += self._tasks(self.connection.execute(
+                f"SELECT {TASK_COLUMNS} FROM tasks WHERE id IN ({placeholders})", chunk
+            ))
+            self.connection.execute(f"DELETE FROM tasks WHERE id IN ({placeholders})", chunk)
+        return deleted
+
+    def _begin_pull(self, skip_event_ids: Collection[str]) -> Set[str]:
+        """Otwiera transakcję z blokadą zapisu i zwraca identyfikatory wydarzeń z niewysłanymi zmianami.
+
+        Kolejka jest czytana w tej samej transakcji: zadanie dodane w wątku UI
+        w trakcie pobierania zmian ma już swoją operację w calendar_outbox
+        (obie w jednej transakcji), więc nie zostanie usunięte ani nadpisane.
+        """
+        self.connection.execute("BEGIN IMMEDIATE")
+        return set(skip_event_ids) | pending_event_ids(self.connection)
+
+    def _rule_id(self, event_id: str) -> Optional[int]:
+        row = self.connection.execute("SELECT id FROM recurring_tasks WHERE event_id = ?", (event_id,)).fetchone()
+        return row[0] if row else None
+
+    def _delete_rule(self, rule_id: int) -> None:
+        self.connection.execute("DELETE FROM occurrence_overrides WHERE rule_id = ?", (rule_id,))
+        self.connection.execute("DELETE FROM recurring_tasks WHERE id = ?", (rule_id,))
+
+    def _occurrence_states(self, start: str, end: str) -> Dict[Tuple[int, str], str]:
+        rows = self.connection.execute(
+            "SELECT rule_id, date, state FROM occurrence_overrides WHERE date BETWEEN ? AND ?", (start, end)
+        )
+        return {(rule_id, date): state for rule_id, date, state in rows}
+
+    def _add_occurrence_counts(self, counts: Dict[str, DayCounts], start: str, end: str) -> Dict[str, DayCounts]:
+        rules = self.rules_between(start, end)
+        if not rules:
+            return counts
+        # Tylko liczniki - bez budowania obiektów Task dla każdego wystąpienia
+        states = self._occurrence_states(start, end)
+        open_counts: Dict[str, int] = {}
+        done_counts: Dict[str, int] = {}
+        for rule in rules:
+            for day in occurrences(rule, start, end):
+                state = states.get((rule.id, day))
+                if state is None:
+                    open_counts[day] = open_counts.get(day, 0) + 1
+                elif state == DONE:
+                    done_counts[day] = done_counts.get(day, 0) + 1
+        for day in open_counts.keys() | done_counts.keys():
+            open_count, done = counts.get(day, (0, 0))
+            counts[day] = DayCounts(open_count + open_counts.get(day, 0), done + done_counts.get(day, 0))
+        return counts
+
+    @staticmethod
+    def _tasks(rows) -> List[Task]:
+        return [Task(task_id, date, title, bool(done), event_id)
+                for task_id, date, title, done, event_id in rows]
+
+    @staticmethod
+    def _range_query(select: str, start: str, end: str, completed: Optional[bool]):
+        query = select + " FROM tasks WHERE date BETWEEN ? AND ?"
+        params = [start, end]
+        if completed is not None:
+            query += " AND completed = ?"
+            params.append(int(completed))
+        return query, params
+
+    def _migrate(self) -> None:
+        columns = {row[1] for row in self.connection.execute("PRAGMA table_info(tasks)")}
+        if "event_id" not in columns:
+            with self.connection:
+                self.connection.execute("ALTER TABLE tasks ADD COLUMN event_id TEXT")
+        # Indeks po dodaniu kolumny - starsze bazy jej nie miały
+        self.connection.execute("CREATE INDEX IF NOT EXISTS tasks_by_event ON tasks (event_id)")
+
+    def _create_density_index(self) -> None:
+        self.connection.executescript(DENSITY_SCHEMA)
+        if self._meta("task_counts_built"):
+            return
+        with self.connection:
+            # Baza sprzed indeksu liczników - wypełniamy go jednorazowo
+            self.connection.execute("DELETE FROM task_counts")
+            self.connection.execute(
+                "INSERT INTO task_counts (date, open, done) "
+                "SELECT date, SUM(completed = 0), SUM(completed != 0) FROM tasks GROUP BY date"
+            )
+            self._set_meta("task_counts_built", "1")
+
+    def _meta(self, key: str) -> Optional[str]:
+        row = self.connection.execute("SELECT value FROM meta WHERE key = ?", (key,)).fetchone()
+        return row[0] if row else None
+
+    def _set_meta(self, key: str, value: Optional[str]) -> None:
+        # Wywoływane wewnątrz transakcji (with self.connection)
+        if value is None:
+            self.connection.execute("DELETE FROM meta WHERE key = ?", (key,))
+        else:
+            self.connection.execute("INSERT OR REPLACE INTO meta (key, value) VALUES (?, ?)", (key, value))
+
+
+def event_date(event: Dict[str, Any]) -> Optional[str]:
+    """Dzień wydarzenia Google Calendar w formacie ISO (całodniowe "date" albo "dateTime")"""
+    start = event.get("start", {})
+    if "date" in start:
+        return start["date"]
+    if "dateTime" in start:
+        return start["dateTime"][:10]
+    return None
@@ -1,14 +1,81 @@
-import json
 from PySide6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QLineEdit,
-    QPushButton, QListWidget, QListWidgetItem, QCheckBox, QLabel, QCalendarWidget
+    QPushButton, QListView, QStyledItemDelegate, QLabel, QCalendarWidget,
+    QComboBox, QSpinBox, QDateEdit
 )
-from PySide6.QtCore import Qt, QDate
-from PySide6.QtGui import QFont
+from PySide6.QtCore import Qt, QDate, QAbstractListModel, QModelIndex, Signal
+from PySide6.QtGui import QFont, QColor, QTextCharFormat, QPalette
 from google_calendar_adapter import GoogleCalendarAdapter
+from calendar_sync import CalendarOutbox, CalendarPuller, CalendarSyncWorker
+from task_store import DONE, ALL_DATES, TaskStore
+
+# Opcje powtarzania zadania: etykieta -> częstotliwość reguły (None - zadanie jednorazowe)
+REPEAT_OPTIONS = {"Bez powtarzania": None, "Codziennie": "daily", "Co tydzień": "weekly"}
+
+
+class TasksListModel(QAbstractListModel):
+    """Model listy zadań jednego dnia - wiersz to tylko dane zadania, bez widżetów"""
+    completion_toggled = Signal(object, bool)  # zadanie (Task), wykonane
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._tasks = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._tasks)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        task = self._tasks[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            return task.title if task.rule_id is None else f"{task.title} (cykliczne)"
+        if role == Qt.ItemDataRole.CheckStateRole:
+            return Qt.CheckState.Checked if task.completed else Qt.CheckState.Unchecked
+        if role == Qt.ItemDataRole.UserRole:
+            return task.id
+        return None
+
+    def flags(self, index):
+        return super().flags(index) | Qt.ItemFlag.ItemIsUserCheckable
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role != Qt.ItemDataRole.CheckStateRole:
+            return False
+        task = self._tasks[index.row()]
+        completed = Qt.CheckState(value) == Qt.CheckState.Checked
+        self._tasks[index.row()] = task._replace(completed=completed)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.CheckStateRole])
+        self.completion_toggled.emit(task, completed)
+        return True
+
+    def set_tasks(self, tasks):
+        self.beginResetModel()
+        self._tasks = list(tasks)
+        self.endResetModel()
+
+    def append_task(self, task):
+        row = len(self._tasks)
+        self.beginInsertRows(QModelIndex(), row, row)
+        self._tasks.append(task)
+        self.endInsertRows()
+
+
+class TaskItemDelegate(QStyledItemDelegate):
+    """Rysuje wykonane zadania przekreślone i wyszarzone przy malowaniu wiersza"""
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        if index.data(Qt.ItemDataRole.CheckStateRole) == Qt.CheckState.Checked:
+            option.font.setBold(True)
+            option.font.setStrikeOut(True)
+            option.palette.setColor(QPalette.ColorRole.Text, QColor("gray"))
 
 
 class ToDoCalendar(QWidget):
+    # Daty zmienione przez synchronizację; emitowany z wątku synchronizacji
+    remote_changes = Signal(list)
+    calendar_connected = Signal(bool)  # wynik łączenia z API (z wątku łączenia)
+
     def __init__(self):
         self.google_calendar = GoogleCalendarAdapter()
         
@@ -16,8 +83,17 @@ class ToDoCalendar(QWidget):
         self.setWindowTitle("ToDoCalendar")
         self.setGeometry(100, 100, 600, 500)
 
-        self.json_file = "tasks.json"
-        self.tasks_by_date = self.load_tasks()
+        # Przy pierwszym uruchomieniu importuje zadania z tasks.json
+        self.task_store = TaskStore()
+
+        # Zmiany dla Google Calendar czekają w trwałej kolejce i są wysyłane w tle;
+        # ten sam wątek pobiera zmiany z serwera do bazy zadań
+        self.remote_changes.connect(self.on_remote_changes)
+        puller = CalendarPuller(self.google_calendar, lambda: TaskStore(self.task_store.path, legacy_json=None),
+                                self.remote_changes.emit)
+        self.calendar_sync = CalendarSyncWorker(CalendarOutbox(self.task_store.path), self.google_calendar,
+                                                puller=puller)
+        self.calendar_sync.start()
 
         # Glowny layout
         main_layout = QHBoxLayout(self)
@@ -29,7 +105,7 @@ class ToDoCalendar(QWidget):
 
         # Data
         today = QDate.currentDate()
-        self.current_date = today.toString("dd-MM-yyyy")
+        self.current_date = today.toString("yyyy-MM-dd")
         formatted_date = today.toString("d MMMM yyyy")
         self.date_label = QLabel(formatted_date, self)
         self.date_label.setFont(QFont("Arial", 14))
@@ -40,6 +116,7 @@ class ToDoCalendar(QWidget):
         self.calendar = QCalendarWidget(self)
         self.calendar.setGridVisible(True)
         self.calendar.clicked.connect(self.change_date)
+        self.calendar.currentPageChanged.connect(self.paint_month)
         left_panel.addWidget(self.calendar)
 
         # Prawy panel dla kontrolek i taskow
@@ -51,6 +128,25 @@ class ToDoCalendar(QWidget):
         self.task_input.setPlaceholderText("Wpisz nazwę zadania...")
         right_panel.addWidget(self.task_input)
 
+        # Powtarzanie: częstotliwość, co ile dni/tygodni i opcjonalna data końca
+        repeat_layout = QHBoxLayout()
+        self.repeat_input = QComboBox(self)
+        self.repeat_input.addItems(list(REPEAT_OPTIONS))
+        repeat_layout.addWidget(self.repeat_input)
+        self.interval_input = QSpinBox(self)
+        self.interval_input.setRange(1, 99)
+        self.interval_input.setPrefix("co ")
+        repeat_layout.addWidget(self.interval_input)
+        self.until_input = QDateEdit(self)
+        self.until_input.setCalendarPopup(True)
+        self.until_input.setDisplayFormat("d MMMM yyyy")
+        # Najmniejsza data oznacza brak daty końca
+        self.until_input.setMinimumDate(today)
+        self.until_input.setSpecialValueText("bez końca")
+        self.until_input.setDate(today)
+        repeat_layout.addWidget(self.until_input)
+        right_panel.addLayout(repeat_layout)
+
         # Przyciski
         self.add_task_button = QPushButton("Dodaj zadanie", self)
         self.add_task_button.setObjectName("add_task_button")
@@ -62,100 +158,143 @@ class ToDoCalendar(QWidget):
         self.delete_task_button.clicked.connect(self.delete_task)
         right_panel.addWidget(self.delete_task_button)
 
-        # Lista taskow
-        self.task_list = QListWidget(self)
+        # Widoczny, gdy łączenie w tle się nie udało (brak tokenu) - autoryzacja tylko na żądanie
+        self.connect_button = QPushButton("Połącz z Google Calendar", self)
+        self.connect_button.setObjectName("connect_calendar_button")
+        self.connect_button.clicked.connect(self.connect_calendar)
+        self.connect_button.hide()
+        right_panel.addWidget(self.connect_button)
+
+        # Lista taskow - zmiana dnia to tylko reset modelu
+        self.task_model = TasksListModel(self)
+        self.task_model.completion_toggled.connect(self.set_task_completed)
+        self.task_list = QListView(self)
+        self.task_list.setUniformItemSizes(True)
+        self.task_list.setModel(self.task_model)
+        self.task_list.setItemDelegate(TaskItemDelegate(self.task_list))
         right_panel.addWidget(self.task_list)
 
         # Ladowanie taskow na dzisiaj
         self.display_tasks_for_date(self.current_date)
+        self.paint_month(self.calendar.yearShown(), self.calendar.monthShown())
 
-    def load_tasks(self):
-        try:
-            with open(self.json_file, "r") as file:
-                return json.load(file)
-        except (FileNotFoundError, json.JSONDecodeError):
-            return {}
+        # Łączenie z Google Calendar (token, discovery) w tle - zakładka działa od razu
+        self.calendar_connected.connect(self.on_calendar_connected)
+        self.google_calendar.connect_in_background(on_done=self.calendar_connected.emit)
+
+    def connect_calendar(self):
+        """Autoryzacja w przeglądarce (run_local_server) po kliknięciu przycisku"""
+        self.connect_button.setEnabled(False)
+        self.google_calendar.connect_in_background(interactive=True, on_done=self.calendar_connected.emit)
 
-    def save_tasks(self):
-        with open(self.json_file, "w") as file:
-            json.dump(self.tasks_by_date, file, indent=4)
+    def on_calendar_connected(self, connected):
+        self.connect_button.setVisible(not connected)
+        self.connect_button.setEnabled(True)
+        if connected:
+            # Wątek synchronizacji może czekać po nieudanych próbach - ponawia od razu
+            self.calendar_sync.retry_now()
 
     def display_tasks_for_date(self, date):
-        self.task_list.clear()
-        tasks = self.tasks_by_date.get(date, [])
-        for task_text in tasks:
-            self.add_task_to_list_widget(task_text)
+        self.task_model.set_tasks(self.task_store.tasks_for_date(date))
 
-    def add_task_to_list_widget(self, task_text):
-        task_widget = QWidget()
-        task_layout = QHBoxLayout(task_widget)
-        task_layout.setContentsMargins(0, 0, 0, 0)
+    def add_task(self):
+        task_text = self.task_input.text().strip()
+        frequency = REPEAT_OPTIONS[self.repeat_input.currentText()]
+        if task_text and frequency is not None:
+            self.add_recurring_task(task_text, frequency)
+        elif task_text:
+            # Zadanie i jego operacja dla Google Calendar w jednej transakcji
+            task = self.task_store.add(self.current_date, task_text, enqueue=True)
+            self.calendar_sync.notify()
 
-        checkbox = QCheckBox()
-        checkbox.stateChanged.connect(self.toggle_task_completion)
-        task_layout.addWidget(checkbox)
+            self.task_model.append_task(task)
+            self.task_input.clear()
+            self.paint_day(self.current_date)
 
-        task_label = QLineEdit(task_text)
-        task_label.setReadOnly(True)
-        task_layout.addWidget(task_label)
 
-        item = QListWidgetItem(self.task_list)
-        item.setSizeHint(task_widget.sizeHint())
-        self.task_list.setItemWidget(item, task_widget)
+    def add_recurring_task(self, title, frequency):
+        """Zadanie cykliczne to jedna reguła w bazie i jedno wydarzenie cykliczne w Google Calendar"""
+        until = None
+        if self.until_input.date() != self.until_input.minimumDate():
+            until = self.until_input.date().toString("yyyy-MM-dd")
+        self.task_store.add_recurring(self.current_date, title, frequency, self.interval_input.value(), until,
+                                      enqueue=True)
+        self.calendar_sync.notify()
+        self.task_input.clear()
+        self.display_tasks_for_date(self.current_date)
+        self.paint_month(self.calendar.yearShown(), self.calendar.monthShown())
 
-    def add_task(self):
-        task_text = self.task_input.text().strip()
-        if task_text:
-            if self.current_date not in self.tasks_by_date:
-                self.tasks_by_date[self.current_date] = []
-            self.tasks_by_date[self.current_date].append(task_text)
-            self.save_tasks()
+    def delete_task(self):
+        # Zaznaczone = wykonane; stan jest w bazie, więc nie przeglądamy widżetów listy
+        completed = [task for task in self.task_store.tasks_for_date(self.current_date) if task.completed]
+        self.skip_occurrences([task for task in completed if task.rule_id is not None])
+        self.delete_tasks([task.id for task in completed if task.rule_id is None])
 
-            self.add_task_to_list_widget(task_text)
-            self.task_input.clear()
+    def delete_tasks(self, task_ids):
+        """Usuwa zadania jednym zapisem do bazy i jedną porcją zmian dla Google Calendar"""
+        deleted = self.task_store.delete_many(task_ids, enqueue=True)
+        self.calendar_sync.notify()
+        self.display_tasks_for_date(self.current_date)
+        for date in {task.date for task in deleted}:
+            self.paint_day(date)
+
+    def skip_occurrences(self, occurrences):
+        """Usunięcie wystąpień zadania cyklicznego - reguła zostaje, dzień dostaje wpis "pominięte" """
+        if not occurrences:
+            return
+        self.task_store.skip_occurrences(occurrences, enqueue=True)
+        self.calendar_sync.notify()
+        self.display_tasks_for_date(self.current_date)
+        for date in {task.date for task in occurrences}:
+            self.paint_day(date)
 
-            # Dodanie zadania do Google Calendar
-            date_obj = QDate.fromString(self.current_date, "dd-MM-yyyy")  
-            google_date = date_obj.toString("yyyy-MM-dd")  # Konwersja na format Google Calendar  
-            self.google_calendar.add_event(task_text, google_date)
+    def set_task_completed(self, task, completed):
+        if task.rule_id is None:
+            self.task_store.set_completed(task.id, completed)
+        else:
+            self.task_store.set_occurrence_state(task.rule_id, task.date, DONE if completed else None)
+        self.paint_day(self.current_date)
 
+    def on_remote_changes(self, dates):
+        if self.current_date in dates or ALL_DATES in dates:
+            self.display_tasks_for_date(self.current_date)
+        shown_month = f"{self.calendar.yearShown():04}-{self.calendar.monthShown():02}"
+        if ALL_DATES in dates or any(date.startswith(shown_month) for date in dates):
+            self.paint_month(self.calendar.yearShown(), self.calendar.monthShown())
 
+    def paint_month(self, year, month):
+        """Wyróżnia dni z zadaniami w widocznym miesiącu - koszt zależy tylko od liczby dni"""
+        self.calendar.setDateTextFormat(QDate(), QTextCharFormat())  # czyści poprzedni miesiąc
+        for date, counts in self.task_store.month_counts(year, month).items():
+            self.calendar.setDateTextFormat(QDate.fromString(date, "yyyy-MM-dd"), self.day_format(counts))
 
-    def delete_task(self):
-        for i in range(self.task_list.count() - 1, -1, -1):
-            item = self.task_list.item(i)
-            task_widget = self.task_list.itemWidget(item)
-            if task_widget:
-                checkbox = task_widget.layout().itemAt(0).widget()
-                if isinstance(checkbox, QCheckBox) and checkbox.isChecked():
-                    task_label = task_widget.layout().itemAt(1).widget()
-                    if isinstance(task_label, QLineEdit):
-                        task_text = task_label.text()
-                        if task_text in self.tasks_by_date.get(self.current_date, []):
-                            self.tasks_by_date[self.current_date].remove(task_text)
-                        self.save_tasks()
-                        self.task_list.takeItem(i)
-
-    def toggle_task_completion(self, state):
-        checkbox = self.sender()
-        if checkbox:
-            task_widget = checkbox.parentWidget()
-            if task_widget:
-                task_label = task_widget.layout().itemAt(1).widget()
-                if isinstance(task_label, QLineEdit):
-                    if state == Qt.CheckState.Checked:
-                        task_label.setFont(QFont(task_label.font().family(), task_label.font().pointSize(), QFont.Weight.Bold))
-                        task_label.setStyleSheet("text-decoration: line-through; color: gray;")
-                    else:
-                        task_label.setFont(QFont(task_label.font().family(), task_label.font().pointSize(), QFont.Weight.Normal))
-                        task_label.setStyleSheet("text-decoration: none; color: black;")
+    def paint_day(self, date):
+        counts = self.task_store.day_counts(date)
+        self.calendar.setDateTextFormat(QDate.fromString(date, "yyyy-MM-dd"), self.day_format(counts))
+
+    @staticmethod
+    def day_format(counts):
+        text_format = QTextCharFormat()
+        if counts.open:
+            text_format.setFontWeight(QFont.Weight.Bold)
+            text_format.setBackground(QColor("#ffe4b5"))
+        elif counts.done:
+            text_format.setForeground(QColor("gray"))
+        if counts.open or counts.done:
+            text_format.setToolTip(f"Zadania: {counts.open} do zrobienia, {counts.done} wykonane")
+        return text_format
 
     def change_date(self, date):
-        self.current_date = date.toString("dd-MM-yyyy")
+        self.current_date = date.toString("yyyy-MM-dd")
         formatted_date = date.toString("d MMMM yyyy")
         self.date_label.setText(formatted_date)
         self.display_tasks_for_date(self.current_date)
 
+    def shutdown(self):
+        # Niewysłane zmiany zostają w kolejce (tasks.db) do następnego uruchomienia
+        self.calendar_sync.stop(timeout=1.0)
+        self.task_store.close()
+
     def load_stylesheet(self, filepath):
         try:
             with open(filepath, "r") as file: